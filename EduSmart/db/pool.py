@@ -0,0 +1,186 @@
+"""
+Process-wide psycopg2 connection pools for the EduSmart.db.postgresql_pool backend.
+
+Each pool holds at most MAX_SIZE open connections for one database alias and set of connection params.
+Django borrows a connection when it connects and hands it back when it closes, which with CONN_MAX_AGE = 0
+happens at the end of every request, so the connections are shared by every thread of the worker instead of
+being opened per request or pinned to one thread. Connections idle for longer than IDLE_TIMEOUT seconds are
+closed, and a borrower waits up to WAIT_TIMEOUT seconds for a connection when all of them are in use.
+"""
+import collections
+import os
+import threading
+import time
+
+import psycopg2
+from psycopg2 import extensions
+
+# Connections idle for longer than this are pinged before they are handed out when health checks are enabled.
+HEALTH_CHECK_AFTER = 30
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class ConnectionPool:
+    def __init__(self, label, conn_params, max_size=10, idle_timeout=300, wait_timeout=10, health_checks=False):
+        self.label = label
+        self.conn_params = conn_params
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.wait_timeout = wait_timeout
+        self.health_checks = health_checks
+        self.pid = os.getpid()
+        self._condition = threading.Condition()
+        self._idle = collections.deque()  # (connection, returned_at), most recently returned last
+        self._size = 0
+        self._in_use = 0
+        self._stats = {'created': 0, 'borrowed': 0, 'reused': 0, 'waits': 0, 'timeouts': 0, 'closed_idle': 0,
+                       'closed_broken': 0, 'wait_ms': 0.0}
+
+    def _close(self, connection, reason):
+        # Called with the condition held.
+        self._size -= 1
+        self._stats[reason] += 1
+        try:
+            connection.close()
+        except psycopg2.Error:
+            pass
+
+    def _evict_idle(self, now):
+        while self._idle and now - self._idle[0][1] >= self.idle_timeout:
+            self._close(self._idle.popleft()[0], 'closed_idle')
+
+    def _is_usable(self, connection, returned_at, now):
+        if connection.closed:
+            return False
+        if not self.health_checks or now - returned_at < HEALTH_CHECK_AFTER:
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+        except psycopg2.Error:
+            return False
+        return True
+
+    def acquire(self):
+        """
+        Borrow an idle connection, open a new one while the pool is below MAX_SIZE, or wait for one to be
+        released. Raises psycopg2.OperationalError once WAIT_TIMEOUT runs out.
+        """
+        start = time.monotonic()
+        deadline = start + self.wait_timeout
+        waited = False
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                self._evict_idle(now)
+                while self._idle:
+                    connection, returned_at = self._idle.pop()
+                    if self._is_usable(connection, returned_at, now):
+                        self._in_use += 1
+                        self._stats['borrowed'] += 1
+                        self._stats['reused'] += 1
+                        self._stats['wait_ms'] += (time.monotonic() - start) * 1000
+                        return connection
+                    self._close(connection, 'closed_broken')
+                if self._size < self.max_size:
+                    # Reserve the slot and connect outside the lock.
+                    self._size += 1
+                    self._in_use += 1
+                    break
+                if not waited:
+                    waited = True
+                    self._stats['waits'] += 1
+                remaining = deadline - now
+                if remaining <= 0 or not self._condition.wait(remaining):
+                    self._stats['timeouts'] += 1
+                    raise psycopg2.OperationalError(
+                        f'Connection pool {self.label} exhausted: {self.max_size} connections in use for '
+                        f'{self.wait_timeout}s.'
+                    )
+
+        try:
+            connection = psycopg2.connect(**self.conn_params)
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._in_use -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._stats['created'] += 1
+            self._stats['borrowed'] += 1
+            self._stats['wait_ms'] += (time.monotonic() - start) * 1000
+        return connection
+
+    def release(self, connection):
+        """
+        Hand a borrowed connection back. An open transaction is rolled back; connections that are closed or
+        cannot be rolled back are discarded.
+        """
+        broken = bool(connection.closed)
+        if not broken:
+            try:
+                if connection.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    connection.rollback()
+                broken = connection.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE
+            except psycopg2.Error:
+                broken = True
+        with self._condition:
+            self._in_use -= 1
+            if broken or self.pid != os.getpid():
+                self._close(connection, 'closed_broken')
+            else:
+                self._idle.append((connection, time.monotonic()))
+            self._condition.notify()
+
+    def close_all(self):
+        with self._condition:
+            while self._idle:
+                self._close(self._idle.popleft()[0], 'closed_idle')
+
+    def stats(self):
+        with self._condition:
+            self._evict_idle(time.monotonic())
+            return {
+                'max_size': self.max_size,
+                'size': self._size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                **self._stats,
+                'wait_ms': round(self._stats['wait_ms'], 2),
+            }
+
+
+def get_pool(alias, conn_params, options, health_checks=False):
+    """
+    The pool of this process for `alias` and `conn_params`, created on first use. A forked worker never
+    reuses the pools (and sockets) of its parent.
+    """
+    key = (alias, repr(sorted(conn_params.items())))
+    pool = _pools.get(key)
+    if pool is not None and pool.pid == os.getpid():
+        return pool
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None or pool.pid != os.getpid():
+            label = f"{alias}:{conn_params.get('dbname', '')}"
+            pool = _pools[key] = ConnectionPool(
+                label, conn_params, max_size=options.get('MAX_SIZE', 10),
+                idle_timeout=options.get('IDLE_TIMEOUT', 300), wait_timeout=options.get('WAIT_TIMEOUT', 10),
+                health_checks=health_checks,
+            )
+        return pool
+
+
+def pool_stats():
+    """
+    Usage counters of every pool of this process, keyed by alias and database name.
+    """
+    return {pool.label: pool.stats() for pool in list(_pools.values()) if pool.pid == os.getpid()}
+
+
+def close_pools():
+    for pool in list(_pools.values()):
+        pool.close_all()
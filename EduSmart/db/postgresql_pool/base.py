@@ -0,0 +1,52 @@
+"""
+PostgreSQL backend that borrows its connections from the in-process pool in EduSmart.db.pool.
+
+Configured with a POOL dict (MAX_SIZE, IDLE_TIMEOUT, WAIT_TIMEOUT) next to the usual DATABASES keys; it only
+supports psycopg2. CONN_MAX_AGE should be 0 so that every request hands its connection back to the pool.
+"""
+import psycopg2.extras
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel, is_psycopg3
+from django.utils.asyncio import async_unsafe
+
+from EduSmart.db.pool import get_pool
+
+if is_psycopg3:
+    raise ImproperlyConfigured('EduSmart.db.postgresql_pool requires psycopg2.')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    pool = None
+
+    @async_unsafe
+    def get_new_connection(self, conn_params):
+        # Same as the stock backend, with the connect call replaced by a pool checkout.
+        options = self.settings_dict['OPTIONS']
+        set_isolation_level = False
+        try:
+            isolation_level_value = options['isolation_level']
+        except KeyError:
+            self.isolation_level = IsolationLevel.READ_COMMITTED
+        else:
+            try:
+                self.isolation_level = IsolationLevel(isolation_level_value)
+                set_isolation_level = True
+            except ValueError:
+                raise ImproperlyConfigured(
+                    f'Invalid transaction isolation level {isolation_level_value} '
+                    f'specified. Use one of the psycopg.IsolationLevel values.'
+                )
+        # The connection goes back to the pool it came from even if settings_dict changes meanwhile.
+        self.pool = get_pool(self.alias, conn_params, self.settings_dict.get('POOL', {}),
+                             health_checks=self.settings_dict['CONN_HEALTH_CHECKS'])
+        connection = self.pool.acquire()
+        if set_isolation_level:
+            connection.isolation_level = self.isolation_level
+        psycopg2.extras.register_default_jsonb(conn_or_curs=connection, loads=lambda x: x)
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.release(self.connection)
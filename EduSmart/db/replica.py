@@ -0,0 +1,161 @@
+"""
+Read-replica routing.
+
+Views that only read mix in ReplicaReadMixin; their safe requests read from the `replica` database alias when
+one is configured, everything else keeps using `default`. A user who wrote something reads from the primary
+for REPLICA_STICKY_SECONDS afterwards, so a list fetched right after marking attendance or paying a fee never
+misses the row that has not reached the replica yet. ReplicaStickinessMiddleware notices the writes, and reads
+that follow a write in the same request stay on the primary too.
+
+The pins live in the REPLICA_PIN_CACHE cache, which every worker has to share since the next request of a user
+can land on any of them; the `replica.E001` check refuses a per-process cache once a replica is configured.
+"""
+import contextvars
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from rest_framework.permissions import SAFE_METHODS
+
+REPLICA_DATABASE = 'replica'
+PRIMARY_DATABASE = 'default'
+PIN_CACHE_KEY = 'replica:pin:{}'
+# App label of the model DatabaseCache queries its table through.
+CACHE_APP_LABEL = 'django_cache'
+PROCESS_LOCAL_CACHES = ('django.core.cache.backends.locmem.LocMemCache', 'django.core.cache.backends.dummy.DummyCache')
+
+_routing = contextvars.ContextVar('replica_routing', default=None)
+
+
+class _RoutingState:
+    def __init__(self):
+        self.use_replica = False
+        self.wrote = False
+
+
+def replica_configured():
+    return REPLICA_DATABASE in settings.DATABASES
+
+
+def check_pin_cache(app_configs, **kwargs):
+    """
+    With a replica configured, the pins must be kept in a cache shared by every worker.
+    """
+    if not replica_configured():
+        return []
+    backend = settings.CACHES.get(settings.REPLICA_PIN_CACHE, {}).get('BACKEND')
+    if backend in PROCESS_LOCAL_CACHES:
+        return [checks.Error(
+            f'REPLICA_PIN_CACHE uses {backend}, so a worker cannot see the pins set by the others.',
+            hint='Point REPLICA_PIN_CACHE at a database, Redis or Memcached cache.',
+            id='replica.E001',
+        )]
+    return []
+
+
+def pin_to_primary(user):
+    """
+    Send the reads of `user` to the primary for REPLICA_STICKY_SECONDS.
+    """
+    if user is not None and user.is_authenticated:
+        caches[settings.REPLICA_PIN_CACHE].set(PIN_CACHE_KEY.format(user.pk), True, settings.REPLICA_STICKY_SECONDS)
+
+
+def is_pinned_to_primary(user):
+    return (user is not None and user.is_authenticated
+            and caches[settings.REPLICA_PIN_CACHE].get(PIN_CACHE_KEY.format(user.pk)) is not None)
+
+
+class ReplicaRouter:
+    """
+    Reads go to the replica only inside a ReplicaReadMixin view that allowed it, writes always go to the
+    primary. The replica is a physical copy of the primary and is never migrated. A database cache (the pins)
+    is read from the primary and its writes do not count as writes of the request.
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == CACHE_APP_LABEL:
+            return PRIMARY_DATABASE
+        state = _routing.get()
+        if state is not None and state.use_replica and not state.wrote and replica_configured():
+            return REPLICA_DATABASE
+        return None
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None and model._meta.app_label != CACHE_APP_LABEL:
+            state.wrote = True
+        return PRIMARY_DATABASE
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA_DATABASE
+
+
+class ReplicaReadMixin:
+    """
+    Mix into an APIView (before APIView) to serve its GET requests from the replica. The user is
+    authenticated against the primary, and users pinned by a recent write keep reading from the primary.
+    Streamed content has to be wrapped in `replica_stream` to be read from the replica as well.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if _routing.get() is not None:
+            return super().dispatch(request, *args, **kwargs)
+        token = _routing.set(_RoutingState())
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            _routing.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        state = _routing.get()
+        state.use_replica = request.method in SAFE_METHODS and not is_pinned_to_primary(request.user)
+
+
+def replica_stream(iterable):
+    """
+    Iterate `iterable`, the content of a StreamingHttpResponse of a ReplicaReadMixin view, with the routing of
+    that view: the response is streamed after `dispatch` has returned and restored the routing of the request.
+    """
+    state = _routing.get()
+
+    def chunks():
+        iterator = iter(iterable)
+        while True:
+            token = _routing.set(state)
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                _routing.reset(token)
+            yield chunk
+
+    return chunks()
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Pins the user of every request that wrote to the primary. Only enabled when a replica is configured.
+    """
+
+    def __init__(self, get_response):
+        if not replica_configured():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = _RoutingState()
+        token = _routing.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+        if state.wrote:
+            pin_to_primary(getattr(request, 'user', None))
+        return response
@@ -0,0 +1,350 @@
+"""
+Opt-in per-endpoint request metrics.
+
+RequestMetricsMiddleware records, for every request, the wall time, the number and total time of SQL
+queries, and the time spent building serializer data, keyed by the resolved URL name; a streamed response is
+recorded once its content has been sent. The numbers are aggregated in process into fixed-bucket histograms,
+which can be merged across gunicorn workers: when REQUEST_METRICS_DIR is set every worker periodically writes
+its snapshot there, and the report merges the snapshots of the workers still alive. A reset removes every
+snapshot and leaves a marker that makes the other workers drop their numbers on their next flush.
+"""
+import atexit
+import contextvars
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the histogram buckets; the last bucket catches everything above.
+TIME_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, float('inf'))
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, float('inf'))
+
+SORT_KEYS = ('total_ms', 'p95_ms', 'p50_ms', 'avg_queries', 'max_queries', 'count', 'avg_sql_ms',
+             'avg_serializer_ms')
+
+# File of REQUEST_METRICS_DIR holding the time of the last reset.
+RESET_MARKER = 'reset'
+
+_current_sample = contextvars.ContextVar('request_metrics_sample', default=None)
+
+
+def _bucket_index(buckets, value):
+    for index, bound in enumerate(buckets):
+        if value <= bound:
+            return index
+    return len(buckets) - 1
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _snapshot_pid(file_name):
+    # Snapshots are named <pid>.json; None for any other file.
+    name, extension = os.path.splitext(file_name)
+    return int(name) if extension == '.json' and name.isdigit() else None
+
+
+def _percentile(buckets, histogram, fraction):
+    # Upper bound of the bucket holding the requested rank; callers clamp it to the observed maximum.
+    total = sum(histogram)
+    if not total:
+        return 0
+    rank = fraction * total
+    seen = 0
+    for bound, hits in zip(buckets, histogram):
+        seen += hits
+        if seen >= rank:
+            return bound if bound != float('inf') else buckets[-2]
+    return buckets[-2]
+
+
+class EndpointStats:
+    def __init__(self):
+        self.count = 0
+        self.wall_ms = 0.0
+        self.sql_ms = 0.0
+        self.serializer_ms = 0.0
+        self.queries = 0
+        self.max_queries = 0
+        self.max_wall_ms = 0.0
+        self.wall_histogram = [0] * len(TIME_BUCKETS_MS)
+        self.query_histogram = [0] * len(QUERY_BUCKETS)
+
+    def add(self, wall_ms, sql_ms, serializer_ms, queries):
+        self.count += 1
+        self.wall_ms += wall_ms
+        self.sql_ms += sql_ms
+        self.serializer_ms += serializer_ms
+        self.queries += queries
+        self.max_queries = max(self.max_queries, queries)
+        self.max_wall_ms = max(self.max_wall_ms, wall_ms)
+        self.wall_histogram[_bucket_index(TIME_BUCKETS_MS, wall_ms)] += 1
+        self.query_histogram[_bucket_index(QUERY_BUCKETS, queries)] += 1
+
+    def merge(self, data):
+        self.count += data['count']
+        self.wall_ms += data['wall_ms']
+        self.sql_ms += data['sql_ms']
+        self.serializer_ms += data['serializer_ms']
+        self.queries += data['queries']
+        self.max_queries = max(self.max_queries, data['max_queries'])
+        self.max_wall_ms = max(self.max_wall_ms, data['max_wall_ms'])
+        self.wall_histogram = [a + b for a, b in zip(self.wall_histogram, data['wall_histogram'])]
+        self.query_histogram = [a + b for a, b in zip(self.query_histogram, data['query_histogram'])]
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'wall_ms': self.wall_ms,
+            'sql_ms': self.sql_ms,
+            'serializer_ms': self.serializer_ms,
+            'queries': self.queries,
+            'max_queries': self.max_queries,
+            'max_wall_ms': self.max_wall_ms,
+            'wall_histogram': self.wall_histogram,
+            'query_histogram': self.query_histogram,
+        }
+
+    def summary(self, endpoint):
+        count = self.count or 1
+        return {
+            'endpoint': endpoint,
+            'count': self.count,
+            'total_ms': round(self.wall_ms, 2),
+            'p50_ms': min(_percentile(TIME_BUCKETS_MS, self.wall_histogram, 0.50), round(self.max_wall_ms, 2)),
+            'p95_ms': min(_percentile(TIME_BUCKETS_MS, self.wall_histogram, 0.95), round(self.max_wall_ms, 2)),
+            'p99_ms': min(_percentile(TIME_BUCKETS_MS, self.wall_histogram, 0.99), round(self.max_wall_ms, 2)),
+            'max_ms': round(self.max_wall_ms, 2),
+            'avg_sql_ms': round(self.sql_ms / count, 2),
+            'avg_serializer_ms': round(self.serializer_ms / count, 2),
+            'avg_queries': round(self.queries / count, 2),
+            'p95_queries': min(_percentile(QUERY_BUCKETS, self.query_histogram, 0.95), self.max_queries),
+            'max_queries': self.max_queries,
+        }
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+        self._last_flush = time.monotonic()
+        self._started = time.time()
+
+    def record(self, endpoint, wall_ms, sql_ms, serializer_ms, queries):
+        with self._lock:
+            stats = self._stats.get(endpoint)
+            if stats is None:
+                stats = self._stats[endpoint] = EndpointStats()
+            stats.add(wall_ms, sql_ms, serializer_ms, queries)
+            now = time.monotonic()
+            flush_due = now - self._last_flush >= settings.REQUEST_METRICS_FLUSH_INTERVAL
+            if flush_due:
+                # Claim the flush before releasing the lock so that concurrent requests don't all write it.
+                self._last_flush = now
+        if flush_due:
+            self._write()
+
+    def snapshot(self):
+        with self._lock:
+            return {endpoint: stats.to_dict() for endpoint, stats in self._stats.items()}
+
+    def reset(self):
+        """
+        Drop the numbers of this worker and the snapshots of all of them; the other workers drop theirs when
+        they next flush.
+        """
+        with self._lock:
+            self._stats = {}
+            self._started = time.time()
+        directory = settings.REQUEST_METRICS_DIR
+        if not directory:
+            return
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, RESET_MARKER), 'w') as handle:
+            handle.write(repr(self._started))
+        for file_name in os.listdir(directory):
+            if _snapshot_pid(file_name) is not None:
+                try:
+                    os.remove(os.path.join(directory, file_name))
+                except FileNotFoundError:
+                    continue
+
+    def flush(self):
+        with self._lock:
+            self._last_flush = time.monotonic()
+        self._write()
+
+    def _write(self):
+        # Metrics are best effort: a full disk or a missing directory must not fail the request that flushes.
+        directory = settings.REQUEST_METRICS_DIR
+        if not directory:
+            return
+        try:
+            self._write_snapshot(directory)
+        except OSError:
+            logger.exception('Could not write the request metrics snapshot to %s', directory)
+
+    def _write_snapshot(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        try:
+            with open(os.path.join(directory, RESET_MARKER)) as handle:
+                reset_at = float(handle.read())
+        except (OSError, ValueError):
+            reset_at = None
+        with self._lock:
+            if reset_at is not None and reset_at > self._started:
+                self._stats = {}
+                self._started = reset_at
+        pid = os.getpid()
+        # Every write gets its own temporary file, so a direct flush racing a periodic one can't replace the
+        # other's file from under it.
+        descriptor, temp_path = tempfile.mkstemp(dir=directory, prefix=f'{pid}.', suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'w') as handle:
+                json.dump(self.snapshot(), handle)
+            os.replace(temp_path, os.path.join(directory, f'{pid}.json'))
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+registry = MetricsRegistry()
+atexit.register(registry.flush)
+
+
+def collect_report(sort='total_ms', limit=None):
+    """
+    Merge the in-process numbers with the snapshots flushed by the other live workers and rank the endpoints.
+    """
+    merged = {}
+    snapshots = [registry.snapshot()]
+    directory = settings.REQUEST_METRICS_DIR
+    if directory and os.path.isdir(directory):
+        for file_name in os.listdir(directory):
+            pid = _snapshot_pid(file_name)
+            if pid is None or pid == os.getpid() or not _pid_alive(pid):
+                continue
+            try:
+                with open(os.path.join(directory, file_name)) as handle:
+                    snapshots.append(json.load(handle))
+            except (OSError, ValueError):
+                continue
+    for snapshot in snapshots:
+        for endpoint, data in snapshot.items():
+            merged.setdefault(endpoint, EndpointStats()).merge(data)
+
+    report = [stats.summary(endpoint) for endpoint, stats in merged.items()]
+    report.sort(key=lambda row: row[sort], reverse=True)
+    return report[:limit] if limit else report
+
+
+class _Sample:
+    def __init__(self):
+        self.queries = 0
+        self.sql_ms = 0.0
+        self.serializer_ms = 0.0
+        self.serializer_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql_ms += (time.perf_counter() - start) * 1000
+
+
+def _install_serializer_timer():
+    from rest_framework.serializers import BaseSerializer
+
+    if getattr(BaseSerializer.data.fget, '_request_metrics', False):
+        return
+    original = BaseSerializer.data.fget
+
+    def timed_data(serializer):
+        sample = _current_sample.get()
+        if sample is None or sample.serializer_depth:
+            return original(serializer)
+        sample.serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return original(serializer)
+        finally:
+            sample.serializer_depth -= 1
+            sample.serializer_ms += (time.perf_counter() - start) * 1000
+
+    timed_data._request_metrics = True
+    BaseSerializer.data = property(timed_data)
+
+
+@contextmanager
+def _sampling(sample):
+    token = _current_sample.set(sample)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(sample))
+            yield
+    finally:
+        _current_sample.reset(token)
+
+
+class RequestMetricsMiddleware:
+    """
+    Enabled with REQUEST_METRICS_ENABLED; otherwise Django drops it from the middleware chain.
+    """
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        _install_serializer_timer()
+
+    def __call__(self, request):
+        sample = _Sample()
+        start = time.perf_counter()
+        with _sampling(sample):
+            response = self.get_response(request)
+        if response.streaming:
+            response.streaming_content = self._stream(request, response.streaming_content, sample, start)
+        else:
+            self._record(request, sample, start)
+        return response
+
+    def _stream(self, request, content, sample, start):
+        # The queries of a streamed response run while its content is sent, after __call__ has returned.
+        try:
+            iterator = iter(content)
+            while True:
+                with _sampling(sample):
+                    try:
+                        chunk = next(iterator)
+                    except StopIteration:
+                        return
+                yield chunk
+        finally:
+            self._record(request, sample, start)
+
+    def _record(self, request, sample, start):
+        wall_ms = (time.perf_counter() - start) * 1000
+        match = getattr(request, 'resolver_match', None)
+        endpoint = match.view_name if match else 'unresolved'
+        registry.record(endpoint, wall_ms, sample.sql_ms, sample.serializer_ms, sample.queries)
@@ -60,7 +60,8 @@ INSTALLED_APPS = [
     'superadmin',
     'bus',
     'content',
-    'management'
+    'management',
+    'attendance',
 
 ]
 
@@ -82,6 +83,8 @@ CSRF_COOKIE_HTTPONLY = False
 SESSION_COOKIE_SECURE = True
 
 MIDDLEWARE = [
+    'EduSmart.metrics.RequestMetricsMiddleware',
+    'EduSmart.db.replica.ReplicaStickinessMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -123,9 +126,123 @@ DATABASES = {
         'PASSWORD': 'Chowdary1#',
         'HOST': 'edusmart.postgres.database.azure.com',
         'PORT': 5432,
+        # Seconds a connection is kept open for the next requests of the same thread, 0 closes it per request.
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        # Reused connections are checked with SELECT 1 before the first query of a request.
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'true').lower() == 'true',
+        # Test databases are built straight from the models: the migration history cannot be replayed
+        # on an empty database because both authentication 0050 migrations add the same column.
+        'TEST': {'MIGRATE': False},
     }
 }
 
+# In-process connection pool shared by the threads of a worker, off unless DB_POOL_ENABLED=true. Connections
+# are returned to the pool after every request instead of being kept per thread, see EduSmart/db/pool.py.
+if os.getenv('DB_POOL_ENABLED', 'false').lower() == 'true':
+    DATABASES['default'].update({
+        'ENGINE': 'EduSmart.db.postgresql_pool',
+        'CONN_MAX_AGE': 0,
+        'POOL': {
+            'MAX_SIZE': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+            'IDLE_TIMEOUT': int(os.getenv('DB_POOL_IDLE_TIMEOUT', 300)),
+            'WAIT_TIMEOUT': int(os.getenv('DB_POOL_WAIT_TIMEOUT', 10)),
+        },
+    })
+
+# Optional read replica of the primary for the views marked with EduSmart.db.replica.ReplicaReadMixin.
+if os.getenv('DB_REPLICA_HOST'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': os.getenv('DB_REPLICA_HOST'),
+        'PORT': int(os.getenv('DB_REPLICA_PORT', DATABASES['default']['PORT'])),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+# Local test and benchmark runs can use SQLite instead of the shared PostgreSQL server, and a second SQLite
+# file can stand in for the replica when trying the routing out. Leave SQLITE_REPLICA_DATABASE unset for the
+# test suite: the replica connection cannot see the rows a test writes inside its transaction.
+if os.getenv('SQLITE_DATABASE'):
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('SQLITE_DATABASE'),
+            'TEST': {'MIGRATE': False},
+        },
+    }
+    if os.getenv('SQLITE_REPLICA_DATABASE'):
+        DATABASES['replica'] = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.getenv('SQLITE_REPLICA_DATABASE'),
+            'TEST': {'MIRROR': 'default'},
+        }
+
+DATABASE_ROUTERS = ['EduSmart.db.replica.ReplicaRouter']
+
+# Seconds a user reads from the primary instead of the replica after writing something.
+REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', 10))
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'edusmart',
+    }
+}
+
+# Cache of the users pinned to the primary after a write, see EduSmart/db/replica.py. Every worker has to see
+# the same pins, so with a replica it defaults to a table of the primary (`python manage.py createcachetable`);
+# REPLICA_PIN_CACHE_BACKEND and REPLICA_PIN_CACHE_LOCATION can point it at Redis or Memcached instead.
+REPLICA_PIN_CACHE = 'default'
+if 'replica' in DATABASES:
+    CACHES['replica_pins'] = {
+        'BACKEND': os.getenv('REPLICA_PIN_CACHE_BACKEND', 'django.core.cache.backends.db.DatabaseCache'),
+        'LOCATION': os.getenv('REPLICA_PIN_CACHE_LOCATION', 'replica_pin_cache'),
+    }
+    REPLICA_PIN_CACHE = 'replica_pins'
+
+# Seconds a resolved SchoolProfile is served from the cache before it is read again.
+TENANT_CACHE_TIMEOUT = int(os.getenv('TENANT_CACHE_TIMEOUT', 300))
+
+# Seconds an authenticated User is served from the cache instead of being loaded for every JWT request.
+PRINCIPAL_CACHE_TIMEOUT = int(os.getenv('PRINCIPAL_CACHE_TIMEOUT', 60))
+
+# Seconds the class overview of the admin home screen is cached, 0 to always compute it.
+CLASS_OVERVIEW_CACHE_TIMEOUT = int(os.getenv('CLASS_OVERVIEW_CACHE_TIMEOUT', 30))
+
+# Chronic-absence thresholds of detect_chronic_absence: consecutive absent days, and the absent share of the
+# marked days of the last 7 and 30 days once a window has at least ABSENCE_MIN_MARKED_DAYS marked days.
+ABSENCE_STREAK_DAYS = int(os.getenv('ABSENCE_STREAK_DAYS', 3))
+ABSENCE_RATE_7 = float(os.getenv('ABSENCE_RATE_7', 0.5))
+ABSENCE_RATE_30 = float(os.getenv('ABSENCE_RATE_30', 0.2))
+ABSENCE_MIN_MARKED_DAYS = int(os.getenv('ABSENCE_MIN_MARKED_DAYS', 4))
+
+# Largest batch the offline attendance sync accepts, and days its operation log is kept to answer replays.
+ATTENDANCE_SYNC_MAX_OPERATIONS = int(os.getenv('ATTENDANCE_SYNC_MAX_OPERATIONS', 500))
+ATTENDANCE_SYNC_RETENTION_DAYS = int(os.getenv('ATTENDANCE_SYNC_RETENTION_DAYS', 30))
+
+# Weekdays the schools are closed (0 is Monday), and seconds a school's working-day calendar is cached; it is
+# dropped whenever an academic calendar entry of that school changes.
+SCHOOL_WEEKEND_DAYS = [int(day) for day in os.getenv('SCHOOL_WEEKEND_DAYS', '6').split(',') if day.strip()]
+WORKING_DAYS_CACHE_TIMEOUT = int(os.getenv('WORKING_DAYS_CACHE_TIMEOUT', 3600))
+
+# Minutes before a class its teacher gets a push reminder, days of reminders kept queued ahead, reminders the
+# send_schedule_reminders worker sends per batch, seconds between its polls, attempts before a reminder is given
+# up and days sent reminders are kept.
+SCHEDULE_REMINDER_LEAD_MINUTES = int(os.getenv('SCHEDULE_REMINDER_LEAD_MINUTES', 15))
+SCHEDULE_REMINDER_DAYS_AHEAD = int(os.getenv('SCHEDULE_REMINDER_DAYS_AHEAD', 7))
+SCHEDULE_REMINDER_BATCH_SIZE = int(os.getenv('SCHEDULE_REMINDER_BATCH_SIZE', 100))
+SCHEDULE_REMINDER_POLL_SECONDS = int(os.getenv('SCHEDULE_REMINDER_POLL_SECONDS', 30))
+SCHEDULE_REMINDER_MAX_ATTEMPTS = int(os.getenv('SCHEDULE_REMINDER_MAX_ATTEMPTS', 3))
+SCHEDULE_REMINDER_RETENTION_DAYS = int(os.getenv('SCHEDULE_REMINDER_RETENTION_DAYS', 30))
+
+# Per-endpoint query count and latency metrics, off unless REQUEST_METRICS_ENABLED=true.
+REQUEST_METRICS_ENABLED = os.getenv('REQUEST_METRICS_ENABLED', 'false').lower() == 'true'
+# Directory every worker flushes its metrics snapshot to so the report covers all workers.
+REQUEST_METRICS_DIR = os.getenv('REQUEST_METRICS_DIR', '')
+REQUEST_METRICS_FLUSH_INTERVAL = int(os.getenv('REQUEST_METRICS_FLUSH_INTERVAL', 30))
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -183,8 +300,14 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'COERCE_DECIMAL_TO_STRING': False,
+    # orjson for JSON, MessagePack for clients sending Accept: application/msgpack.
+    'DEFAULT_RENDERER_CLASSES': (
+        'renderers.ORJSONRenderer',
+        'renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'authentication.authentication.CachedJWTAuthentication',
     ),
 }
 
@@ -28,5 +28,6 @@ urlpatterns = [
     path('bus/', include('bus.urls')),
     path('content/', include('content.urls')),
     path('management/', include('management.urls')),
+    path('attendance/', include('attendance.urls')),
 ]
 urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
@@ -0,0 +1,116 @@
+"""
+Chronic-absence detection.
+
+Each scanned student's last LOOKBACK_DAYS days of attendance are packed into two integers, one bit per day
+counted back from the scan date: the days they were marked and the days they were absent. The 7 and 30 day
+absence counts are then popcounts of those integers under a window mask, and the current absence streak is
+the number of absent days more recent than the last day they were present or on leave. Students crossing a
+threshold get an AbsenceFlag row, and flags of students back under every threshold are removed.
+
+A scan only reads the students with a day marked after the previous scan of their school, or a mark written
+since that scan started (a correction of an earlier day), plus the ones already flagged, so a daily run reads
+one day of new attendance per student.
+"""
+import datetime
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from attendance.models import AbsenceFlag, AbsenceScan
+from student.models import StudentAttendence
+
+LOOKBACK_DAYS = 60
+CHUNK_SIZE = 5000
+WINDOW_7 = (1 << 7) - 1
+WINDOW_30 = (1 << 30) - 1
+METRIC_FIELDS = ['as_of', 'absent_7', 'marked_7', 'absent_30', 'marked_30', 'streak', 'reasons']
+
+
+def _popcount(bits):
+    # int.bit_count() needs Python 3.10, the deploy workflow runs 3.8.
+    return bin(bits).count('1')
+
+
+def absence_metrics(absent, marked):
+    """
+    Window counts, streak and flag reasons of one student from their absent and marked day bits (bit 0 is
+    the scan date).
+    """
+    present = marked & ~absent
+    # Absent days more recent than the last present or leave day; absent throughout the lookback otherwise.
+    last_present = (present & -present).bit_length() - 1 if present else LOOKBACK_DAYS
+    metrics = {
+        'absent_7': _popcount(absent & WINDOW_7),
+        'marked_7': _popcount(marked & WINDOW_7),
+        'absent_30': _popcount(absent & WINDOW_30),
+        'marked_30': _popcount(marked & WINDOW_30),
+        'streak': _popcount(absent & ((1 << last_present) - 1)),
+    }
+    reasons = []
+    if metrics['streak'] >= settings.ABSENCE_STREAK_DAYS:
+        reasons.append('streak')
+    for days in (7, 30):
+        marked_days = metrics[f'marked_{days}']
+        if marked_days >= settings.ABSENCE_MIN_MARKED_DAYS and \
+                metrics[f'absent_{days}'] / marked_days >= getattr(settings, f'ABSENCE_RATE_{days}'):
+            reasons.append(f'rate_{days}')
+    metrics['reasons'] = reasons
+    return metrics
+
+
+def scan_school(school_id, as_of=None, full=False):
+    """
+    Refresh the absence flags of `school_id` as of `as_of` (today by default). Only students marked since the
+    previous scan and those already flagged are read unless `full` is set. Returns the scan counters.
+    """
+    started_at = timezone.now()
+    as_of = as_of or started_at.date()
+    window = (as_of - datetime.timedelta(days=LOOKBACK_DAYS - 1), as_of)
+    previous = AbsenceScan.objects.filter(school_id=school_id).values_list('last_date', 'started_at').first()
+    attendance = StudentAttendence.objects.filter(school_id=school_id, date__range=window)
+    if previous is not None and not full:
+        last_date, last_started_at = previous
+        recent = Q(date__gt=last_date)
+        if last_started_at is not None:
+            recent |= Q(marked_at__gte=last_started_at)
+        marked_since = StudentAttendence.objects.filter(recent, school_id=school_id, date__range=window)
+        attendance = attendance.filter(Q(student_id__in=marked_since.values('student_id')) |
+                                       Q(student_id__in=AbsenceFlag.objects.filter(school_id=school_id)
+                                         .values('student_id')))
+
+    days = defaultdict(lambda: [0, 0])
+    for student_id, date, mark in attendance.values_list('student_id', 'date', 'mark_attendence') \
+            .iterator(chunk_size=CHUNK_SIZE):
+        bit = 1 << (as_of - date).days
+        bits = days[student_id]
+        bits[1] |= bit
+        if mark == 'A':
+            bits[0] |= bit
+
+    flags = {flag.student_id: flag for flag in AbsenceFlag.objects.filter(school_id=school_id)}
+    created, changed, cleared = [], [], []
+    for student_id in days.keys() | flags.keys():
+        metrics = absence_metrics(*days.get(student_id, (0, 0)))
+        flag = flags.get(student_id)
+        if not metrics['reasons']:
+            if flag is not None:
+                cleared.append(flag.id)
+        elif flag is None:
+            created.append(AbsenceFlag(school_id=school_id, student_id=student_id, as_of=as_of,
+                                       flagged_since=as_of, **metrics))
+        else:
+            flag.as_of = as_of
+            for field, value in metrics.items():
+                setattr(flag, field, value)
+            changed.append(flag)
+
+    with transaction.atomic():
+        AbsenceFlag.objects.bulk_create(created, batch_size=CHUNK_SIZE)
+        AbsenceFlag.objects.bulk_update(changed, METRIC_FIELDS, batch_size=CHUNK_SIZE)
+        AbsenceFlag.objects.filter(id__in=cleared).delete()
+        AbsenceScan.objects.update_or_create(school_id=school_id,
+                                             defaults={'last_date': as_of, 'started_at': started_at})
+    return {'scanned': len(days), 'flagged': len(created), 'updated': len(changed), 'cleared': len(cleared)}
@@ -0,0 +1,118 @@
+"""
+Yearly attendance calendars.
+
+AttendanceCalendar keeps the year of a person as a string with one character per day of the year, the mark of
+that day (P, A or L) or UNMARKED, so the calendar screens read one short row instead of serializing every
+attendance row of the year. The write paths that refresh the rollups also rewrite the characters of the days
+they changed; `rebuild_attendance_rollups` recomputes the calendars from scratch.
+"""
+import calendar
+import hashlib
+
+from django.db import transaction
+from django.utils import timezone
+
+from attendance.models import AttendanceCalendar
+
+UNMARKED = '-'
+BATCH_SIZE = 5000
+
+
+def year_length(year):
+    return 366 if calendar.isleap(year) else 365
+
+
+def encode_days(year, marks):
+    """
+    The calendar string of `year` from (date, mark) pairs of that year.
+    """
+    days = [UNMARKED] * year_length(year)
+    for date, mark in marks:
+        days[date.timetuple().tm_yday - 1] = mark
+    return ''.join(days)
+
+
+def calendar_etag(row):
+    return '"{}"'.format(hashlib.md5(f'{row.person_type}:{row.person_id}:{row.year}:{row.days}'.encode())
+                         .hexdigest())
+
+
+def _calendars(kind, attendance):
+    """
+    Yield an unsaved AttendanceCalendar per person and year of `attendance`, reading it once in person order.
+    """
+    person_id_field = f'{kind.person_field}_id'
+    rows = attendance.order_by(person_id_field, 'date').values_list(person_id_field, 'school_id', 'date',
+                                                                    'mark_attendence')
+    current, school_id, marks = None, None, []
+    for person_id, row_school_id, date, mark in rows.iterator(chunk_size=BATCH_SIZE):
+        if (person_id, date.year) != current:
+            if current is not None:
+                yield AttendanceCalendar(school_id=school_id or '', person_type=kind.person_field,
+                                         person_id=current[0], year=current[1], days=encode_days(current[1], marks))
+            current, school_id, marks = (person_id, date.year), row_school_id, []
+        marks.append((date, mark))
+    if current is not None:
+        yield AttendanceCalendar(school_id=school_id or '', person_type=kind.person_field, person_id=current[0],
+                                 year=current[1], days=encode_days(current[1], marks))
+
+
+def update_calendars(kind, school_id, marks):
+    """
+    Write `marks` ({(person_id, date): mark, or None for a deleted day}) into the calendars of `school_id`,
+    changing only those days, in a constant number of queries whatever the number of marks.
+    """
+    if not marks:
+        return
+    person_ids = {person_id for person_id, _ in marks}
+    years = {date.year for _, date in marks}
+    existing = AttendanceCalendar.objects.filter(person_type=kind.person_field, person_id__in=person_ids,
+                                                 year__in=years)
+    rows = {(row.person_id, row.year): row for row in existing}
+    days = {key: list(row.days) for key, row in rows.items()}
+    for (person_id, date), mark in marks.items():
+        key = (person_id, date.year)
+        if key not in days:
+            days[key] = [UNMARKED] * year_length(date.year)
+        days[key][date.timetuple().tm_yday - 1] = mark or UNMARKED
+
+    changed, created = [], []
+    for (person_id, year), characters in days.items():
+        encoded = ''.join(characters)
+        row = rows.get((person_id, year))
+        if row is None:
+            created.append(AttendanceCalendar(school_id=school_id or '', person_type=kind.person_field,
+                                              person_id=person_id, year=year, days=encoded))
+        elif row.days != encoded:
+            row.days = encoded
+            row.updated_at = timezone.now()
+            changed.append(row)
+
+    if changed:
+        AttendanceCalendar.objects.bulk_update(changed, ['days', 'updated_at'])
+    if created:
+        AttendanceCalendar.objects.bulk_create(created)
+
+
+def rebuild_calendars(kinds, school_id=None):
+    """
+    Replace the calendars of `kinds` (of one school when given) with freshly computed ones. Returns the number
+    of calendars written.
+    """
+    written = 0
+    for kind in kinds:
+        attendance = kind.model.objects.all()
+        calendars = AttendanceCalendar.objects.filter(person_type=kind.person_field)
+        if school_id:
+            attendance = attendance.filter(school_id=school_id)
+            calendars = calendars.filter(school_id=school_id)
+        with transaction.atomic():
+            calendars.delete()
+            batch = []
+            for row in _calendars(kind, attendance):
+                batch.append(row)
+                if len(batch) == BATCH_SIZE:
+                    written += len(AttendanceCalendar.objects.bulk_create(batch))
+                    batch = []
+            written += len(AttendanceCalendar.objects.bulk_create(batch))
+    return written
@@ -0,0 +1,165 @@
+"""
+Streaming attendance register exports.
+
+A register is one row per person and month with a column per day of the month and the P, A and L totals of
+that row. People and attendance are read with two server-side cursors ordered by person id and merged as
+they go, so a yearly export of a whole school holds one person's month in memory at a time. Rows are written
+as CSV or as a minimal XLSX workbook streamed through zipfile.
+"""
+import calendar
+import csv
+import datetime
+import zipfile
+from xml.sax.saxutils import escape
+
+CHUNK_SIZE = 2000
+MARKS = ('P', 'A', 'L')
+
+# Columns identifying a person in the register, after the id, per person type.
+PERSON_COLUMNS = {
+    'student': (('roll_no', 'Roll No'), ('name', 'Name'), ('class_enrolled', 'Class'), ('section', 'Section')),
+    'teacher': (('full_name', 'Name'),),
+    'staff': (('first_name', 'First Name'), ('last_name', 'Last Name')),
+}
+
+
+def register_months(year, month=None):
+    if month:
+        return [(year, month)]
+    return [(year, number) for number in range(1, 13)]
+
+
+def header(kind):
+    columns = [label for _, label in PERSON_COLUMNS[kind.person_field]]
+    return ['Id', *columns, 'Month', *range(1, 32), *MARKS]
+
+
+def register_rows(kind, people, year, month=None):
+    """
+    Yield the header and then one row per person of `people` (a queryset) and month, merging the people with
+    their attendance of the period in a single pass over both.
+    """
+    months = register_months(year, month)
+    first = datetime.date(*months[0], 1)
+    last = datetime.date(*months[-1], calendar.monthrange(*months[-1])[1])
+    person_id_field = f'{kind.person_field}_id'
+    fields = [field for field, _ in PERSON_COLUMNS[kind.person_field]]
+
+    attendance = kind.model.objects.filter(**{f'{kind.person_field}__in': people.values('id')},
+                                           date__range=(first, last)) \
+        .order_by(person_id_field, 'date').values_list(person_id_field, 'date', 'mark_attendence')
+    marks = attendance.iterator(chunk_size=CHUNK_SIZE)
+    pending = next(marks, None)
+
+    yield header(kind)
+    for person in people.order_by('id').values_list('id', *fields).iterator(chunk_size=CHUNK_SIZE):
+        days = {}
+        while pending is not None and pending[0] <= person[0]:
+            if pending[0] == person[0]:
+                days[(pending[1].month, pending[1].day)] = pending[2]
+            pending = next(marks, None)
+        for year_number, month_number in months:
+            cells = [days.get((month_number, day), '') for day in range(1, 32)]
+            totals = [cells.count(mark) for mark in MARKS]
+            yield [*person, f'{year_number}-{month_number:02d}', *cells, *totals]
+
+
+class _Echo:
+    """
+    Write target that hands back what is written, so each csv row can be yielded as it is produced.
+    """
+    def write(self, value):
+        return value
+
+
+def stream_csv(rows):
+    writer = csv.writer(_Echo())
+    for row in rows:
+        yield writer.writerow(row)
+
+
+class _Chunks:
+    """
+    Unseekable write target collecting the bytes zipfile writes until they are drained.
+    """
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data, self.chunks = b''.join(self.chunks), []
+        return data
+
+
+XLSX_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="xl/workbook.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+        '</Relationships>'
+    ),
+    'xl/workbook.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Attendance" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" Target="worksheets/sheet1.xml" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+        '</Relationships>'
+    ),
+}
+
+
+def _xlsx_cell(value):
+    if isinstance(value, int):
+        return f'<c><v>{value}</v></c>'
+    return f'<c t="inlineStr"><is><t>{escape(str(value if value is not None else ""))}</t></is></c>'
+
+
+def stream_xlsx(rows):
+    """
+    Yield an XLSX workbook with one sheet holding `rows`, a few rows' worth of bytes at a time.
+    """
+    sink = _Chunks()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_DEFLATED) as workbook:
+        for name, content in XLSX_PARTS.items():
+            workbook.writestr(name, content)
+        with workbook.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                        b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>')
+            for row in rows:
+                sheet.write(f'<row>{"".join(_xlsx_cell(value) for value in row)}</row>'.encode())
+                data = sink.drain()
+                if data:
+                    yield data
+            sheet.write(b'</sheetData></worksheet>')
+    yield sink.drain()
+
+
+EXPORT_FORMATS = {
+    'csv': (stream_csv, 'text/csv'),
+    'xlsx': (stream_xlsx, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
@@ -0,0 +1,13 @@
+from collections import namedtuple
+
+from authentication.models import StaffAttendence, StaffUser, StudentUser, TeacherAttendence, TeacherUser
+from student.models import StudentAttendence
+
+# person_field is both the foreign key of the attendance model and the person_type of its rollups.
+AttendanceKind = namedtuple('AttendanceKind', ['model', 'person_model', 'person_field'])
+
+STUDENT = AttendanceKind(StudentAttendence, StudentUser, 'student')
+TEACHER = AttendanceKind(TeacherAttendence, TeacherUser, 'teacher')
+STAFF = AttendanceKind(StaffAttendence, StaffUser, 'staff')
+
+KINDS = {kind.person_field: kind for kind in (STUDENT, TEACHER, STAFF)}
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from attendance.kinds import KINDS
+from attendance.rollups import rebuild_rollups
+from attendance.storage import backfill_school_ids, dedupe, find_duplicates, normalize_marks
+
+
+class Command(BaseCommand):
+    help = ('Fill in school_id, rewrite long marks to P, A or L and delete duplicated days of the attendance '
+            'tables. Run it before migrating to the (person, date) unique constraint on large tables.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--type', dest='person_types', nargs='*', choices=list(KINDS), default=list(KINDS),
+                            help='Person types to clean, all by default.')
+        parser.add_argument('--dry-run', action='store_true', help='Only report the duplicated days.')
+
+    def handle(self, *args, **options):
+        for person_type in options['person_types']:
+            kind = KINDS[person_type]
+            if options['dry_run']:
+                duplicates = find_duplicates(kind.model, kind.person_field)
+                self.stdout.write(f'{person_type}: {len(duplicates)} duplicated days.')
+                continue
+
+            backfilled = backfill_school_ids(kind.model, kind.person_field)
+            with transaction.atomic():
+                normalized, unknown = normalize_marks(kind.model)
+                deleted = dedupe(kind.model, kind.person_field)
+            if normalized or deleted:
+                rebuild_rollups([kind])
+            self.stdout.write(f'{person_type}: {backfilled} school ids filled in, {normalized} marks rewritten, '
+                              f'{deleted} duplicated rows deleted.')
+            if unknown:
+                self.stderr.write(f'{person_type}: unknown marks left to correct by hand: {", ".join(unknown)}')
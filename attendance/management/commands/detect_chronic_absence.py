@@ -0,0 +1,29 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand
+
+from attendance.absence import scan_school
+from superadmin.models import SchoolProfile
+
+
+class Command(BaseCommand):
+    help = ('Flag students with chronic absences (absence streaks and high 7 or 30 day absence rates). Meant to '
+            'run daily from cron; each run only reads the attendance marked since the previous one.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--school-id', default=None, help='Only scan this school.')
+        parser.add_argument('--as-of', type=datetime.date.fromisoformat, default=None,
+                            help='Scan up to this day (YYYY-MM-DD), today by default.')
+        parser.add_argument('--full', action='store_true', help='Rescan every student, not only the new days.')
+
+    def handle(self, *args, **options):
+        if options['school_id']:
+            school_ids = [options['school_id']]
+        else:
+            school_ids = SchoolProfile.objects.values_list('school_id', flat=True)
+        for school_id in school_ids:
+            start = time.perf_counter()
+            counters = scan_school(school_id, as_of=options['as_of'], full=options['full'])
+            summary = ', '.join(f'{count} {name}' for name, count in counters.items())
+            self.stdout.write(f'{school_id}: {summary} in {time.perf_counter() - start:.2f}s.')
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from attendance.sync import prune_operations
+
+
+class Command(BaseCommand):
+    help = ('Delete the offline attendance sync operations older than ATTENDANCE_SYNC_RETENTION_DAYS, after which '
+            'a replay of them is applied again. Meant to run daily from cron.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None, help='Keep this many days instead.')
+
+    def handle(self, *args, **options):
+        deleted = prune_operations(options['days'])
+        self.stdout.write(f'Deleted {deleted} synced operations.')
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from attendance.calendars import rebuild_calendars
+from attendance.kinds import KINDS
+from attendance.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = ('Recompute the monthly attendance rollups and the yearly attendance calendars from the student, '
+            'teacher and staff attendance tables.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--school-id', default=None, help='Only rebuild the rollups of this school.')
+        parser.add_argument('--type', dest='person_types', nargs='*', choices=list(KINDS), default=list(KINDS),
+                            help='Person types to rebuild, all by default.')
+
+    def handle(self, *args, **options):
+        for person_type in options['person_types']:
+            rollups = rebuild_rollups([KINDS[person_type]], school_id=options['school_id'])
+            calendars = rebuild_calendars([KINDS[person_type]], school_id=options['school_id'])
+            self.stdout.write(f'{person_type}: {rollups} monthly rollups and {calendars} calendars written.')
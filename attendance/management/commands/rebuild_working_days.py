@@ -0,0 +1,28 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from attendance.workdays import WORKING, invalidate_working_days, working_days
+from superadmin.models import SchoolProfile
+
+
+class Command(BaseCommand):
+    help = ('Recompute the working-day calendars of the schools from SCHOOL_WEEKEND_DAYS and their academic '
+            'calendars, e.g. after changing the weekend. Calendars are otherwise built on first use.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--school-id', default=None, help='Only rebuild the calendars of this school.')
+        parser.add_argument('--year', dest='years', type=int, nargs='*', default=None,
+                            help='Years to precompute, this year and the next by default.')
+
+    def handle(self, *args, **options):
+        today = datetime.date.today()
+        years = options['years'] or [today.year, today.year + 1]
+        if options['school_id']:
+            school_ids = [options['school_id']]
+        else:
+            school_ids = SchoolProfile.objects.values_list('school_id', flat=True)
+        for school_id in school_ids:
+            invalidate_working_days(school_id)
+            counts = ', '.join(f'{year}: {working_days(school_id, year).count(WORKING)}' for year in years)
+            self.stdout.write(f'{school_id}: working days {counts}.')
@@ -0,0 +1,88 @@
+"""
+Bulk attendance marking shared by the student, teacher and staff register endpoints.
+
+A register is validated as a whole, its person ids are resolved with one query scoped to the school, and the
+rows are upserted on (person, date) in one transaction, so saving a class costs the same number of queries
+whatever its size. A correction updates the existing row of that day instead of adding another one.
+`write_marks` is the upsert itself, shared with the offline sync of attendance.sync.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from attendance.calendars import update_calendars
+from attendance.kinds import STUDENT
+from attendance.rollups import refresh_rollups
+from attendance.serializers import AttendanceEntrySerializer
+from student.overview import invalidate_class_overview
+
+CREATED = 'created'
+UPDATED = 'updated'
+UNCHANGED = 'unchanged'
+
+
+def write_marks(kind, school_id, marks):
+    """
+    Upsert `marks` ({(person_id, date): (mark, marked_at)}) of the people of `school_id` and bring the rollups
+    and calendars of those days up to date, in a constant number of queries. Meant to run in the transaction
+    that read the existing rows; the caller invalidates the class overviews once it commits.
+    """
+    if not marks:
+        return
+    person_id_field = f'{kind.person_field}_id'
+    # (person, date) is unique, so new and corrected days are written with one upsert.
+    kind.model.objects.bulk_create(
+        [kind.model(**{person_id_field: person_id}, date=date, mark_attendence=mark, marked_at=marked_at,
+                    school_id=school_id) for (person_id, date), (mark, marked_at) in marks.items()],
+        update_conflicts=True, unique_fields=[kind.person_field, 'date'],
+        update_fields=['mark_attendence', 'marked_at', 'school_id'])
+    refresh_rollups(kind, {(person_id, date.year, date.month) for person_id, date in marks})
+    update_calendars(kind, school_id, {key: mark for key, (mark, _) in marks.items()})
+
+
+def mark_attendance(kind, school_id, entries):
+    """
+    Upsert `entries` ([{'id', 'date', 'mark_attendence'}, ...]) for the people of `school_id`.
+
+    Returns (results, errors). When any entry is invalid or names someone outside the school nothing is
+    written, `results` is None and `errors` holds one dict per entry (empty for the valid ones). Otherwise
+    `errors` is None and `results` holds one {'id', 'date', 'mark_attendence', 'status'} per entry, with status
+    created, updated or unchanged. The last entry wins when the same person and date appear twice.
+    """
+    serializer = AttendanceEntrySerializer(data=entries, many=True)
+    if not serializer.is_valid():
+        errors = serializer.errors
+        return None, errors if isinstance(errors, list) else [errors]
+    rows = serializer.validated_data
+
+    person_ids = {row['id'] for row in rows}
+    known_ids = set(kind.person_model.objects.filter(id__in=person_ids, user__school_id=school_id)
+                    .values_list('id', flat=True))
+    if known_ids != person_ids:
+        return None, [{} if row['id'] in known_ids else {'id': ['Not found.']} for row in rows]
+
+    marks = {(row['id'], row['date']): row['mark_attendence'] for row in rows}
+    person_id_field = f'{kind.person_field}_id'
+    status = {}
+    with transaction.atomic():
+        existing = kind.model.objects.select_for_update().filter(
+            **{f'{person_id_field}__in': person_ids}, date__in={row['date'] for row in rows}
+        ).values_list(person_id_field, 'date', 'mark_attendence')
+        for person_id, date, mark in existing:
+            if (person_id, date) in marks:
+                status[(person_id, date)] = UNCHANGED if mark == marks[(person_id, date)] else UPDATED
+
+        now = timezone.now()
+        written = {key: (mark, now) for key, mark in marks.items() if status.get(key) != UNCHANGED}
+        write_marks(kind, school_id, written)
+        for key in written:
+            status.setdefault(key, CREATED)
+    if kind is STUDENT:
+        invalidate_class_overview(school_id, *{date for _, date in written})
+
+    results = [{
+        'id': row['id'],
+        'date': row['date'],
+        'mark_attendence': marks[(row['id'], row['date'])],
+        'status': status[(row['id'], row['date'])],
+    } for row in rows]
+    return results, None
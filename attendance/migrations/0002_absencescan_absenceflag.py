@@ -0,0 +1,44 @@
+# Generated by Django 4.2.10 on 2026-10-17 05:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0086_attendence_unique_date'),
+        ('attendance', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AbsenceScan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('school_id', models.CharField(max_length=255, unique=True)),
+                ('last_date', models.DateField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AbsenceFlag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('school_id', models.CharField(max_length=255)),
+                ('as_of', models.DateField()),
+                ('absent_7', models.PositiveSmallIntegerField(default=0)),
+                ('marked_7', models.PositiveSmallIntegerField(default=0)),
+                ('absent_30', models.PositiveSmallIntegerField(default=0)),
+                ('marked_30', models.PositiveSmallIntegerField(default=0)),
+                ('streak', models.PositiveSmallIntegerField(default=0)),
+                ('reasons', models.JSONField(default=list)),
+                ('flagged_since', models.DateField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='absence_flag', to='authentication.studentuser')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['school_id', '-streak'], name='attendance__school__ec4fa9_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.10 on 2026-10-17 05:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0002_absencescan_absenceflag'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceCalendar',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('school_id', models.CharField(max_length=255)),
+                ('person_type', models.CharField(choices=[('student', 'Student'), ('teacher', 'Teacher'), ('staff', 'Staff')], max_length=10)),
+                ('person_id', models.BigIntegerField()),
+                ('year', models.PositiveSmallIntegerField()),
+                ('days', models.CharField(max_length=366)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('person_type', 'person_id', 'year')},
+            },
+        ),
+    ]
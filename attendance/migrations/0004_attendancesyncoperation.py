@@ -0,0 +1,32 @@
+# Generated by Django 4.2.10 on 2026-10-17 05:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0003_attendancecalendar'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceSyncOperation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('school_id', models.CharField(max_length=255)),
+                ('op_id', models.UUIDField()),
+                ('device_id', models.CharField(blank=True, max_length=255)),
+                ('student_id', models.BigIntegerField()),
+                ('date', models.DateField()),
+                ('mark_attendence', models.CharField(max_length=1)),
+                ('recorded_at', models.DateTimeField()),
+                ('status', models.CharField(max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['created_at'], name='attendance__created_cf9062_idx')],
+                'unique_together': {('school_id', 'op_id')},
+            },
+        ),
+    ]
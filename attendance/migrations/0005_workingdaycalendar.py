@@ -0,0 +1,26 @@
+# Generated by Django 4.2.10 on 2026-10-17 05:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0004_attendancesyncoperation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkingDayCalendar',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('school_id', models.CharField(max_length=255)),
+                ('year', models.PositiveSmallIntegerField()),
+                ('days', models.CharField(max_length=366)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('school_id', 'year')},
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.10 on 2026-10-17 05:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0005_workingdaycalendar'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='absencescan',
+            name='started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
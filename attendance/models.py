@@ -0,0 +1,129 @@
+from django.db import models
+
+from authentication.models import StudentUser
+
+PERSON_TYPE_CHOICES = [
+    ('student', 'Student'),
+    ('teacher', 'Teacher'),
+    ('staff', 'Staff'),
+]
+
+
+class AttendanceRollup(models.Model):
+    """
+    Present, absent and leave counts of one student, teacher or staff member for one month, kept in step with
+    the attendance tables by attendance.rollups.
+    """
+    school_id = models.CharField(max_length=255)
+    person_type = models.CharField(max_length=10, choices=PERSON_TYPE_CHOICES)
+    person_id = models.BigIntegerField()
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField()
+    present = models.PositiveIntegerField(default=0)
+    absent = models.PositiveIntegerField(default=0)
+    leave = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('person_type', 'person_id', 'year', 'month')
+        indexes = [models.Index(fields=['school_id', 'person_type', 'year'])]
+
+    def __str__(self):
+        return f"{self.person_type} {self.person_id} {self.year}-{self.month:02d}"
+
+
+class AttendanceCalendar(models.Model):
+    """
+    The year of one student, teacher or staff member as one character per day (see attendance.calendars).
+    """
+    school_id = models.CharField(max_length=255)
+    person_type = models.CharField(max_length=10, choices=PERSON_TYPE_CHOICES)
+    person_id = models.BigIntegerField()
+    year = models.PositiveSmallIntegerField()
+    days = models.CharField(max_length=366)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('person_type', 'person_id', 'year')
+
+    def __str__(self):
+        return f"{self.person_type} {self.person_id} {self.year}"
+
+
+class AbsenceFlag(models.Model):
+    """
+    A student whose recent absences crossed one of the chronic-absence thresholds, as of the last scan by
+    `detect_chronic_absence`. The row is removed once the student no longer crosses any of them.
+    """
+    school_id = models.CharField(max_length=255)
+    student = models.OneToOneField(StudentUser, on_delete=models.CASCADE, related_name='absence_flag')
+    as_of = models.DateField()
+    absent_7 = models.PositiveSmallIntegerField(default=0)
+    marked_7 = models.PositiveSmallIntegerField(default=0)
+    absent_30 = models.PositiveSmallIntegerField(default=0)
+    marked_30 = models.PositiveSmallIntegerField(default=0)
+    streak = models.PositiveSmallIntegerField(default=0)
+    reasons = models.JSONField(default=list)
+    flagged_since = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['school_id', '-streak'])]
+
+    def __str__(self):
+        return f"{self.student_id} {', '.join(self.reasons)}"
+
+
+class AbsenceScan(models.Model):
+    """
+    The last attendance day `detect_chronic_absence` scanned for a school and when that scan started, where its
+    next run picks up.
+    """
+    school_id = models.CharField(max_length=255, unique=True)
+    last_date = models.DateField()
+    started_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.school_id} {self.last_date}"
+
+
+
+class AttendanceSyncOperation(models.Model):
+    """
+    One attendance operation synced by the mobile app and its outcome, so that a replayed operation is answered
+    from here instead of being applied again. Rows older than ATTENDANCE_SYNC_RETENTION_DAYS are removed by
+    `prune_attendance_sync`.
+    """
+    school_id = models.CharField(max_length=255)
+    op_id = models.UUIDField()
+    device_id = models.CharField(max_length=255, blank=True)
+    student_id = models.BigIntegerField()
+    date = models.DateField()
+    mark_attendence = models.CharField(max_length=1)
+    recorded_at = models.DateTimeField()
+    status = models.CharField(max_length=20)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('school_id', 'op_id')
+        indexes = [models.Index(fields=['created_at'])]
+
+    def __str__(self):
+        return f"{self.op_id} {self.status}"
+
+
+class WorkingDayCalendar(models.Model):
+    """
+    The working days of one school and year as one character per day (see attendance.workdays).
+    """
+    school_id = models.CharField(max_length=255)
+    year = models.PositiveSmallIntegerField()
+    days = models.CharField(max_length=366)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('school_id', 'year')
+
+    def __str__(self):
+        return f"{self.school_id} {self.year}"
@@ -0,0 +1,87 @@
+"""
+Attendance filter and report queries.
+
+Attendance of one school is filtered on its denormalized school_id, a date range, a mark and, for students, a
+class-section. The report groups it by day, person or class-section and counts the marks of each group in SQL;
+the row listing annotates the person's display name instead of loading the person of every row.
+"""
+from django.db.models import CharField, Count, F, Q, Value
+from django.db.models.functions import Concat
+
+from attendance.kinds import STUDENT
+
+GROUP_BY = ('day', 'person', 'class')
+
+# Fields making up the display name of a person, per person type.
+NAME_FIELDS = {
+    'student': ('name',),
+    'teacher': ('full_name',),
+    'staff': ('first_name', 'last_name'),
+}
+
+
+def display_name(kind):
+    """
+    Expression of the display name of the person of an attendance row.
+    """
+    fields = [F(f'{kind.person_field}__{field}') for field in NAME_FIELDS[kind.person_field]]
+    if len(fields) == 1:
+        return fields[0]
+    parts = [fields[0]]
+    for field in fields[1:]:
+        parts += [Value(' '), field]
+    return Concat(*parts, output_field=CharField())
+
+
+def mark_counts():
+    return {
+        'present': Count('id', filter=Q(mark_attendence='P')),
+        'absent': Count('id', filter=Q(mark_attendence='A')),
+        'leave': Count('id', filter=Q(mark_attendence='L')),
+        'total': Count('id'),
+    }
+
+
+def filter_attendance(kind, school_id, start_date=None, end_date=None, mark=None, class_name=None, section=None):
+    """
+    Attendance of `school_id` narrowed by the filters that are given; class_name and section only apply to
+    students.
+    """
+    attendance = kind.model.objects.filter(school_id=school_id)
+    if start_date:
+        attendance = attendance.filter(date__gte=start_date)
+    if end_date:
+        attendance = attendance.filter(date__lte=end_date)
+    if mark:
+        attendance = attendance.filter(mark_attendence=mark)
+    if class_name:
+        attendance = attendance.filter(student__class_enrolled=class_name)
+    if section:
+        attendance = attendance.filter(student__section=section)
+    return attendance
+
+
+def group_attendance(kind, attendance, group_by):
+    """
+    One row of present, absent, leave and total counts per day, person or class-section of `attendance`.
+    """
+    if group_by == 'day':
+        groups = attendance.values('date')
+        ordering = ('date',)
+    elif group_by == 'person':
+        groups = attendance.values(person_id=F(f'{kind.person_field}_id'), name=display_name(kind))
+        ordering = ('name', 'person_id')
+    else:
+        groups = attendance.values(class_name=F('student__class_enrolled'), section=F('student__section'))
+        ordering = ('class_name', 'section')
+    return groups.annotate(**mark_counts()).order_by(*ordering)
+
+
+def attendance_rows(kind, attendance):
+    """
+    The rows of `attendance` with the person's id and display name, and the class-section of students.
+    """
+    columns = {'person_id': F(f'{kind.person_field}_id'), 'name': display_name(kind)}
+    if kind is STUDENT:
+        columns.update(class_name=F('student__class_enrolled'), section=F('student__section'))
+    return attendance.annotate(**columns)
@@ -0,0 +1,181 @@
+"""
+Monthly attendance rollups.
+
+AttendanceRollup keeps the present, absent and leave counts of every person per month so that totals and
+percentages are read from a handful of rows instead of counting the attendance tables. Every write path
+refreshes the months it touched: the bulk marking engine directly, single-row saves and deletes through the
+signals in attendance.signals. `rebuild_attendance_rollups` recomputes them from scratch. Percentages are
+shares of the school's working days (attendance.workdays) up to today.
+"""
+import calendar
+import datetime
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from attendance.models import AttendanceRollup
+from attendance.workdays import working_days_between
+
+MARK_FIELDS = {'P': 'present', 'A': 'absent', 'L': 'leave'}
+BATCH_SIZE = 5000
+
+
+def _month_counts(kind, queryset):
+    """
+    Present, absent and leave counts per person and month of an attendance queryset, with the school of the
+    rows as `person_school`.
+    """
+    return queryset.annotate(month_start=TruncMonth('date')).values(
+        f'{kind.person_field}_id', 'month_start', person_school=F('school_id')
+    ).annotate(
+        **{field: Count('id', filter=Q(mark_attendence=mark)) for mark, field in MARK_FIELDS.items()}
+    ).order_by()
+
+
+def _rollup(kind, row):
+    return AttendanceRollup(school_id=row['person_school'] or '', person_type=kind.person_field,
+                            person_id=row[f'{kind.person_field}_id'], year=row['month_start'].year,
+                            month=row['month_start'].month,
+                            **{field: row[field] for field in MARK_FIELDS.values()})
+
+
+def refresh_rollups(kind, keys):
+    """
+    Recompute the rollups of the given (person_id, year, month) keys from the attendance table, in a constant
+    number of queries whatever the number of keys.
+    """
+    if not keys:
+        return
+    person_ids = {person_id for person_id, _, _ in keys}
+    first = min(datetime.date(year, month, 1) for _, year, month in keys)
+    year, month = max((year, month) for _, year, month in keys)
+    last = datetime.date(year, month, calendar.monthrange(year, month)[1])
+
+    counts = {}
+    attendance = kind.model.objects.filter(**{f'{kind.person_field}_id__in': person_ids}, date__range=(first, last))
+    for row in _month_counts(kind, attendance):
+        key = (row[f'{kind.person_field}_id'], row['month_start'].year, row['month_start'].month)
+        if key in keys:
+            counts[key] = row
+
+    existing = AttendanceRollup.objects.filter(person_type=kind.person_field, person_id__in=person_ids,
+                                               year__range=(first.year, last.year))
+    rollups = {(rollup.person_id, rollup.year, rollup.month): rollup for rollup in existing}
+    changed, created, emptied = [], [], []
+    for key in keys:
+        row, rollup = counts.get(key), rollups.get(key)
+        if row is None:
+            if rollup is not None:
+                emptied.append(rollup.id)
+        elif rollup is None:
+            created.append(_rollup(kind, row))
+        elif any(getattr(rollup, field) != row[field] for field in MARK_FIELDS.values()):
+            for field in MARK_FIELDS.values():
+                setattr(rollup, field, row[field])
+            rollup.updated_at = timezone.now()
+            changed.append(rollup)
+
+    if changed:
+        AttendanceRollup.objects.bulk_update(changed, list(MARK_FIELDS.values()) + ['updated_at'])
+    if created:
+        AttendanceRollup.objects.bulk_create(created)
+    if emptied:
+        AttendanceRollup.objects.filter(id__in=emptied).delete()
+
+
+def rebuild_rollups(kinds, school_id=None):
+    """
+    Replace the rollups of `kinds` (of one school when given) with freshly computed ones. Returns the number
+    of rollups written.
+    """
+    written = 0
+    for kind in kinds:
+        attendance = kind.model.objects.all()
+        rollups = AttendanceRollup.objects.filter(person_type=kind.person_field)
+        if school_id:
+            attendance = attendance.filter(school_id=school_id)
+            rollups = rollups.filter(school_id=school_id)
+        with transaction.atomic():
+            rollups.delete()
+            batch = []
+            for row in _month_counts(kind, attendance).iterator():
+                batch.append(_rollup(kind, row))
+                if len(batch) == BATCH_SIZE:
+                    written += len(AttendanceRollup.objects.bulk_create(batch))
+                    batch = []
+            written += len(AttendanceRollup.objects.bulk_create(batch))
+    return written
+
+
+def _totals(present=0, absent=0, leave=0, working_days=0):
+    return {
+        'present': present,
+        'absent': absent,
+        'leave': leave,
+        'marked': present + absent + leave,
+        'working_days': working_days,
+        'percentage': round(min(present, working_days) / working_days * 100) if working_days else 0,
+    }
+
+
+def _elapsed_working_days(school_id, year):
+    """
+    Working days of `school_id` in each month of `year` up to today, as a list of 12 counts.
+    """
+    today = datetime.date.today()
+    counts = []
+    for month in range(1, 13):
+        first = datetime.date(year, month, 1)
+        last = min(datetime.date(year, month, calendar.monthrange(year, month)[1]), today)
+        counts.append(working_days_between(school_id, first, last) if first <= last else 0)
+    return counts
+
+
+def empty_summary(year):
+    return {'year': year, **_totals(), 'months': [{'month': month, **_totals()} for month in range(1, 13)]}
+
+
+def attendance_summary(kind, person_ids, year):
+    """
+    Yearly and monthly totals of `person_ids` (ids or an id subquery) for `year`, read with one query and
+    keyed by person id, with the working days of their school up to today. People without any attendance that
+    year are left out.
+    """
+    summaries = {}
+    rollups = AttendanceRollup.objects.filter(person_type=kind.person_field, person_id__in=person_ids, year=year)
+    for rollup in rollups.values('person_id', 'school_id', 'month', *MARK_FIELDS.values()):
+        summary = summaries.setdefault(rollup['person_id'], {'school_id': rollup['school_id'], 'months': {}})
+        summary['months'][rollup['month']] = {field: rollup[field] for field in MARK_FIELDS.values()}
+
+    working_days = {}
+    for person_id, summary in summaries.items():
+        months = summary['months']
+        if summary['school_id'] not in working_days:
+            working_days[summary['school_id']] = _elapsed_working_days(summary['school_id'], year)
+        monthly_working_days = working_days[summary['school_id']]
+        yearly = {field: sum(month[field] for month in months.values()) for field in MARK_FIELDS.values()}
+        summaries[person_id] = {
+            'year': year,
+            **_totals(**yearly, working_days=sum(monthly_working_days)),
+            'months': [{'month': month, **_totals(**months.get(month, {}),
+                                                  working_days=monthly_working_days[month - 1])}
+                       for month in range(1, 13)],
+        }
+    return summaries
+
+
+def current_attendance_summary(kind, person_id):
+    """
+    This year's totals of one person, see attendance_summary.
+    """
+    year = datetime.date.today().year
+    return attendance_summary(kind, [person_id], year).get(person_id) or empty_summary(year)
+
+
+def current_month_totals(summary):
+    """
+    The totals of the current month out of a summary of the current year.
+    """
+    return summary['months'][datetime.date.today().month - 1]
@@ -0,0 +1,49 @@
+from rest_framework import serializers
+
+from attendance.models import AbsenceFlag
+from constants import ATTENDENCE_CHOICE
+
+
+class AttendanceEntrySerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    date = serializers.DateField(input_formats=['%Y-%m-%d'],
+                                 error_messages={'invalid': 'Date must be in YYYY-MM-DD format'})
+    mark_attendence = serializers.ChoiceField(choices=ATTENDENCE_CHOICE)
+
+
+class SyncOperationSerializer(AttendanceEntrySerializer):
+    op_id = serializers.UUIDField()
+    recorded_at = serializers.DateTimeField()
+
+
+class AttendanceRowSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    person_id = serializers.IntegerField()
+    name = serializers.CharField()
+    date = serializers.DateField()
+    mark_attendence = serializers.CharField()
+
+
+class StudentAttendanceRowSerializer(AttendanceRowSerializer):
+    class_name = serializers.CharField()
+    section = serializers.CharField()
+
+
+class AbsenceFlagSerializer(serializers.ModelSerializer):
+    name = serializers.CharField(source='student.name')
+    roll_no = serializers.CharField(source='student.roll_no')
+    class_name = serializers.CharField(source='student.class_enrolled')
+    section = serializers.CharField(source='student.section')
+    rate_7 = serializers.SerializerMethodField()
+    rate_30 = serializers.SerializerMethodField()
+
+    class Meta:
+        model = AbsenceFlag
+        fields = ['student', 'name', 'roll_no', 'class_name', 'section', 'as_of', 'reasons', 'streak', 'absent_7',
+                  'marked_7', 'rate_7', 'absent_30', 'marked_30', 'rate_30', 'flagged_since']
+
+    def get_rate_7(self, obj):
+        return round(obj.absent_7 / obj.marked_7 * 100) if obj.marked_7 else 0
+
+    def get_rate_30(self, obj):
+        return round(obj.absent_30 / obj.marked_30 * 100) if obj.marked_30 else 0
@@ -0,0 +1,87 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from attendance.calendars import update_calendars
+from attendance.kinds import KINDS, STUDENT
+from attendance.rollups import refresh_rollups
+from attendance.workdays import invalidate_working_days
+from authentication.models import EventsCalender, StaffAttendence, TeacherAttendence
+from student.models import StudentAttendence
+from student.overview import invalidate_class_overview
+
+ATTENDANCE_MODELS = {kind.model: kind for kind in KINDS.values()}
+
+
+def _as_date(kind, date):
+    if isinstance(date, str):
+        date = kind.model._meta.get_field('date').to_python(date)
+    return date
+
+
+def _rollup_key(kind, person_id, date):
+    date = _as_date(kind, date)
+    return person_id, date.year, date.month
+
+
+@receiver(pre_save, sender=StudentAttendence)
+@receiver(pre_save, sender=TeacherAttendence)
+@receiver(pre_save, sender=StaffAttendence)
+def fill_attendance_school(sender, instance, **kwargs):
+    # school_id is a copy of the person's school that the attendance lists filter on.
+    if not instance.school_id:
+        kind = ATTENDANCE_MODELS[sender]
+        instance.school_id = kind.person_model.objects.filter(
+            id=getattr(instance, f'{kind.person_field}_id')).values_list('user__school_id', flat=True).first()
+
+
+@receiver(pre_save, sender=StudentAttendence)
+@receiver(pre_save, sender=TeacherAttendence)
+@receiver(pre_save, sender=StaffAttendence)
+def stamp_attendance_mark(sender, instance, **kwargs):
+    # A single save is a server-side edit, newer than any offline mark synced before it.
+    instance.marked_at = timezone.now()
+
+
+@receiver(pre_save, sender=StudentAttendence)
+@receiver(pre_save, sender=TeacherAttendence)
+@receiver(pre_save, sender=StaffAttendence)
+def remember_attendance_month(sender, instance, **kwargs):
+    # An update can move a row to another person or month, whose rollup has to lose it.
+    if instance.pk is None:
+        return
+    kind = ATTENDANCE_MODELS[sender]
+    person_id_field = f'{kind.person_field}_id'
+    previous = sender.objects.filter(pk=instance.pk).values(person_id_field, 'date').first()
+    if previous is not None:
+        instance._previous_rollup_key = _rollup_key(kind, previous[person_id_field], previous['date'])
+        instance._previous_date = previous['date']
+
+
+@receiver(post_save, sender=StudentAttendence)
+@receiver(post_save, sender=TeacherAttendence)
+@receiver(post_save, sender=StaffAttendence)
+@receiver(post_delete, sender=StudentAttendence)
+@receiver(post_delete, sender=TeacherAttendence)
+@receiver(post_delete, sender=StaffAttendence)
+def refresh_attendance_rollup(sender, instance, signal, **kwargs):
+    kind = ATTENDANCE_MODELS[sender]
+    person_id = getattr(instance, f'{kind.person_field}_id')
+    date = _as_date(kind, instance.date)
+    keys = {(person_id, date.year, date.month)}
+    days = {(person_id, date): None if signal is post_delete else instance.mark_attendence}
+    previous = getattr(instance, '_previous_rollup_key', None)
+    if previous is not None:
+        keys.add(previous)
+        days.setdefault((previous[0], instance._previous_date), None)
+    refresh_rollups(kind, keys)
+    update_calendars(kind, instance.school_id, days)
+    if kind is STUDENT:
+        invalidate_class_overview(instance.school_id, date, getattr(instance, '_previous_date', date))
+
+
+@receiver(post_save, sender=EventsCalender)
+@receiver(post_delete, sender=EventsCalender)
+def refresh_working_days(sender, instance, **kwargs):
+    # An entry may also have just left the academic calendar, so any change of the school's entries counts.
+    invalidate_working_days(instance.school_id)
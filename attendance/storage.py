@@ -0,0 +1,74 @@
+"""
+Clean-up of the attendance tables ahead of their (person, date) unique constraint.
+
+Each function takes the attendance model and the name of its person field so that the migrations can pass
+their historical models and the `dedupe_attendance` command the real ones. They are idempotent and work in
+batches of primary keys, so they can run on a live table before the migration that adds the constraint.
+"""
+from django.db.models import Count, Max, OuterRef, Q, Subquery
+
+BATCH_SIZE = 10000
+DEDUPE_BATCH_SIZE = 500  # (person, date) pairs per DELETE, kept under the expression depth limit of SQLite
+
+# Spellings found in older rows, mapped to the one-letter marks of ATTENDENCE_CHOICE.
+MARK_ALIASES = {
+    'P': ('p', 'present'),
+    'A': ('a', 'absent'),
+    'L': ('l', 'leave', 'on_leave', 'on leave'),
+}
+
+
+def _id_batches(queryset, batch_size):
+    last = queryset.order_by().aggregate(last=Max('id'))['last'] or 0
+    for start in range(0, last + 1, batch_size):
+        yield queryset.filter(id__gte=start, id__lt=start + batch_size)
+
+
+def backfill_school_ids(model, person_field, batch_size=BATCH_SIZE):
+    """
+    Copy the school of each row's person onto rows that have none yet. Returns the number of rows updated.
+    """
+    person_model = model._meta.get_field(person_field).related_model
+    school = Subquery(person_model.objects.filter(pk=OuterRef(f'{person_field}_id')).values('user__school_id')[:1])
+    return sum(batch.update(school_id=school)
+               for batch in _id_batches(model.objects.filter(school_id__isnull=True), batch_size))
+
+
+def normalize_marks(model):
+    """
+    Rewrite the long spellings of the marks to their letter. Returns (rows updated, sorted unknown marks).
+    """
+    updated = 0
+    for mark, aliases in MARK_ALIASES.items():
+        matches = Q()
+        for alias in aliases:
+            matches |= Q(mark_attendence__iexact=alias)
+        updated += model.objects.filter(matches).exclude(mark_attendence=mark).update(mark_attendence=mark)
+    unknown = model.objects.exclude(mark_attendence__in=list(MARK_ALIASES)).values_list('mark_attendence', flat=True)
+    return updated, sorted(set(unknown))
+
+
+def find_duplicates(model, person_field):
+    """
+    (person id, date, id to keep) of every (person, date) recorded more than once. The latest row is kept, as
+    it holds the last mark that was sent for that day.
+    """
+    person_id_field = f'{person_field}_id'
+    groups = model.objects.values(person_id_field, 'date').annotate(rows=Count('id'), keep=Max('id')) \
+        .filter(rows__gt=1).order_by()
+    return [(group[person_id_field], group['date'], group['keep']) for group in groups]
+
+
+def dedupe(model, person_field, batch_size=DEDUPE_BATCH_SIZE):
+    """
+    Delete all but the latest row of every duplicated (person, date). Returns the number of rows deleted.
+    """
+    person_id_field = f'{person_field}_id'
+    duplicates = find_duplicates(model, person_field)
+    deleted = 0
+    for start in range(0, len(duplicates), batch_size):
+        matches = Q()
+        for person_id, date, keep in duplicates[start:start + batch_size]:
+            matches |= Q(**{person_id_field: person_id, 'date': date}) & ~Q(id=keep)
+        deleted += model.objects.filter(matches).delete()[0]
+    return deleted
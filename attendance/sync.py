@@ -0,0 +1,127 @@
+"""
+Offline attendance sync of the mobile app.
+
+The app queues the marks a teacher makes without a connection as operations, each with a client-generated
+op_id and the device time the mark was made (recorded_at), and sends them in batches until a batch is
+answered. Every operation gets one of these statuses:
+
+    applied     the mark was written
+    unchanged   the day already had that mark
+    stale       the day was marked after recorded_at (on another device or the web), and that mark stays
+    superseded  a later operation of the same batch marks the same student and day
+    rejected    the student is not in the school
+    invalid     the operation is malformed, `errors` says why; it is not recorded
+
+The outcome of every valid operation is kept in AttendanceSyncOperation, so a replayed operation is answered
+with its stored status and `replayed` instead of being applied again. A batch costs the same number of queries
+whatever its size: the known op ids, the students, the rows of those days, the write_marks upsert and the log.
+"""
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from attendance.kinds import STUDENT
+from attendance.marking import write_marks
+from attendance.models import AttendanceSyncOperation
+from attendance.serializers import SyncOperationSerializer
+from student.overview import invalidate_class_overview
+
+APPLIED = 'applied'
+UNCHANGED = 'unchanged'
+STALE = 'stale'
+SUPERSEDED = 'superseded'
+REJECTED = 'rejected'
+INVALID = 'invalid'
+
+
+def sync_operations(school_id, operations, device_id=''):
+    """
+    Apply `operations` ([{'op_id', 'id', 'date', 'mark_attendence', 'recorded_at'}, ...]) to the students of
+    `school_id`, the latest recorded_at winning for each student and day. Returns one {'op_id', 'status'} per
+    operation, in order.
+    """
+    now = timezone.now()
+    results = [None] * len(operations)
+    fresh, replays, first_index = {}, {}, {}
+    for index, operation in enumerate(operations):
+        serializer = SyncOperationSerializer(data=operation)
+        if not serializer.is_valid():
+            op_id = operation.get('op_id') if isinstance(operation, dict) else None
+            results[index] = {'op_id': op_id, 'status': INVALID, 'errors': serializer.errors}
+        elif serializer.validated_data['op_id'] in first_index:
+            replays[index] = first_index[serializer.validated_data['op_id']]
+        else:
+            fresh[index] = serializer.validated_data
+            first_index[fresh[index]['op_id']] = index
+
+    known = dict(AttendanceSyncOperation.objects.filter(school_id=school_id, op_id__in=first_index)
+                 .values_list('op_id', 'status'))
+    for index in [index for index, operation in fresh.items() if operation['op_id'] in known]:
+        results[index] = {'op_id': str(fresh[index]['op_id']), 'status': known[fresh[index]['op_id']],
+                          'replayed': True}
+        del fresh[index]
+
+    status = {}
+    student_ids = set(STUDENT.person_model.objects.filter(
+        id__in={operation['id'] for operation in fresh.values()}, user__school_id=school_id
+    ).values_list('id', flat=True)) if fresh else set()
+    winners = {}
+    for index, operation in fresh.items():
+        if operation['id'] not in student_ids:
+            status[index] = REJECTED
+            continue
+        # A device clock running ahead must not win every later mark of that day.
+        operation['recorded_at'] = min(operation['recorded_at'], now)
+        key = (operation['id'], operation['date'])
+        current = winners.get(key)
+        if current is not None and fresh[current]['recorded_at'] > operation['recorded_at']:
+            status[index] = SUPERSEDED
+            continue
+        if current is not None:
+            status[current] = SUPERSEDED
+        winners[key] = index
+
+    written = {}
+    with transaction.atomic():
+        if winners:
+            existing = STUDENT.model.objects.select_for_update().filter(
+                student_id__in={student_id for student_id, _ in winners}, date__in={date for _, date in winners}
+            ).values_list('student_id', 'date', 'mark_attendence', 'marked_at')
+            rows = {(student_id, date): (mark, marked_at) for student_id, date, mark, marked_at in existing}
+            for key, index in winners.items():
+                operation = fresh[index]
+                mark, marked_at = rows.get(key, (None, None))
+                if marked_at is not None and marked_at > operation['recorded_at']:
+                    status[index] = STALE
+                    continue
+                status[index] = UNCHANGED if mark == operation['mark_attendence'] else APPLIED
+                written[key] = (operation['mark_attendence'], operation['recorded_at'])
+            write_marks(STUDENT, school_id, written)
+        if fresh:
+            AttendanceSyncOperation.objects.bulk_create([
+                AttendanceSyncOperation(school_id=school_id, op_id=operation['op_id'], device_id=device_id,
+                                        student_id=operation['id'], date=operation['date'],
+                                        mark_attendence=operation['mark_attendence'],
+                                        recorded_at=operation['recorded_at'], status=status[index])
+                for index, operation in fresh.items()
+            ], ignore_conflicts=True)
+    invalidate_class_overview(school_id, *{date for _, date in written})
+
+    for index, operation in fresh.items():
+        results[index] = {'op_id': str(operation['op_id']), 'status': status[index]}
+    for index, first in replays.items():
+        results[index] = {'op_id': results[first]['op_id'], 'status': results[first]['status'], 'replayed': True}
+    return results
+
+
+def prune_operations(days=None):
+    """
+    Delete the synced operations older than `days` (ATTENDANCE_SYNC_RETENTION_DAYS by default). Returns the
+    number of rows deleted.
+    """
+    days = settings.ATTENDANCE_SYNC_RETENTION_DAYS if days is None else days
+    cutoff = timezone.now() - datetime.timedelta(days=days)
+    deleted, _ = AttendanceSyncOperation.objects.filter(created_at__lt=cutoff).delete()
+    return deleted
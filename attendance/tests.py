@@ -0,0 +1,563 @@
+import csv
+import datetime
+import json
+import uuid
+import zipfile
+from io import BytesIO, StringIO
+from xml.etree import ElementTree
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from attendance.absence import absence_metrics, scan_school
+from attendance.kinds import STUDENT
+from attendance.marking import mark_attendance
+from attendance.models import AbsenceFlag, AttendanceCalendar, AttendanceRollup, AttendanceSyncOperation
+from attendance.rollups import attendance_summary
+from attendance.workdays import working_days, working_days_between, working_days_in_month
+from authentication.models import EventsCalender, StudentUser, StaffAttendence, StaffUser, TeacherAttendence, \
+    TeacherUser
+from benchmarks.factories import SCHOOL_ID, create_admin, create_staff, create_students, create_teachers
+from management.payroll import salary_days
+from student.models import StudentAttendence
+
+DATE = datetime.date(2024, 6, 3)
+OTHER_SCHOOL_ID = 'SCHOOL2'
+MARKS = ('P', 'P', 'A', 'P', 'L')
+
+
+def create_attendance(kind_model, person_field, people, dates):
+    # Written in bulk, past the signals: the tests below read the attendance rows, not the rollups.
+    kind_model.objects.bulk_create([
+        kind_model(**{person_field: person}, school_id=person.user.school_id, date=date,
+                   mark_attendence=MARKS[(position + number) % len(MARKS)])
+        for position, person in enumerate(people) for number, date in enumerate(dates)
+    ])
+
+
+class BulkAttendanceMarkingTest(APITestCase):
+    student_path = '/student/mobile/attendance/create/'
+    staff_path = '/teacher/mobile/staff/attendance/'
+
+    def setUp(self):
+        cache.clear()
+        self.admin = create_admin()
+        self.teacher = create_teachers(1)[0].user
+        self.students = [student.id for student in create_students(60)]
+
+    def post(self, path, user, entries):
+        self.client.force_authenticate(user)
+        return self.client.post(path, {'data': json.dumps(entries)})
+
+    def register(self, students, mark='P'):
+        return [{'id': student_id, 'date': str(DATE), 'mark_attendence': mark} for student_id in students]
+
+    def test_register_saves_in_constant_queries(self):
+        self.post(self.student_path, self.teacher, self.register(self.students[:1]))  # warm the tenant caches
+        counts = []
+        for students in (self.students[1:11], self.students[11:]):
+            with CaptureQueriesContext(connection) as captured:
+                response = self.post(self.student_path, self.teacher, self.register(students))
+            self.assertEqual(response.status_code, 200, response.content)
+            counts.append(len(captured))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_correction_updates_the_existing_row(self):
+        self.post(self.student_path, self.teacher, self.register(self.students))
+        response = self.post(self.student_path, self.teacher, self.register(self.students[:3], mark='A'))
+
+        self.assertEqual([row['status'] for row in response.json()['data']], ['updated'] * 3)
+        records = StudentAttendence.objects.filter(date=DATE, student_id__in=self.students)
+        self.assertEqual(records.count(), len(self.students))
+        self.assertEqual(records.filter(mark_attendence='A').count(), 3)
+
+    def test_invalid_entry_rejects_the_whole_register(self):
+        other_student = create_students(1, school_id=OTHER_SCHOOL_ID)[0]
+        entries = self.register(self.students[:2]) + \
+            [{'id': other_student.id, 'date': str(DATE), 'mark_attendence': 'P'}]
+        response = self.post(self.student_path, self.teacher, entries)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['data'], [{}, {}, {'id': ['Not found.']}])
+        self.assertFalse(StudentAttendence.objects.filter(date=DATE).exists())
+
+        response = self.post(self.student_path, self.teacher, [{'id': self.students[0], 'date': '03-06-2024'}])
+        self.assertEqual(set(response.json()['data'][0]), {'date', 'mark_attendence'})
+
+    def test_staff_register(self):
+        staff = [member.id for member in create_staff(5)]
+        response = self.post(self.staff_path, self.admin, self.register(staff, mark='L'))
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(StaffAttendence.objects.filter(date=DATE, mark_attendence='L').count(), len(staff))
+
+
+class AttendanceRollupTest(APITestCase):
+    student_path = '/student/mobile/attendance/create/'
+    summary_path = '/attendance/summary/'
+
+    def setUp(self):
+        cache.clear()
+        students = create_students(8) + create_students(4, class_enrolled='8', start=8)
+        self.students = [student.id for student in students]
+        create_admin()
+        self.client.force_authenticate(create_teachers(1)[0].user)
+
+    def mark(self, students, mark='P', date=DATE):
+        entries = [{'id': student_id, 'date': str(date), 'mark_attendence': mark} for student_id in students]
+        response = self.client.post(self.student_path, {'data': json.dumps(entries)})
+        self.assertEqual(response.status_code, 200, response.content)
+
+    def rollups(self, student_id, month=DATE.month):
+        return AttendanceRollup.objects.filter(person_type='student', person_id=student_id, year=DATE.year,
+                                               month=month)
+
+    def rollup(self, student_id, month=DATE.month):
+        return self.rollups(student_id, month).get()
+
+    def test_marking_and_corrections_keep_the_rollups_in_step(self):
+        student = self.students[0]
+        self.mark([student])
+        self.mark([student], mark='A', date=DATE + datetime.timedelta(days=1))
+        self.mark([student], mark='L')  # a correction moves the day from present to leave
+
+        rollup = self.rollup(student)
+        self.assertEqual((rollup.present, rollup.absent, rollup.leave), (0, 1, 1))
+
+    def test_single_row_saves_and_deletes(self):
+        student = self.students[0]
+        record = StudentAttendence.objects.create(student_id=student, date=DATE, mark_attendence='P')
+        self.assertEqual(self.rollup(student).present, 1)
+
+        record.date = DATE.replace(month=DATE.month + 1)
+        record.save()
+        self.assertFalse(self.rollups(student).exists())
+        self.assertEqual(self.rollup(student, month=DATE.month + 1).present, 1)
+
+        record.delete()
+        self.assertFalse(self.rollups(student, month=DATE.month + 1).exists())
+
+    def test_class_summary_in_one_query(self):
+        student = StudentUser.objects.get(id=self.students[0])
+        classmates = self.students[:8]
+        self.mark(classmates)
+        self.mark(classmates[:1], mark='A', date=DATE + datetime.timedelta(days=1))
+
+        working_days(SCHOOL_ID, DATE.year)  # the working-day calendar is cached
+        with self.assertNumQueries(1):
+            summaries = attendance_summary(STUDENT, StudentUser.objects.filter(id__in=classmates).values('id'),
+                                           DATE.year)
+        self.assertEqual(set(summaries), set(classmates))
+        june = summaries[classmates[0]]['months'][DATE.month - 1]
+        self.assertEqual((june['working_days'], june['percentage']), (25, 4))  # 1 of the 25 days but Sundays
+        self.assertEqual(summaries[classmates[0]]['months'][DATE.month - 1]['marked'], 2)
+
+        response = self.client.get(self.summary_path, {'class_name': student.class_enrolled, 'year': DATE.year})
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual([row['id'] for row in response.json()['data']], sorted(classmates))
+        self.assertEqual(self.client.get(self.summary_path, {'type': 'parent'}).status_code, 400)
+
+    def test_rebuild_command(self):
+        self.mark(self.students)
+        rollups = AttendanceRollup.objects.filter(person_type='student').order_by('person_id', 'year', 'month')
+        fields = ('person_id', 'year', 'month', 'present', 'absent', 'leave')
+        expected = list(rollups.values_list(*fields))
+        rollups.delete()
+
+        call_command('rebuild_attendance_rollups', school_id=SCHOOL_ID, stdout=StringIO())
+        self.assertEqual(list(rollups.values_list(*fields)), expected)
+
+        # Queryset updates bypass the signals, the rebuild picks them up.
+        StudentAttendence.objects.filter(student_id=self.students[0], date=DATE).update(mark_attendence='A')
+        call_command('rebuild_attendance_rollups', type=['student'], stdout=StringIO())
+        self.assertEqual(self.rollup(self.students[0]).absent, 1)
+
+
+class AttendanceStorageTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.student = create_students(1)[0]
+
+    def test_one_row_per_person_and_day(self):
+        StudentAttendence.objects.create(student=self.student, date=DATE, mark_attendence='P')
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            StudentAttendence.objects.create(student=self.student, date=DATE, mark_attendence='A')
+
+    def test_rows_carry_the_school_of_their_person(self):
+        record = StudentAttendence.objects.create(student=self.student, date=DATE, mark_attendence='P')
+        self.assertEqual(record.school_id, SCHOOL_ID)
+
+        results, errors = mark_attendance(STUDENT, SCHOOL_ID,
+                                          [{'id': self.student.id, 'date': str(DATE), 'mark_attendence': 'X'}])
+        self.assertIsNone(results)
+        self.assertIn('mark_attendence', errors[0])
+
+    def test_dedupe_command_backfills_and_normalizes(self):
+        create_attendance(StudentAttendence, 'student', [self.student] + create_students(1, start=1),
+                          [DATE, DATE + datetime.timedelta(days=1)])
+        records = StudentAttendence.objects.filter(student__user__school_id=SCHOOL_ID)
+        records.update(school_id=None, mark_attendence='present')
+
+        out = StringIO()
+        call_command('dedupe_attendance', type=['student'], stdout=out)
+        self.assertEqual(set(records.values_list('school_id', 'mark_attendence')), {(SCHOOL_ID, 'P')})
+        self.assertEqual(self.student_rollup().present, records.filter(student=self.student).count())
+
+        call_command('dedupe_attendance', dry_run=True, stdout=out)
+        self.assertIn('student: 0 duplicated days.', out.getvalue())
+
+    def student_rollup(self):
+        record = StudentAttendence.objects.filter(student=self.student).latest('date')
+        return AttendanceRollup.objects.get(person_type='student', person_id=self.student.id,
+                                            year=record.date.year, month=record.date.month)
+
+
+class AttendanceRegisterExportTest(APITestCase):
+    path = '/attendance/register/export/'
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(create_admin())
+        students = create_students(3) + create_students(1, section='B', start=3) + \
+            create_students(1, class_enrolled='8', start=4)
+        dates = [DATE + datetime.timedelta(days=offset) for offset in range(-5, 10)]  # from May into June
+        create_attendance(StudentAttendence, 'student', students, dates)
+        self.day = dates[-1]
+        self.student = students[1]
+
+    def export(self, **params):
+        response = self.client.get(self.path, {'year': self.day.year, **params})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content)
+
+    def test_class_month_csv(self):
+        response, content = self.export(class_name=self.student.class_enrolled, section=self.student.section,
+                                        month=self.day.month)
+        rows = list(csv.reader(StringIO(content.decode())))
+        self.assertEqual(rows[0][-4:], ['31', 'P', 'A', 'L'])
+        classmates = StudentUser.objects.filter(class_enrolled=self.student.class_enrolled,
+                                                section=self.student.section)
+        self.assertEqual([int(row[0]) for row in rows[1:]], sorted(classmates.values_list('id', flat=True)))
+
+        row = next(row for row in rows[1:] if int(row[0]) == self.student.id)
+        attendance = StudentAttendence.objects.filter(student=self.student, date__year=self.day.year,
+                                                      date__month=self.day.month)
+        self.assertEqual(row[5 + self.day.day], attendance.get(date=self.day).mark_attendence)
+        self.assertEqual([int(total) for total in row[-3:]],
+                         [attendance.filter(mark_attendence=mark).count() for mark in ('P', 'A', 'L')])
+        self.assertIn(f'-{self.day.year}-{self.day.month:02d}.csv', response['Content-Disposition'])
+
+    def test_staff_year_xlsx(self):
+        create_staff(2)
+        create_staff(1, school_id=OTHER_SCHOOL_ID)
+        _, content = self.export(type='staff', file_type='xlsx')
+        with zipfile.ZipFile(BytesIO(content)) as workbook:
+            sheet = ElementTree.fromstring(workbook.read('xl/worksheets/sheet1.xml'))
+        rows = sheet.findall('.//{http://schemas.openxmlformats.org/spreadsheetml/2006/main}row')
+        self.assertEqual(len(rows), 1 + 2 * 12)
+
+    def test_invalid_parameters(self):
+        for params in ({'file_type': 'pdf'}, {'month': 13}, {'type': 'parent'}):
+            self.assertEqual(self.client.get(self.path, params).status_code, 400)
+
+
+class ChronicAbsenceTest(APITestCase):
+    path = '/attendance/absence/flags/'
+
+    def setUp(self):
+        cache.clear()
+        self.absentee, self.regular = create_students(2)
+        rows = []
+        for days_ago in range(21):
+            date = DATE - datetime.timedelta(days=days_ago)
+            rows.append(StudentAttendence(student=self.absentee, school_id=SCHOOL_ID, date=date,
+                                          mark_attendence='A' if days_ago < 4 else 'P'))
+            rows.append(StudentAttendence(student=self.regular, school_id=SCHOOL_ID, date=date,
+                                          mark_attendence='P'))
+        StudentAttendence.objects.bulk_create(rows)
+
+    def scan(self, as_of, full=False):
+        return scan_school(SCHOOL_ID, as_of=as_of, full=full)
+
+    def test_absence_metrics(self):
+        # Marked the last ten days, absent the last three of them and five days ago.
+        metrics = absence_metrics(absent=0b100111, marked=(1 << 10) - 1)
+        self.assertEqual((metrics['absent_7'], metrics['marked_7'], metrics['streak']), (4, 7, 3))
+        self.assertEqual(metrics['reasons'], ['streak', 'rate_7', 'rate_30'])
+
+    def test_incremental_scans(self):
+        self.assertEqual(self.scan(DATE)['scanned'], 2)
+        flag = AbsenceFlag.objects.get()
+        self.assertEqual((flag.student_id, flag.streak, flag.reasons), (self.absentee.id, 4, ['streak', 'rate_7']))
+
+        tomorrow = DATE + datetime.timedelta(days=1)
+        StudentAttendence.objects.create(student=self.absentee, date=tomorrow, mark_attendence='P')
+        self.assertEqual(self.scan(tomorrow)['scanned'], 1)
+        flag.refresh_from_db()
+        self.assertEqual((flag.streak, flag.reasons, flag.flagged_since), (0, ['rate_7'], DATE))
+
+        StudentAttendence.objects.filter(student=self.absentee).update(mark_attendence='P')
+        self.assertEqual(self.scan(tomorrow, full=True)['cleared'], 1)
+        self.assertFalse(AbsenceFlag.objects.exists())
+
+    def test_incremental_scan_reads_corrections(self):
+        self.scan(DATE)
+        for row in StudentAttendence.objects.filter(student=self.regular, date__gt=DATE - datetime.timedelta(days=4)):
+            row.mark_attendence = 'A'
+            row.save()
+        self.assertEqual(self.scan(DATE)['flagged'], 1)
+        self.assertEqual(AbsenceFlag.objects.get(student=self.regular).streak, 4)
+
+    def test_flag_list(self):
+        call_command('detect_chronic_absence', school_id=SCHOOL_ID, as_of=DATE, stdout=StringIO())
+        self.client.force_authenticate(create_admin())
+        response = self.client.get(self.path)
+        self.assertEqual([row['student'] for row in response.json()['data']], [self.absentee.id])
+        self.assertEqual(response.json()['data'][0]['rate_7'], 57)
+
+        teacher = create_teachers(1)[0]
+        teacher.class_subject_section_details = [{'class': self.absentee.class_enrolled, 'section': 'Z'}]
+        teacher.save()
+        self.client.force_authenticate(teacher.user)
+        self.assertEqual(self.client.get(self.path).json()['data'], [])
+
+
+class AttendanceCalendarTest(APITestCase):
+    student_path = '/student/mobile/attendance/create/'
+    path = '/attendance/calendar/'
+
+    def setUp(self):
+        cache.clear()
+        self.student, self.classmate = create_students(2)
+        create_admin()
+        self.client.force_authenticate(create_teachers(1)[0].user)
+
+    def mark(self, mark, date=DATE):
+        entries = [{'id': self.student.id, 'date': str(date), 'mark_attendence': mark}]
+        self.client.post(self.student_path, {'data': json.dumps(entries)})
+
+    def days(self):
+        return AttendanceCalendar.objects.get(person_type='student', person_id=self.student.id, year=DATE.year).days
+
+    def test_writes_update_the_calendar(self):
+        day = DATE.timetuple().tm_yday - 1
+        self.mark('P')
+        self.mark('L', date=DATE + datetime.timedelta(days=1))
+        self.assertEqual(self.days()[day:day + 3], 'PL-')
+        self.assertEqual(len(self.days()), 366)
+
+        self.mark('A')
+        StudentAttendence.objects.get(student=self.student, date=DATE + datetime.timedelta(days=1)).delete()
+        self.assertEqual(self.days()[day:day + 3], 'A--')
+
+        expected = self.days()
+        call_command('rebuild_attendance_rollups', school_id=SCHOOL_ID, stdout=StringIO())
+        self.assertEqual(self.days(), expected)
+
+    def test_etag(self):
+        self.mark('P')
+        params = {'id': self.student.id, 'year': DATE.year}
+        response = self.client.get(self.path, params)
+        self.assertEqual(response.json()['data']['days'], self.days())
+
+        self.assertEqual(self.client.get(self.path, params, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        self.mark('A')
+        changed = self.client.get(self.path, params, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], response['ETag'])
+
+    def test_students_only_see_their_own_calendar(self):
+        self.client.force_authenticate(self.student.user)
+        response = self.client.get(self.path, {'id': self.classmate.id, 'year': DATE.year})
+        self.assertEqual(response.json()['data']['id'], self.student.id)
+
+
+class AttendanceSyncTest(APITestCase):
+    path = '/attendance/sync/'
+    student_path = '/student/mobile/attendance/create/'
+
+    def setUp(self):
+        cache.clear()
+        self.students = [student.id for student in create_students(40)]
+        create_admin()
+        self.client.force_authenticate(create_teachers(1)[0].user)
+
+    def operation(self, student_id, mark='P', minute=0, op_id=None):
+        return {'op_id': op_id or str(uuid.uuid4()), 'id': student_id, 'date': str(DATE), 'mark_attendence': mark,
+                'recorded_at': f'{DATE}T09:{minute:02d}:00+05:30'}
+
+    def sync(self, operations):
+        response = self.client.post(self.path, {'device_id': 'tablet-1', 'operations': operations}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()['data']
+
+    def mark(self, student_id):
+        return StudentAttendence.objects.get(student_id=student_id, date=DATE).mark_attendence
+
+    def test_replays_are_not_applied_again(self):
+        operations = [self.operation(student_id) for student_id in self.students[:3]]
+        self.assertEqual([row['status'] for row in self.sync(operations)], ['applied'] * 3)
+
+        StudentAttendence.objects.filter(student_id=self.students[0], date=DATE).update(mark_attendence='A')
+        replayed = self.sync(operations + [operations[1]])
+        self.assertEqual([row['status'] for row in replayed], ['applied'] * 4)
+        self.assertTrue(all(row['replayed'] for row in replayed))
+        self.assertEqual(self.mark(self.students[0]), 'A')
+        self.assertEqual(AttendanceSyncOperation.objects.count(), 3)
+
+    def test_last_writer_wins(self):
+        student_id = self.students[0]
+        results = self.sync([self.operation(student_id, 'A', minute=5), self.operation(student_id, 'L', minute=1)])
+        self.assertEqual([row['status'] for row in results], ['applied', 'superseded'])
+        self.assertEqual(self.mark(student_id), 'A')
+
+        self.assertEqual(self.sync([self.operation(student_id, 'P', minute=3)])[0]['status'], 'stale')
+        self.assertEqual(self.sync([self.operation(student_id, 'A', minute=9)])[0]['status'], 'unchanged')
+        self.assertEqual(self.sync([self.operation(student_id, 'P', minute=10)])[0]['status'], 'applied')
+        self.assertEqual(self.mark(student_id), 'P')
+
+        # A mark made on the web after the device's mark is kept.
+        entries = [{'id': student_id, 'date': str(DATE), 'mark_attendence': 'L'}]
+        self.client.post(self.student_path, {'data': json.dumps(entries)})
+        self.assertEqual(self.sync([self.operation(student_id, 'A', minute=30)])[0]['status'], 'stale')
+        self.assertEqual(self.mark(student_id), 'L')
+        self.assertEqual(AttendanceRollup.objects.get(person_type='student', person_id=student_id,
+                                                      year=DATE.year, month=DATE.month).leave, 1)
+
+    def test_partial_success(self):
+        other_student = create_students(1, school_id=OTHER_SCHOOL_ID)[0]
+        results = self.sync([self.operation(self.students[0]), self.operation(other_student.id),
+                             {'op_id': 'not-a-uuid', 'id': self.students[1], 'date': str(DATE)}])
+
+        self.assertEqual([row['status'] for row in results], ['applied', 'rejected', 'invalid'])
+        self.assertEqual(results[2]['op_id'], 'not-a-uuid')
+        self.assertEqual(set(results[2]['errors']), {'op_id', 'mark_attendence', 'recorded_at'})
+        self.assertEqual(StudentAttendence.objects.filter(date=DATE).count(), 1)
+
+        response = self.client.post(self.path, {'operations': 'nope'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_sync_costs_constant_queries(self):
+        self.sync([self.operation(self.students[0])])  # warm the tenant caches
+        counts = []
+        for students in (self.students[1:6], self.students[6:]):
+            with CaptureQueriesContext(connection) as captured:
+                self.sync([self.operation(student_id) for student_id in students])
+            counts.append(len(captured))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_prune(self):
+        self.sync([self.operation(self.students[0])])
+        AttendanceSyncOperation.objects.update(created_at=timezone.now() - datetime.timedelta(days=31))
+        call_command('prune_attendance_sync', stdout=StringIO())
+        self.assertFalse(AttendanceSyncOperation.objects.exists())
+
+
+class WorkingDayCalendarTest(APITestCase):
+    path = '/attendance/working-days/'
+
+    def setUp(self):
+        cache.clear()
+        self.school_id = SCHOOL_ID
+
+    def holiday(self, start, end=None, is_event_calendar=False):
+        return EventsCalender.objects.create(school_id=self.school_id, is_event_calendar=is_event_calendar,
+                                             title='Holiday', description='', start_date=start, end_date=end)
+
+    def test_weekends_and_academic_calendar_closures(self):
+        self.assertEqual(working_days_in_month(self.school_id, 2024, 6), 25)
+
+        self.holiday(datetime.date(2024, 5, 20), datetime.date(2024, 6, 8))  # summer break into June
+        self.holiday(datetime.date(2024, 6, 17))
+        self.holiday(datetime.date(2024, 6, 18), is_event_calendar=True)  # an event is a working day
+        self.assertEqual(working_days_in_month(self.school_id, 2024, 6), 25 - 7 - 1)
+        self.assertEqual(working_days_between(self.school_id, datetime.date(2024, 12, 30), datetime.date(2025, 1, 1)),
+                         3)
+
+        with self.assertNumQueries(0):
+            working_days_in_month(self.school_id, 2024, 7)
+
+    def test_endpoint(self):
+        self.client.force_authenticate(create_admin())
+        response = self.client.get(self.path, {'year': 2024, 'month': 6})
+        self.assertEqual(response.json()['data']['working_days'], 25)
+        response = self.client.get(self.path, {'start_date': '2024-06-01', 'end_date': '2024-06-09'})
+        self.assertEqual(response.json()['data']['working_days'], 7)
+        self.assertEqual(self.client.get(self.path, {'month': 13}).status_code, 400)
+
+    def test_salary_days_default_to_the_calendar(self):
+        teacher = create_teachers(1)[0]
+        TeacherAttendence.objects.create(teacher=teacher, date=datetime.date(2024, 6, 4), mark_attendence='L')
+        self.assertEqual(salary_days(self.school_id, teacher.user, 6, year=2024),
+                         {'master_days': 30, 'total_working_days': 25, 'leave_days': 1})
+
+
+class AttendanceReportTest(APITestCase):
+    path = '/attendance/report/'
+
+    def setUp(self):
+        dates = [DATE + datetime.timedelta(days=offset) for offset in range(5)]
+        create_attendance(StudentAttendence, 'student',
+                          create_students(4) + create_students(2, section='B', start=4), dates)
+        create_attendance(TeacherAttendence, 'teacher', create_teachers(4), dates)
+        create_attendance(StaffAttendence, 'staff', create_staff(3), dates)
+        create_attendance(StudentAttendence, 'student', create_students(2, school_id=OTHER_SCHOOL_ID), dates)
+        self.client.force_authenticate(create_admin())
+        self.attendance = StudentAttendence.objects.filter(school_id=SCHOOL_ID)
+
+    def get(self, **params):
+        response = self.client.get(self.path, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_group_by_day(self):
+        days = sorted(set(self.attendance.values_list('date', flat=True)))
+        response = self.get(group_by='day', start_date=str(days[1]), end_date=str(days[3]))
+
+        self.assertEqual([row['date'] for row in response['data']], [str(day) for day in days[1:4]])
+        for row in response['data']:
+            marks = list(self.attendance.filter(date=row['date']).values_list('mark_attendence', flat=True))
+            self.assertEqual((row['present'], row['absent'], row['leave'], row['total']),
+                             (marks.count('P'), marks.count('A'), marks.count('L'), len(marks)))
+        self.assertEqual(response['totals']['total'], sum(row['total'] for row in response['data']))
+
+    def test_group_by_class_and_person(self):
+        student = StudentUser.objects.filter(user__school_id=SCHOOL_ID).first()
+        response = self.get(group_by='class', mark_attendence='A')
+        row = next(row for row in response['data']
+                   if (row['class_name'], row['section']) == (student.class_enrolled, student.section))
+        self.assertEqual(row['absent'], self.attendance.filter(
+            student__class_enrolled=student.class_enrolled, student__section=student.section,
+            mark_attendence='A').count())
+        self.assertEqual(row['present'], 0)
+
+        response = self.get(group_by='person', type='staff')
+        staff = StaffUser.objects.filter(user__school_id=SCHOOL_ID)
+        self.assertEqual({row['name'] for row in response['data']},
+                         {f'{member.first_name} {member.last_name}' for member in staff})
+        self.assertTrue(all(row['total'] == 5 for row in response['data']))
+
+    def test_rows_in_constant_queries(self):
+        counts = []
+        for page_size in (5, 50):
+            with CaptureQueriesContext(connection) as captured:
+                response = self.get(type='teacher', page_size=page_size)
+            self.assertEqual(len(response['data']), min(page_size, 20))
+            counts.append(len(captured))
+        self.assertEqual(counts[0], counts[1])
+        row = response['data'][0]
+        self.assertEqual(row['name'], TeacherUser.objects.get(id=row['person_id']).full_name)
+
+        row = self.get(class_name=StudentUser.objects.first().class_enrolled)['data'][0]
+        self.assertEqual(set(row), {'id', 'person_id', 'name', 'date', 'mark_attendence', 'class_name', 'section'})
+
+    def test_invalid_filters(self):
+        for params in ({'group_by': 'week'}, {'type': 'teacher', 'group_by': 'class'}, {'mark_attendence': 'X'},
+                       {'type': 'parent'}, {'start_date': '03-06-2024'}):
+            self.assertEqual(self.client.get(self.path, params).status_code, 400, params)
@@ -0,0 +1,13 @@
+from django.urls import path
+from .views import AttendanceSummaryView, AttendanceRegisterExportView, AbsenceFlagListView, \
+    AttendanceCalendarView, AttendanceSyncView, WorkingDaysView, AttendanceReportView
+
+urlpatterns = [
+    path('summary/', AttendanceSummaryView.as_view(), name='attendance-summary'),
+    path('register/export/', AttendanceRegisterExportView.as_view(), name='attendance-register-export'),
+    path('absence/flags/', AbsenceFlagListView.as_view(), name='absence-flag-list'),
+    path('calendar/', AttendanceCalendarView.as_view(), name='attendance-calendar'),
+    path('sync/', AttendanceSyncView.as_view(), name='attendance-sync'),
+    path('working-days/', WorkingDaysView.as_view(), name='working-days'),
+    path('report/', AttendanceReportView.as_view(), name='attendance-report'),
+]
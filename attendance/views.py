@@ -0,0 +1,389 @@
+import datetime
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from EduSmart.db.replica import ReplicaReadMixin, replica_stream
+from attendance.calendars import UNMARKED, calendar_etag, year_length
+from attendance.exports import EXPORT_FORMATS, register_rows
+from attendance.kinds import KINDS, STUDENT
+from attendance.models import AbsenceFlag, AttendanceCalendar
+from attendance.rollups import attendance_summary
+from attendance.reports import GROUP_BY, attendance_rows, filter_attendance, group_attendance, mark_counts
+from attendance.serializers import AbsenceFlagSerializer, AttendanceRowSerializer, StudentAttendanceRowSerializer
+from attendance.sync import sync_operations
+from attendance.workdays import working_days_between, working_days_in_month
+from authentication.models import TeacherAssignment
+from authentication.permissions import IsAdminOrIsStaffAndInSameSchool, IsAdminOrTeacherUser, IsInSameSchool, \
+    IsTeacherUser, is_student_user, is_teacher_user
+from constants import AttendenceMarkedMessage, UserResponseMessage
+from pagination import CustomPagination
+from utils import create_response_data
+
+
+class AttendanceSummaryView(APIView):
+    """
+    This class is used to fetch the yearly and monthly attendance totals of one student, teacher or staff
+    member (`id`), or of every student of a class (`class_name`, optional `section`), from the rollups.
+    """
+    permission_classes = [IsInSameSchool]
+
+    def get(self, request):
+        try:
+            kind = KINDS.get(request.query_params.get('type', STUDENT.person_field))
+            if kind is None:
+                response_data = create_response_data(
+                    status=status.HTTP_400_BAD_REQUEST,
+                    message=AttendenceMarkedMessage.INVALID_PERSON_TYPE,
+                    data={}
+                )
+                return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+            year = int(request.query_params.get('year', datetime.date.today().year))
+            person_id = request.query_params.get('id')
+            class_name = request.query_params.get('class_name')
+            section = request.query_params.get('section')
+
+            people = kind.person_model.objects.filter(user__school_id=request.user.school_id)
+            if is_student_user(request.user):
+                people = people.filter(user=request.user)
+            if person_id:
+                people = people.filter(id=person_id)
+            elif class_name and kind is STUDENT:
+                people = people.filter(class_enrolled=class_name)
+                if section:
+                    people = people.filter(section=section)
+            else:
+                response_data = create_response_data(
+                    status=status.HTTP_400_BAD_REQUEST,
+                    message=AttendenceMarkedMessage.SUMMARY_TARGET_REQUIRED,
+                    data={}
+                )
+                return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+            summaries = attendance_summary(kind, people.values('id'), year)
+            response_data = create_response_data(
+                status=status.HTTP_200_OK,
+                message=AttendenceMarkedMessage.ATTENDANCE_SUMMARY_FETCHED_SUCCESSFULLY,
+                data=[{'id': person_id, 'type': kind.person_field, **summary}
+                      for person_id, summary in sorted(summaries.items())]
+            )
+            return Response(response_data, status=status.HTTP_200_OK)
+        except Exception as e:
+            response_data = create_response_data(
+                status=status.HTTP_400_BAD_REQUEST,
+                message=e.args[0],
+                data={}
+            )
+            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+
+class AttendanceRegisterExportView(ReplicaReadMixin, APIView):
+    """
+    This class is used to download the attendance register (a row per person and month, a column per day and
+    the P, A and L totals) of a class-section, of all teachers or of all staff as CSV or XLSX, for a `month`
+    or the whole `year`. The file is streamed while it is read from the database.
+    """
+    permission_classes = [IsAdminOrIsStaffAndInSameSchool]
+
+    def get(self, request):
+        try:
+            kind = KINDS.get(request.query_params.get('type', STUDENT.person_field))
+            file_type = request.query_params.get('file_type', 'csv')
+            year = int(request.query_params.get('year', datetime.date.today().year))
+            month = request.query_params.get('month')
+            month = int(month) if month else None
+            message = None
+            if kind is None:
+                message = AttendenceMarkedMessage.INVALID_PERSON_TYPE
+            elif file_type not in EXPORT_FORMATS:
+                message = AttendenceMarkedMessage.INVALID_EXPORT_FILE_TYPE
+            elif month is not None and not 1 <= month <= 12:
+                message = AttendenceMarkedMessage.INVALID_MONTH
+            if message:
+                response_data = create_response_data(
+                    status=status.HTTP_400_BAD_REQUEST,
+                    message=message,
+                    data={}
+                )
+                return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+            people = kind.person_model.objects.filter(user__school_id=request.user.school_id)
+            class_name = request.query_params.get('class_name')
+            section = request.query_params.get('section')
+            if kind is STUDENT and class_name:
+                people = people.filter(class_enrolled=class_name)
+                if section:
+                    people = people.filter(section=section)
+
+            stream, content_type = EXPORT_FORMATS[file_type]
+            response = StreamingHttpResponse(replica_stream(stream(register_rows(kind, people, year, month))),
+                                             content_type=content_type)
+            period = f'{year}-{month:02d}' if month else str(year)
+            classes = f'-{class_name}{section or ""}' if kind is STUDENT and class_name else ''
+            response['Content-Disposition'] = \
+                f'attachment; filename="attendance-{kind.person_field}{classes}-{period}.{file_type}"'
+            return response
+        except Exception as e:
+            response_data = create_response_data(
+                status=status.HTTP_400_BAD_REQUEST,
+                message=e.args[0],
+                data={}
+            )
+            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+
+class AbsenceFlagListView(ReplicaReadMixin, APIView):
+    """
+    This class is used to list the students flagged by the chronic-absence scan, longest streaks first. Admins
+    see the whole school (optionally one `class_name` and `section`), teachers the class they are class teacher
+    of.
+    """
+    permission_classes = [IsInSameSchool, IsAdminOrTeacherUser]
+    pagination_class = CustomPagination
+
+    def get(self, request):
+        try:
+            flags = AbsenceFlag.objects.filter(school_id=request.user.school_id).select_related('student') \
+                .order_by('-streak', '-id')
+            class_name = request.query_params.get('class_name')
+            section = request.query_params.get('section')
+            if is_teacher_user(request.user):
+                details = TeacherAssignment.objects.filter(teacher__user=request.user, is_class_teacher=True) \
+                    .values_list('class_name', 'section').first()
+                class_name, section = details or (None, None)
+                if class_name is None:
+                    flags = flags.none()
+            if class_name:
+                flags = flags.filter(student__class_enrolled=class_name)
+            if section:
+                flags = flags.filter(student__section=section)
+
+            paginator = self.pagination_class.for_request(request, ordering=('-streak', '-id'))
+            result_page = paginator.paginate_queryset(flags, request)
+            serializer = AbsenceFlagSerializer(result_page, many=True)
+            response = {
+                'status': status.HTTP_200_OK,
+                'message': AttendenceMarkedMessage.ABSENCE_FLAGS_FETCHED_SUCCESSFULLY,
+                'data': serializer.data,
+                'pagination': paginator.get_pagination_data(),
+            }
+            return Response(response, status=status.HTTP_200_OK)
+        except Exception as e:
+            response_data = create_response_data(
+                status=status.HTTP_400_BAD_REQUEST,
+                message=e.args[0],
+                data={}
+            )
+            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+
+class AttendanceCalendarView(APIView):
+    """
+    This class is used to fetch the attendance calendar of a year as one string with a character per day (P,
+    A, L, or - when the day is not marked), for a student, teacher or staff member (`id`, yourself by default).
+    Answers 304 when the If-None-Match header holds the ETag of the current calendar.
+    """
+    permission_classes = [IsInSameSchool]
+
+    def get(self, request):
+        try:
+            kind = KINDS.get(request.query_params.get('type', STUDENT.person_field))
+            if kind is None:
+                response_data = create_response_data(
+                    status=status.HTTP_400_BAD_REQUEST,
+                    message=AttendenceMarkedMessage.INVALID_PERSON_TYPE,
+                    data={}
+                )
+                return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+            year = int(request.query_params.get('year', datetime.date.today().year))
+
+            people = kind.person_model.objects.filter(user__school_id=request.user.school_id)
+            person_id = request.query_params.get('id')
+            if person_id and not is_student_user(request.user):
+                people = people.filter(id=person_id)
+            else:
+                people = people.filter(user=request.user)
+            person_id = people.values_list('id', flat=True).first()
+            if person_id is None:
+                response_data = create_response_data(
+                    status=status.HTTP_404_NOT_FOUND,
+                    message=UserResponseMessage.USER_DOES_NOT_EXISTS,
+                    data={}
+                )
+                return Response(response_data, status=status.HTTP_404_NOT_FOUND)
+
+            calendar = AttendanceCalendar.objects.filter(person_type=kind.person_field, person_id=person_id,
+                                                         year=year).first() or \
+                AttendanceCalendar(person_type=kind.person_field, person_id=person_id, year=year,
+                                   days=UNMARKED * year_length(year))
+            etag = calendar_etag(calendar)
+            headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+            if etag in request.headers.get('If-None-Match', ''):
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+            response_data = create_response_data(
+                status=status.HTTP_200_OK,
+                message=AttendenceMarkedMessage.ATTENDANCE_CALENDAR_FETCHED_SUCCESSFULLY,
+                data={'id': person_id, 'type': kind.person_field, 'year': year, 'days': calendar.days}
+            )
+            return Response(response_data, status=status.HTTP_200_OK, headers=headers)
+        except Exception as e:
+            response_data = create_response_data(
+                status=status.HTTP_400_BAD_REQUEST,
+                message=e.args[0],
+                data={}
+            )
+            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+
+class AttendanceSyncView(APIView):
+    """
+    This class is used to sync the student attendance marked offline in the mobile app. Takes a JSON body with
+    `operations` ({'op_id', 'id', 'date', 'mark_attendence', 'recorded_at'} each) and an optional `device_id`,
+    and answers one {'op_id', 'status'} per operation; a replayed op_id gets its first answer back.
+    """
+    permission_classes = [IsTeacherUser, IsInSameSchool]
+
+    def post(self, request):
+        try:
+            operations = request.data.get('operations')
+            if not isinstance(operations, list) or len(operations) > settings.ATTENDANCE_SYNC_MAX_OPERATIONS:
+                response_data = create_response_data(
+                    status=status.HTTP_400_BAD_REQUEST,
+                    message=AttendenceMarkedMessage.INVALID_SYNC_OPERATIONS.format(
+                        settings.ATTENDANCE_SYNC_MAX_OPERATIONS),
+                    data={}
+                )
+                return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+            results = sync_operations(request.user.school_id, operations,
+                                      device_id=str(request.data.get('device_id') or '')[:255])
+            response_data = create_response_data(
+                status=status.HTTP_200_OK,
+                message=AttendenceMarkedMessage.ATTENDANCE_SYNCED_SUCCESSFULLY,
+                data=results
+            )
+            return Response(response_data, status=status.HTTP_200_OK)
+        except Exception as e:
+            response_data = create_response_data(
+                status=status.HTTP_400_BAD_REQUEST,
+                message=e.args[0],
+                data={}
+            )
+            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+
+class WorkingDaysView(APIView):
+    """
+    This class is used to fetch the number of working days of the school in a month (`year`, `month`) or from
+    `start_date` to `end_date` (YYYY-MM-DD, both included), from its working-day calendar.
+    """
+    permission_classes = [IsInSameSchool]
+
+    def get(self, request):
+        try:
+            start_date = request.query_params.get('start_date')
+            end_date = request.query_params.get('end_date')
+            if start_date and end_date:
+                start_date = datetime.date.fromisoformat(start_date)
+                end_date = datetime.date.fromisoformat(end_date)
+                count = working_days_between(request.user.school_id, start_date, end_date)
+                data = {'start_date': start_date, 'end_date': end_date, 'working_days': count}
+            else:
+                year = int(request.query_params.get('year', datetime.date.today().year))
+                month = int(request.query_params.get('month', datetime.date.today().month))
+                if not 1 <= month <= 12:
+                    response_data = create_response_data(
+                        status=status.HTTP_400_BAD_REQUEST,
+                        message=AttendenceMarkedMessage.INVALID_MONTH,
+                        data={}
+                    )
+                    return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+                count = working_days_in_month(request.user.school_id, year, month)
+                data = {'year': year, 'month': month, 'working_days': count}
+
+            response_data = create_response_data(
+                status=status.HTTP_200_OK,
+                message=AttendenceMarkedMessage.WORKING_DAYS_FETCHED_SUCCESSFULLY,
+                data=data
+            )
+            return Response(response_data, status=status.HTTP_200_OK)
+        except Exception as e:
+            response_data = create_response_data(
+                status=status.HTTP_400_BAD_REQUEST,
+                message=e.args[0],
+                data={}
+            )
+            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+
+class AttendanceReportView(ReplicaReadMixin, APIView):
+    """
+    This class is used to report the student, teacher or staff attendance (`type`) of the school between
+    `start_date` and `end_date`, optionally of one `mark_attendence` and, for students, one `class_name` and
+    `section`. With `group_by` (day, person or class) it lists the present, absent and leave counts of each
+    group, counted in the database; without it the attendance rows themselves. Both come with the totals.
+    """
+    permission_classes = [IsAdminOrIsStaffAndInSameSchool]
+    pagination_class = CustomPagination
+
+    def get(self, request):
+        try:
+            kind = KINDS.get(request.query_params.get('type', STUDENT.person_field))
+            group_by = request.query_params.get('group_by')
+            mark = request.query_params.get('mark_attendence')
+            class_name = request.query_params.get('class_name')
+            section = request.query_params.get('section')
+            message = None
+            if kind is None:
+                message = AttendenceMarkedMessage.INVALID_PERSON_TYPE
+            elif group_by and group_by not in GROUP_BY:
+                message = AttendenceMarkedMessage.INVALID_GROUP_BY
+            elif mark and mark not in ('P', 'A', 'L'):
+                message = AttendenceMarkedMessage.INVALID_MARK
+            elif kind is not STUDENT and (class_name or section or group_by == 'class'):
+                message = AttendenceMarkedMessage.CLASS_FILTER_STUDENTS_ONLY
+            if message:
+                response_data = create_response_data(
+                    status=status.HTTP_400_BAD_REQUEST,
+                    message=message,
+                    data={}
+                )
+                return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+            start_date = request.query_params.get('start_date')
+            end_date = request.query_params.get('end_date')
+            attendance = filter_attendance(
+                kind, request.user.school_id,
+                start_date=datetime.date.fromisoformat(start_date) if start_date else None,
+                end_date=datetime.date.fromisoformat(end_date) if end_date else None,
+                mark=mark, class_name=class_name, section=section)
+
+            if group_by:
+                paginator = self.pagination_class()
+                data = paginator.paginate_queryset(group_attendance(kind, attendance, group_by), request)
+            else:
+                paginator = self.pagination_class.for_request(request, ordering=('-date', '-id'))
+                rows = attendance_rows(kind, attendance).order_by('-date', '-id')
+                result_page = paginator.paginate_queryset(rows, request)
+                serializer_class = StudentAttendanceRowSerializer if kind is STUDENT else AttendanceRowSerializer
+                data = serializer_class(result_page, many=True).data
+            response = {
+                'status': status.HTTP_200_OK,
+                'message': AttendenceMarkedMessage.ATTENDANCE_REPORT_FETCHED_SUCCESSFULLY,
+                'data': data,
+                'totals': attendance.aggregate(**mark_counts()),
+                'pagination': paginator.get_pagination_data(),
+            }
+            return Response(response, status=status.HTTP_200_OK)
+        except Exception as e:
+            response_data = create_response_data(
+                status=status.HTTP_400_BAD_REQUEST,
+                message=e.args[0],
+                data={}
+            )
+            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,87 @@
+"""
+School working-day calendars.
+
+WorkingDayCalendar keeps the year of a school as a string with one character per day, WORKING or CLOSED. A day
+is closed when it falls on one of SCHOOL_WEEKEND_DAYS or inside an entry of the school's academic calendar
+(EventsCalender rows with is_event_calendar=False: its holidays, vacations and other closures). The strings are
+built on first use and cached for WORKING_DAYS_CACHE_TIMEOUT seconds; both are dropped whenever an entry of the
+school's calendar changes. Counting the working days of a period is then a count over a slice of one string.
+"""
+import calendar
+import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from attendance.calendars import year_length
+from attendance.models import WorkingDayCalendar
+from authentication.models import EventsCalender
+
+WORKING = '1'
+CLOSED = '0'
+WORKING_DAYS_CACHE_KEY = 'working-days:{}:{}'
+
+
+def _day_index(date):
+    return date.timetuple().tm_yday - 1
+
+
+def build_working_days(school_id, year):
+    """
+    The working-day string of `school_id` for `year`, computed from the weekend and the academic calendar.
+    """
+    first, last = datetime.date(year, 1, 1), datetime.date(year, 12, 31)
+    weekend = set(settings.SCHOOL_WEEKEND_DAYS)
+    days = [CLOSED if (first.weekday() + offset) % 7 in weekend else WORKING for offset in range(year_length(year))]
+    closures = EventsCalender.objects.filter(school_id=school_id, is_event_calendar=False, start_date__lte=last) \
+        .filter(Q(end_date__gte=first) | Q(end_date__isnull=True, start_date__gte=first)) \
+        .values_list('start_date', 'end_date')
+    for start, end in closures:
+        start, end = max(start, first), min(end or start, last)
+        if start <= end:
+            days[_day_index(start):_day_index(end) + 1] = [CLOSED] * ((end - start).days + 1)
+    return ''.join(days)
+
+
+def working_days(school_id, year):
+    """
+    The working-day string of `school_id` for `year`, from the cache, else the table, else built and stored.
+    """
+    key = WORKING_DAYS_CACHE_KEY.format(school_id, year)
+    days = cache.get(key)
+    if days is None:
+        days = WorkingDayCalendar.objects.filter(school_id=school_id, year=year).values_list('days', flat=True) \
+            .first()
+        if days is None:
+            days = build_working_days(school_id, year)
+            WorkingDayCalendar.objects.update_or_create(school_id=school_id, year=year, defaults={'days': days})
+        cache.set(key, days, settings.WORKING_DAYS_CACHE_TIMEOUT)
+    return days
+
+
+def working_days_between(school_id, start, end):
+    """
+    Number of working days of `school_id` from `start` to `end`, both included.
+    """
+    count = 0
+    for year in range(start.year, end.year + 1):
+        first = start if year == start.year else datetime.date(year, 1, 1)
+        last = end if year == end.year else datetime.date(year, 12, 31)
+        count += working_days(school_id, year)[_day_index(first):_day_index(last) + 1].count(WORKING)
+    return count
+
+
+def working_days_in_month(school_id, year, month):
+    return working_days_between(school_id, datetime.date(year, month, 1),
+                                datetime.date(year, month, calendar.monthrange(year, month)[1]))
+
+
+def invalidate_working_days(school_id):
+    """
+    Drop the stored and cached calendars of `school_id`, rebuilt on their next lookup.
+    """
+    calendars = WorkingDayCalendar.objects.filter(school_id=school_id)
+    years = list(calendars.values_list('year', flat=True))
+    calendars.delete()
+    cache.delete_many([WORKING_DAYS_CACHE_KEY.format(school_id, year) for year in years])
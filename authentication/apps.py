@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.core import checks
 
 
 class AuthenticationConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'authentication'
+
+    def ready(self):
+        from authentication import signals  # noqa: F401
+        from EduSmart.db.replica import check_pin_cache
+        checks.register(check_pin_cache, checks.Tags.caches)
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.10 on 2026-10-17 04:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0083_teacheruser_fcm_token'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='staffuser',
+            name='first_name',
+            field=models.CharField(max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='staffuser',
+            name='last_name',
+            field=models.CharField(max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='teachersschedule',
+            name='school_id',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.10 on 2026-10-17 05:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0085_attendence_school_id'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='staffattendence',
+            name='mark_attendence',
+            field=models.CharField(choices=[('P', 'present'), ('A', 'Absent'), ('L', 'On_leave')], max_length=1),
+        ),
+        migrations.AlterUniqueTogether(
+            name='staffattendence',
+            unique_together={('staff', 'date')},
+        ),
+        migrations.AddIndex(
+            model_name='staffattendence',
+            index=models.Index(fields=['school_id', 'date'], name='authenticat_school__9c1671_idx'),
+        ),
+        migrations.AlterField(
+            model_name='teacherattendence',
+            name='mark_attendence',
+            field=models.CharField(choices=[('P', 'present'), ('A', 'Absent'), ('L', 'On_leave')], max_length=1),
+        ),
+        migrations.AlterUniqueTogether(
+            name='teacherattendence',
+            unique_together={('teacher', 'date')},
+        ),
+        migrations.AddIndex(
+            model_name='teacherattendence',
+            index=models.Index(fields=['school_id', 'date'], name='authenticat_school__8853f0_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.10 on 2026-10-17 05:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0086_attendence_unique_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='staffattendence',
+            name='marked_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='teacherattendence',
+            name='marked_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.10 on 2026-10-17 05:33
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0087_attendence_marked_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduleSlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('school_id', models.CharField(blank=True, max_length=255, null=True)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField()),
+                ('position', models.PositiveSmallIntegerField()),
+                ('curriculum', models.CharField(blank=True, max_length=255)),
+                ('class_name', models.CharField(blank=True, max_length=255)),
+                ('section', models.CharField(blank=True, max_length=255)),
+                ('subject', models.CharField(blank=True, max_length=255)),
+                ('weekday', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('class_timing', models.CharField(blank=True, max_length=50)),
+                ('start_time', models.TimeField(blank=True, null=True)),
+                ('class_duration', models.CharField(blank=True, max_length=50)),
+                ('duration', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('lecture_type', models.CharField(blank=True, max_length=255)),
+                ('schedule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slots', to='authentication.teachersschedule')),
+                ('teacher', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='authentication.teacheruser')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['school_id', 'curriculum', 'class_name', 'section', 'weekday'], name='authenticat_school__e7e609_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.10 on 2026-10-17 05:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0088_scheduleslot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeacherAssignment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('school_id', models.CharField(blank=True, max_length=255, null=True)),
+                ('position', models.PositiveSmallIntegerField()),
+                ('curriculum', models.CharField(blank=True, max_length=255)),
+                ('class_name', models.CharField(blank=True, max_length=255)),
+                ('section', models.CharField(blank=True, max_length=255)),
+                ('subject', models.CharField(blank=True, max_length=255)),
+                ('is_class_teacher', models.BooleanField(default=False)),
+                ('teacher', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='assignments', to='authentication.teacheruser')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['school_id', 'class_name', 'section', 'is_class_teacher'], name='authenticat_school__3144e3_idx'), models.Index(fields=['school_id', 'subject', 'class_name', 'section'], name='authenticat_school__590358_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.10 on 2026-10-17 05:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0089_teacherassignment'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='teacherassignment',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -7,6 +7,7 @@ from django.db import models
 from phonenumber_field.modelfields import PhoneNumberField
 
 from EduSmart import storage_backends
+from constants import ATTENDENCE_CHOICE
 
 
 # from EduSmart.settings import AZURE_IMAGE_CONTAINER
@@ -160,10 +161,34 @@ class TeacherUser(models.Model):
         return f'{self.id}'
 
 
+class TeacherAssignment(models.Model):
+    """
+    One entry of TeacherUser.class_subject_section_details, copied out by teacher.assignments so that the teachers
+    of a class-section or subject are found with an indexed query. The first entry is the teacher's own class, the
+    one they are class teacher of. The rows of a teacher are rewritten together, so updated_at is when their
+    details last changed.
+    """
+    teacher = models.ForeignKey(TeacherUser, on_delete=models.CASCADE, related_name='assignments')
+    school_id = models.CharField(max_length=255, blank=True, null=True)
+    position = models.PositiveSmallIntegerField()  # index of the entry in class_subject_section_details
+    curriculum = models.CharField(max_length=255, blank=True)
+    class_name = models.CharField(max_length=255, blank=True)
+    section = models.CharField(max_length=255, blank=True)
+    subject = models.CharField(max_length=255, blank=True)
+    is_class_teacher = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['school_id', 'class_name', 'section', 'is_class_teacher']),
+            models.Index(fields=['school_id', 'subject', 'class_name', 'section']),
+        ]
+
+
 class StaffUser(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
-    first_name = models.CharField(255)
-    last_name = models.CharField(255)
+    first_name = models.CharField(max_length=255)
+    last_name = models.CharField(max_length=255)
     image = models.ImageField(upload_to='', blank=True,
                               storage=storage_backends.AzureMediaStorage(azure_container='image'))
     gender = models.CharField(max_length=50)
@@ -263,23 +288,62 @@ class ErrorLogging(models.Model):
 
 
 class TeachersSchedule(models.Model):
-    school_id = models.CharField(blank=True, null=True)
+    school_id = models.CharField(max_length=255, blank=True, null=True)
     start_date = models.DateField(default=datetime.date.today)
     end_date = models.DateField(default=datetime.date.today)
     teacher = models.ForeignKey(TeacherUser, on_delete=models.CASCADE, blank=True, null=True)
     schedule_data = models.JSONField(null=True)
 
 
+class ScheduleSlot(models.Model):
+    """
+    One class of a TeachersSchedule entry on one of its days, copied out of schedule_data by teacher.schedules
+    so that timetables are read with an indexed query. weekday is 0 for Monday, or null when the entry names no
+    valid day.
+    """
+    schedule = models.ForeignKey(TeachersSchedule, on_delete=models.CASCADE, related_name='slots')
+    school_id = models.CharField(max_length=255, blank=True, null=True)
+    teacher = models.ForeignKey(TeacherUser, on_delete=models.CASCADE, blank=True, null=True)
+    start_date = models.DateField()
+    end_date = models.DateField()
+    position = models.PositiveSmallIntegerField()  # index of the entry in schedule_data
+    curriculum = models.CharField(max_length=255, blank=True)
+    class_name = models.CharField(max_length=255, blank=True)
+    section = models.CharField(max_length=255, blank=True)
+    subject = models.CharField(max_length=255, blank=True)
+    weekday = models.PositiveSmallIntegerField(null=True, blank=True)
+    class_timing = models.CharField(max_length=50, blank=True)
+    start_time = models.TimeField(null=True, blank=True)
+    class_duration = models.CharField(max_length=50, blank=True)
+    duration = models.PositiveSmallIntegerField(null=True, blank=True)  # minutes
+    lecture_type = models.CharField(max_length=255, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['school_id', 'curriculum', 'class_name', 'section', 'weekday'])]
+
+
 class TeacherAttendence(models.Model):
     teacher = models.ForeignKey(TeacherUser, on_delete=models.CASCADE)
+    school_id = models.CharField(max_length=255, null=True, blank=True)  # copy of teacher.user.school_id
     date = models.DateField()
-    mark_attendence = models.CharField(max_length=100)
+    mark_attendence = models.CharField(max_length=1, choices=ATTENDENCE_CHOICE)
+    marked_at = models.DateTimeField(null=True, blank=True)  # when the mark was made, see attendance.sync
+
+    class Meta:
+        unique_together = ('teacher', 'date')
+        indexes = [models.Index(fields=['school_id', 'date'])]
 
 
 class StaffAttendence(models.Model):
     staff = models.ForeignKey(StaffUser, on_delete=models.CASCADE)
+    school_id = models.CharField(max_length=255, null=True, blank=True)  # copy of staff.user.school_id
     date = models.DateField()
-    mark_attendence = models.CharField(max_length=100)
+    mark_attendence = models.CharField(max_length=1, choices=ATTENDENCE_CHOICE)
+    marked_at = models.DateTimeField(null=True, blank=True)  # when the mark was made, see attendance.sync
+
+    class Meta:
+        unique_together = ('staff', 'date')
+        indexes = [models.Index(fields=['school_id', 'date'])]
 
 
 class EventsCalender(models.Model):
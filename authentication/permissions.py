@@ -1,7 +1,9 @@
+from django.conf import settings
+from django.core.cache import cache
 from rest_framework import permissions
 
-from authentication.models import User, SuperAdminUser
-from superadmin.models import SchoolProfile
+from authentication.models import User, SuperAdminUser, StaffUser
+from authentication.tenant import get_school, get_request_school
 
 
 def is_superadmin_user(user):
@@ -36,13 +38,36 @@ def is_staff_user(user):
     return user.is_authenticated and isinstance(user, User) and user.user_type == "non-teaching"
 
 
+STAFF_ROLE_CACHE_KEY = 'auth:staff-role:{}'
+PAYROLL_MANAGEMENT_ROLE = "Payroll Management"
+MANAGEMENT_ROLE = "Management"
+
+
+def get_staff_role(user):
+    """
+    Return the StaffUser role of the given user ('' when there is no staff row), served from the cache.
+    """
+    key = STAFF_ROLE_CACHE_KEY.format(user.id)
+    role = cache.get(key)
+    if role is None:
+        role = StaffUser.objects.filter(user=user).values_list('role', flat=True).first() or ''
+        cache.set(key, role, settings.PRINCIPAL_CACHE_TIMEOUT)
+    return role
+
+
+def invalidate_staff_role(user_id):
+    cache.delete(STAFF_ROLE_CACHE_KEY.format(user_id))
+
+
+def get_request_staff_role(request):
+    if not hasattr(request, 'staff_role'):
+        request.staff_role = get_staff_role(request.user)
+    return request.staff_role
+
+
 def get_user_school(user):
     if user.is_authenticated:
-        if user.school_id:
-            try:
-                return SchoolProfile.objects.get(school_id=user.school_id)
-            except SchoolProfile.DoesNotExist:
-                pass
+        return get_school(user.school_id)
     return None
 
 
@@ -68,7 +93,7 @@ class IsInSameSchool(permissions.BasePermission):
     def has_permission(self, request, view):
         if not IsAuthenticatedUser().has_permission(request, view):
             return False
-        user_school = get_user_school(request.user)
+        user_school = get_request_school(request)
 
         if not user_school or user_school.school_id != request.user.school_id:
             return False
@@ -116,6 +141,26 @@ class IsStaffUser(permissions.BasePermission):
         return is_staff_user(request.user)
 
 
+class IsPayrollOrManagementStaff(permissions.BasePermission):
+    """
+    Allows non-teaching staff whose StaffUser role is one of `allowed_roles`.
+    """
+    message = "You do not have permission to perform this action."
+    allowed_roles = (PAYROLL_MANAGEMENT_ROLE, MANAGEMENT_ROLE)
+
+    def has_permission(self, request, view):
+        return is_staff_user(request.user) and get_request_staff_role(request) in self.allowed_roles
+
+
+class IsPayrollManagementStaff(IsPayrollOrManagementStaff):
+    allowed_roles = (PAYROLL_MANAGEMENT_ROLE,)
+
+
+class IsAdminOrTeacherUser(permissions.BasePermission):
+    def has_permission(self, request, view):
+        return is_admin_user(request.user) or is_teacher_user(request.user)
+
+
 class IsAdminOrIsStaffAndInSameSchool(permissions.BasePermission):
     def has_permission(self, request, view):
         if not request.user or not request.user.is_authenticated:
@@ -9,11 +9,12 @@ from constants import USER_TYPE_CHOICES, ROLE_CHOICES, ATTENDENCE_CHOICE, CATEGO
 from content.models import Content
 from curriculum.models import Subjects, Curriculum
 from student.models import StudentAttendence
-from superadmin.models import SchoolProfile
+from teacher.assignments import class_teachers
 from teacher.serializers import CertificateSerializer, ImageFieldStringAndFile
 from utils import get_student_total_attendance
 from .models import User, AddressDetails, StaffUser, Certificate, StaffAttendence, EventsCalender, ClassEvent, \
-    ClassEventImage, EventImage, TimeTable, TeacherUser, StudentUser, InquiryForm
+    ClassEventImage, EventImage, TimeTable, StudentUser, InquiryForm
+from .tenant import get_school_from_context
 from django.core.exceptions import ValidationError as DjangoValidationError
 from datetime import datetime, date
 
@@ -74,13 +75,14 @@ class UpdateProfileSerializer(serializers.ModelSerializer):
         ]
 
     def update(self, instance, validated_data):
-        if validated_data.get('name'):
-            instance.name = validated_data.get('name')
-        if validated_data.get('email'):
-            instance.email = validated_data.get('email')
-        if validated_data.get('phone'):
-            instance.phone = validated_data.get('phone')
-        instance.save()
+        # `instance` may be the cached principal, so only the given columns are written.
+        update_fields = []
+        for field in self.Meta.fields:
+            if validated_data.get(field):
+                setattr(instance, field, validated_data.get(field))
+                update_fields.append(field)
+        if update_fields:
+            instance.save(update_fields=update_fields)
         return instance
 
 
@@ -703,10 +705,8 @@ class ExamScheduleDetailSerializer(serializers.ModelSerializer):
         fields = ['class_name', 'class_teacher', 'class_section', 'exam_type', 'exam_month', 'more_subject']
 
     def get_class_teacher(self, obj):
-        teacher = TeacherUser.objects.get(role='class teacher',
-                                          class_subject_section_details__0__curriculum=obj.curriculum,
-                                          class_subject_section_details__0__class=obj.class_name,
-                                          class_subject_section_details__0__section=obj.class_section)
+        teacher = class_teachers(obj.school_id, obj.class_name, section=obj.class_section,
+                                 curriculum=obj.curriculum).get(role='class teacher')
         if teacher:
             return teacher.full_name
         else:
@@ -780,7 +780,7 @@ class StudentInfoDetailSerializer(serializers.ModelSerializer):
         return total_attendance
 
     def get_school_name(self, obj):
-        School_name = SchoolProfile.objects.get(school_id=obj.user.school_id)
+        School_name = get_school_from_context(self.context, obj.user.school_id)
         if School_name:
             return School_name.school_name
         else:
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from authentication.authentication import invalidate_principal
+from authentication.models import User, StaffUser
+from authentication.permissions import invalidate_staff_role
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_principal(sender, instance, **kwargs):
+    invalidate_principal(instance.pk)
+    invalidate_staff_role(instance.pk)
+
+
+@receiver(post_save, sender=StaffUser)
+@receiver(post_delete, sender=StaffUser)
+def invalidate_cached_staff_role(sender, instance, **kwargs):
+    invalidate_staff_role(instance.user_id)
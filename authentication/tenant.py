@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from superadmin.models import SchoolProfile
+
+SCHOOL_CACHE_KEY = 'tenant:school:{}'
+SCHOOL_NOT_FOUND = 'not-found'
+
+
+def get_school(school_id):
+    """
+    Return the SchoolProfile for the given school_id, served from the process cache when possible.
+    """
+    if not school_id:
+        return None
+    key = SCHOOL_CACHE_KEY.format(school_id)
+    school = cache.get(key)
+    if school is None:
+        try:
+            school = SchoolProfile.objects.get(school_id=school_id)
+        except SchoolProfile.DoesNotExist:
+            school = SCHOOL_NOT_FOUND
+        cache.set(key, school, settings.TENANT_CACHE_TIMEOUT)
+    if school == SCHOOL_NOT_FOUND:
+        return None
+    return school
+
+
+def invalidate_school(*school_ids):
+    """
+    Drop cached SchoolProfile rows, called whenever a school profile is created, updated or deleted.
+    """
+    cache.delete_many([SCHOOL_CACHE_KEY.format(school_id) for school_id in school_ids if school_id])
+
+
+def get_request_school(request):
+    """
+    Resolve the school of the authenticated user once per request and keep it on the request as `school`.
+    """
+    if not hasattr(request, 'school'):
+        user = request.user
+        request.school = get_school(user.school_id) if user.is_authenticated else None
+    return request.school
+
+
+def get_school_from_context(context, school_id):
+    """
+    Serializer helper: reuse the school already resolved on the request when it matches, else use the cache.
+    """
+    request = context.get('request')
+    if request is not None and request.user.is_authenticated and request.user.school_id == school_id:
+        return get_request_school(request)
+    return get_school(school_id)
@@ -1,3 +1,235 @@
-from django.test import TestCase
+import datetime
+import threading
+from decimal import Decimal
+from unittest import expectedFailure, mock
 
-# Create your tests here.
+import msgpack
+import psycopg2
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import router
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import SimpleTestCase, TestCase, override_settings
+from phonenumber_field.phonenumber import PhoneNumber
+from psycopg2 import extensions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+
+from EduSmart.db.pool import ConnectionPool
+from EduSmart.db.replica import ReplicaReadMixin, ReplicaStickinessMiddleware, check_pin_cache, pin_to_primary, \
+    replica_stream
+from authentication.models import User
+from authentication.serializers import UpdateProfileSerializer
+from benchmarks import budget
+from renderers import ORJSONRenderer
+from student.models import StudentMaterial
+
+
+class NonTeachingStaffListQueryBudgetTest(budget.QueryBudgetTestCase):
+    path = '/auth/non-teaching-staff/fetch/list/'
+
+    # NonTeachingStaffListSerializers reads obj.user for every staff member.
+    @expectedFailure
+    def test_query_count_does_not_grow_with_rows(self):
+        super().test_query_count_does_not_grow_with_rows()
+
+
+class StudyMaterialListQueryBudgetTest(budget.QueryBudgetTestCase):
+    path = '/auth/study/material/list/'
+    role = 'teacher'
+
+    # StudyMaterialListSerializer runs TeacherUser.objects.get per material.
+    @expectedFailure
+    def test_query_count_does_not_grow_with_rows(self):
+        super().test_query_count_does_not_grow_with_rows()
+
+    def seed(self, index, rows):
+        school = super().seed(index, 1)
+        teacher = school['teacher'].teacheruser
+        detail = teacher.class_subject_section_details[0]
+        StudentMaterial.objects.bulk_create([
+            StudentMaterial(teacher=teacher, school_id=school['school_id'], subject=detail['subject'],
+                            class_name=detail['class'], section=detail['section'], curriculum=detail['curriculum'],
+                            upload_link='https://example.com/material', title=f'Material {number}',
+                            discription='Study material', upload_content='material.pdf')
+            for number in range(rows)
+        ])
+        return school
+
+
+class UpdateProfileTest(TestCase):
+    def test_stale_instance_only_writes_the_given_fields(self):
+        user = User.objects.create(email='profile@edu.test', name='Profile', user_type='admin')
+        stale = User.objects.get(id=user.id)
+        User.objects.filter(id=user.id).update(designation='Principal')
+        serializer = UpdateProfileSerializer(stale, data={'name': 'Renamed'})
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        user.refresh_from_db()
+        self.assertEqual((user.name, user.designation), ('Renamed', 'Principal'))
+
+
+class _ReadDatabaseView(ReplicaReadMixin, APIView):
+    def get(self, request):
+        return Response({'db': router.db_for_read(User)})
+
+
+class _StreamDatabaseView(ReplicaReadMixin, APIView):
+    def get(self, request):
+        return StreamingHttpResponse(replica_stream(router.db_for_read(User) for _ in range(2)))
+
+
+@override_settings(DATABASES={**settings.DATABASES, 'replica': settings.DATABASES['default']},
+                   CACHES={**settings.CACHES, 'replica_pins': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+                                                               'LOCATION': 'replica_pin_cache'}},
+                   REPLICA_PIN_CACHE='replica_pins')
+class ReplicaRoutingTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        call_command('createcachetable', 'replica_pin_cache')
+        self.user = User.objects.create(email='reader@replica.test', name='Reader', user_type='admin')
+
+    def read_database(self):
+        request = APIRequestFactory().get('/')
+        force_authenticate(request, self.user)
+        return _ReadDatabaseView.as_view()(request).data['db']
+
+    def test_marked_view_reads_from_replica(self):
+        self.assertEqual(self.read_database(), 'replica')
+
+    def test_streamed_content_reads_from_replica(self):
+        request = APIRequestFactory().get('/')
+        force_authenticate(request, self.user)
+        response = _StreamDatabaseView.as_view()(request)
+        self.assertEqual(b''.join(response.streaming_content), b'replicareplica')
+
+    def test_reads_outside_marked_views_stay_on_primary(self):
+        self.assertEqual(router.db_for_read(User), 'default')
+
+    def test_user_reads_from_primary_after_a_write(self):
+        def write(request):
+            request.user = self.user
+            self.user.name = 'Writer'
+            self.user.save(update_fields=['name'])
+            return HttpResponse()
+
+        ReplicaStickinessMiddleware(write)(APIRequestFactory().post('/'))
+        self.assertEqual(self.read_database(), 'default')
+
+    def test_pin_expires(self):
+        with override_settings(REPLICA_STICKY_SECONDS=0):
+            pin_to_primary(self.user)
+        self.assertEqual(self.read_database(), 'replica')
+
+    def test_pins_are_shared_between_workers(self):
+        pin_to_primary(self.user)
+        self.assertTrue(caches['replica_pins'].get(f'replica:pin:{self.user.pk}'))
+        self.assertEqual(check_pin_cache(None), [])
+
+    def test_process_local_pin_cache_is_refused(self):
+        with override_settings(REPLICA_PIN_CACHE='default'):
+            self.assertEqual([error.id for error in check_pin_cache(None)], ['replica.E001'])
+
+
+def _fake_connection(**kwargs):
+    connection = mock.Mock(closed=0)
+    connection.get_transaction_status.return_value = extensions.TRANSACTION_STATUS_IDLE
+    return connection
+
+
+@mock.patch('EduSmart.db.pool.psycopg2.connect', side_effect=_fake_connection)
+class ConnectionPoolTest(SimpleTestCase):
+    def test_released_connection_is_reused(self, connect):
+        pool = ConnectionPool('default:test', {'dbname': 'test'}, max_size=2)
+        connection = pool.acquire()
+        pool.release(connection)
+        self.assertIs(pool.acquire(), connection)
+        self.assertEqual(connect.call_count, 1)
+        self.assertEqual((pool.stats()['reused'], pool.stats()['size']), (1, 1))
+
+    def test_exhausted_pool_times_out(self, connect):
+        pool = ConnectionPool('default:test', {'dbname': 'test'}, max_size=1, wait_timeout=0.05)
+        pool.acquire()
+        with self.assertRaises(psycopg2.OperationalError):
+            pool.acquire()
+        self.assertEqual((pool.stats()['timeouts'], connect.call_count), (1, 1))
+
+    def test_exhausted_pool_waits_for_a_release(self, connect):
+        pool = ConnectionPool('default:test', {'dbname': 'test'}, max_size=1, wait_timeout=5)
+        connection = pool.acquire()
+        release = threading.Timer(0.05, pool.release, [connection])
+        release.start()
+        self.assertIs(pool.acquire(), connection)
+        release.join()
+        self.assertEqual((pool.stats()['waits'], connect.call_count), (1, 1))
+
+    def test_closed_connection_is_discarded(self, connect):
+        pool = ConnectionPool('default:test', {'dbname': 'test'}, max_size=1)
+        connection = pool.acquire()
+        connection.closed = 1
+        pool.release(connection)
+        self.assertEqual((pool.stats()['size'], pool.stats()['closed_broken']), (0, 1))
+        self.assertIsNot(pool.acquire(), connection)
+
+    def test_connection_closed_while_idle_is_replaced(self, connect):
+        pool = ConnectionPool('default:test', {'dbname': 'test'}, max_size=1)
+        connection = pool.acquire()
+        pool.release(connection)
+        connection.closed = 1
+        self.assertIsNot(pool.acquire(), connection)
+        self.assertEqual((pool.stats()['size'], pool.stats()['closed_broken'], connect.call_count), (1, 1, 2))
+
+    def test_connection_that_cannot_roll_back_is_discarded(self, connect):
+        pool = ConnectionPool('default:test', {'dbname': 'test'}, max_size=1)
+        connection = pool.acquire()
+        connection.get_transaction_status.return_value = extensions.TRANSACTION_STATUS_INERROR
+        connection.rollback.side_effect = psycopg2.InterfaceError('connection already closed')
+        pool.release(connection)
+        self.assertEqual((pool.stats()['size'], pool.stats()['idle'], pool.stats()['closed_broken']), (0, 0, 1))
+
+
+class _PayloadView(APIView):
+    permission_classes = []
+    payload = {
+        'fee': Decimal('1234.50'),
+        'date': datetime.date(2024, 5, 1),
+        'class_timing': datetime.time(9, 30, 15, 123456),
+        'created_at': datetime.datetime(2024, 5, 1, 9, 30, 0, 250000, tzinfo=datetime.timezone.utc),
+        'name': 'Ünïcode\u2028name',
+        'rows': [{'id': 1}, {'id': 2}],
+    }
+
+    def get(self, request):
+        return Response(self.payload)
+
+
+class RendererTest(SimpleTestCase):
+    def render(self, accept):
+        request = APIRequestFactory().get('/', HTTP_ACCEPT=accept)
+        response = _PayloadView.as_view()(request)
+        response.render()
+        return response
+
+    def test_json_matches_the_stdlib_renderer(self):
+        response = self.render('application/json')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.content, JSONRenderer().render(_PayloadView.payload))
+
+    def test_msgpack_is_negotiated_by_accept_header(self):
+        response = self.render('application/msgpack')
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(response.content), {
+            'fee': 1234.5,
+            'date': '2024-05-01',
+            'class_timing': '09:30:15.123456',
+            'created_at': '2024-05-01T09:30:00.250000Z',
+            'name': 'Ünïcode\u2028name',
+            'rows': [{'id': 1}, {'id': 2}],
+        })
+
+    def test_phone_numbers_render_as_e164(self):
+        content = ORJSONRenderer().render({'phone': PhoneNumber.from_string('+919876543210')})
+        self.assertEqual(content, b'{"phone":"+919876543210"}')
@@ -26,6 +26,9 @@ from django.conf import settings
 from django.shortcuts import get_object_or_404
 
 from EduSmart import settings
+from EduSmart.db.replica import ReplicaReadMixin
+from attendance.kinds import STAFF
+from attendance.rollups import current_attendance_summary, current_month_totals
 from authentication.models import User, AddressDetails, ErrorLogging, Certificate, StaffUser, StaffAttendence, \
     TeacherUser, StudentUser, TeachersSchedule, DayReview, TeacherAttendence, Notification, TimeTable, EventsCalender, \
     ClassEvent, ClassEventImage, EventImage, InquiryForm
@@ -60,8 +63,7 @@ from teacher.serializers import TeacherDetailSerializer, TeacherProfileSerialize
     StudyMaterialUploadSerializer, StudyMaterialListSerializer, StudyMaterialDetailSerializer, \
     CurriculumSectionListSerializer, CurriculumClassListSerializer, CurriculumSubjectsListerializer, \
     StudyMaterialUpdateSerializer
-from utils import create_response_data, create_response_list_data, get_staff_total_attendance, \
-    get_staff_monthly_attendance, get_staff_total_absent, get_staff_monthly_absent, generate_random_password
+from utils import create_response_data, create_response_list_data, generate_random_password
 
 logger = logging.getLogger('myapp')
 
@@ -141,7 +143,7 @@ class FCMTokenUpdateView(APIView):
 
             # Update the FCM token for the user
             user.fcm_token = fcm_token
-            user.save()
+            user.save(update_fields=['fcm_token'])
 
             response_data = create_response_data(
                 status=status.HTTP_200_OK,
@@ -250,6 +252,7 @@ class UserDeleteView(APIView):
         try:
             user = User.objects.get(id=pk)
             user.is_active = False
+            user.save(update_fields=['is_active'])
             AddressDetails.objects.get(user_id=user.id)
             response_data = create_response_data(
                 status=status.HTTP_200_OK,
@@ -671,8 +674,7 @@ class FetchAttendanceDetailView(APIView):
     def get(self, request, pk):
         try:
             staff = StaffUser.objects.get(id=pk, user__school_id=request.user.school_id)
-            data = StaffAttendence.objects.filter(staff_id=pk, staff__user__school_id=request.user.school_id).order_by(
-                '-date')
+            data = StaffAttendence.objects.filter(staff_id=pk, school_id=request.user.school_id).order_by('-date')
 
             filter_type = request.query_params.get('filter_type', None)
             if filter_type:
@@ -701,6 +703,8 @@ class FetchAttendanceDetailView(APIView):
 
             if data:
                 serializer = StaffAttendanceDetailSerializer(data, many=True)
+                summary = current_attendance_summary(STAFF, staff.id)
+                this_month = current_month_totals(summary)
                 response_data = create_response_data(
                     status=status.HTTP_200_OK,
                     message=UserResponseMessage.USER_DETAIL_MESSAGE,
@@ -708,10 +712,10 @@ class FetchAttendanceDetailView(APIView):
                         "staff_name": f"{staff.first_name} {staff.last_name}",
                         "staff_id": staff.id,
                         "staff_role": staff.role,
-                        "total_attendance": get_staff_total_attendance(data),
-                        "monthly_attendance": get_staff_monthly_attendance(data),
-                        "total_absent": get_staff_total_absent(data),
-                        "monthly_absent": get_staff_monthly_absent(data),
+                        "total_attendance": summary['present'],
+                        "monthly_attendance": this_month['present'],
+                        "total_absent": summary['absent'],
+                        "monthly_absent": this_month['absent'],
                         "attendence_detail": serializer.data,
                     }
                 )
@@ -2161,7 +2165,7 @@ class EventCreateView(APIView):
             return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
 
 
-class GetAllEvents(APIView):
+class GetAllEvents(ReplicaReadMixin, APIView):
     permission_classes = [IsAdminOrIsStaffAndInSameSchool]
 
     def get(self, request):
@@ -2206,7 +2210,7 @@ class GetAllEvents(APIView):
         return Response(response_data, status=status.HTTP_200_OK)
 
 
-class StaffAttedanceFilterListView(APIView):
+class StaffAttedanceFilterListView(ReplicaReadMixin, APIView):
     """
     This class is used to add filter in the list of non teaching staff attendance.
     """
@@ -2215,9 +2219,7 @@ class StaffAttedanceFilterListView(APIView):
 
     def get(self, request):
         try:
-            staff = StaffUser.objects.filter(user__school_id=request.user.school_id)
-            attendance_data = StaffAttendence.objects.filter(staff__in=staff,
-                                                             staff__user__school_id=request.user.school_id)
+            attendance_data = StaffAttendence.objects.filter(school_id=request.user.school_id)
 
             date = request.query_params.get('date', None)
             mark_attendence = request.query_params.get('mark_attendence', None)
@@ -2231,21 +2233,15 @@ class StaffAttedanceFilterListView(APIView):
             if mark_attendence == 'L':
                 attendance_data = attendance_data.filter(mark_attendence='L')
 
-            paginator = self.pagination_class()
-            result_page = paginator.paginate_queryset(attendance_data, request)
+            paginator = self.pagination_class.for_request(request, ordering=('-date', '-id'))
+            result_page = paginator.paginate_queryset(attendance_data.select_related('staff'), request)
 
             serializers = StaffAttendanceFilterListSerializer(result_page, many=True)
             response = {
                 'status': status.HTTP_200_OK,
                 'message': UserResponseMessage.USER_LIST_MESSAGE,
                 'data': serializers.data,
-                'pagination': {
-                    'page_size': paginator.page_size,
-                    'next': paginator.get_next_link(),
-                    'previous': paginator.get_previous_link(),
-                    'total_pages': paginator.page.paginator.num_pages,
-                    'current_page': paginator.page.number,
-                }
+                'pagination': paginator.get_pagination_data(),
             }
             return Response(response, status=status.HTTP_200_OK)
         except Exception as e:
@@ -2354,7 +2350,7 @@ class AdminBookContentList(APIView):
                     content_data = content_data.filter(is_recommended=is_recommended,
                                                        school_id=self.request.user.school_id)
 
-                paginator = self.pagination_class()
+                paginator = self.pagination_class.for_request(request)
                 paginated_queryset = paginator.paginate_queryset(content_data, request)
                 serializer = ContentListSerializer(paginated_queryset, many=True)
                 response_data = {
@@ -2362,13 +2358,7 @@ class AdminBookContentList(APIView):
                     'count': len(serializer.data),
                     'message': ContentMessages.CONTENT_FETCHED,
                     'data': serializer.data,
-                    'pagination': {
-                        'page_size': paginator.page_size,
-                        'next': paginator.get_next_link(),
-                        'previous': paginator.get_previous_link(),
-                        'total_pages': paginator.page.paginator.num_pages,
-                        'current_page': paginator.page.number,
-                    }
+                    'pagination': paginator.get_pagination_data(),
                 }
                 return Response(response_data, status=status.HTTP_200_OK)
             else:
@@ -3115,7 +3105,7 @@ class StudentInfoDetailView(APIView):
     def get(self, request, pk):
         try:
             data = StudentUser.objects.get(user__school_id=request.user.school_id, id=pk)
-            serializer = StudentInfoDetailSerializer(data)
+            serializer = StudentInfoDetailSerializer(data, context={'request': request})
             response_data = create_response_data(
                 status=status.HTTP_200_OK,
                 message=UserResponseMessage.USER_LIST_MESSAGE,
@@ -0,0 +1,268 @@
+"""
+Endpoint benchmark suite.
+
+    python -m benchmarks run --schools 3 --students 2000 --output before.json
+    python -m benchmarks compare before.json after.json
+    python -m benchmarks connections --threads 32 --pool-size 10
+    python -m benchmarks attendance --schools 5 --students 3200 --output attendance.json
+
+`run` builds a throwaway test database from the configured DATABASES (set SQLITE_DATABASE to benchmark
+against SQLite instead of PostgreSQL), seeds it with benchmarks.dataset, drives every endpoint in
+benchmarks.endpoints through the DRF test client and writes query counts, p50/p95 latency and peak Python
+memory per endpoint to a JSON results file. `compare` flags endpoints that got worse between two runs and
+exits with status 1 when it finds any. `connections` compares a connection per request, persistent
+connections and the in-process pool under concurrent load against a local PostgreSQL (see
+benchmarks.connections). `attendance` times the attendance range queries without and with the attendance
+indexes (see benchmarks.attendance).
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from benchmarks.connections import MODES
+
+
+def _setup_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'EduSmart.settings')
+    import django
+    django.setup()
+
+
+def _measure(client, path, iterations):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    response = client.get(path)  # warm the tenant, principal and role caches
+    timings = []
+    queries = 0
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = client.get(path)
+            timings.append((time.perf_counter() - start) * 1000)
+        queries = max(queries, len(captured))
+
+    tracemalloc.start()
+    client.get(path)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    percentiles = statistics.quantiles(timings, n=20, method='inclusive') if len(timings) > 1 else timings * 19
+    return {
+        'status': response.status_code,
+        'queries': queries,
+        'mean_ms': round(statistics.mean(timings), 2),
+        'p50_ms': round(statistics.median(timings), 2),
+        'p95_ms': round(percentiles[18], 2),
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def run(args):
+    _setup_django()
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+    from rest_framework.test import APIClient
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    from benchmarks.dataset import build_dataset
+    from benchmarks.endpoints import ENDPOINTS
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        start = time.perf_counter()
+        schools = build_dataset(schools=args.schools, students=args.students, teachers=args.teachers,
+                                staff=args.staff, days=args.days, seed=args.seed)
+        seed_seconds = time.perf_counter() - start
+        print(f'Seeded {args.schools} school(s) in {seed_seconds:.1f}s', file=sys.stderr)
+
+        # Endpoints are measured for the last school so that its rows are never the first ones in the tables.
+        school = schools[-1]
+        results = {}
+        for name, role, path in ENDPOINTS:
+            if args.only and name not in args.only:
+                continue
+            client = APIClient(raise_request_exception=False)
+            client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(school[role])}')
+            results[name] = _measure(client, path.format(**school), args.iterations)
+            print(f'{name:36} {results[name]}', file=sys.stderr)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    report = {
+        'meta': {
+            'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'seed_seconds': round(seed_seconds, 1),
+            'options': {key: value for key, value in vars(args).items() if key not in ('func', 'output')},
+        },
+        'endpoints': results,
+    }
+    with open(args.output, 'w') as handle:
+        json.dump(report, handle, indent=2)
+    print(f'Results written to {args.output}', file=sys.stderr)
+
+
+def compare(args):
+    with open(args.base) as handle:
+        base = json.load(handle)['endpoints']
+    with open(args.head) as handle:
+        head = json.load(handle)['endpoints']
+
+    regressions = []
+    print(f'{"endpoint":36} {"queries":>15} {"p95_ms":>21} {"peak_kb":>21}')
+    for name in sorted(set(base) & set(head)):
+        old, new = base[name], head[name]
+        problems = []
+        if new['queries'] > old['queries']:
+            problems.append('queries')
+        if new['p95_ms'] > old['p95_ms'] * (1 + args.threshold) and new['p95_ms'] - old['p95_ms'] > args.min_ms:
+            problems.append('p95_ms')
+        if new['peak_kb'] > old['peak_kb'] * (1 + args.threshold):
+            problems.append('peak_kb')
+        if new['status'] >= 400 > old['status']:
+            problems.append('status')
+        if problems:
+            regressions.append((name, problems))
+        print(f'{name:36} {old["queries"]:>6} -> {new["queries"]:<6} {old["p95_ms"]:>9} -> {new["p95_ms"]:<9} '
+              f'{old["peak_kb"]:>9} -> {new["peak_kb"]:<9} {" ".join(problems)}')
+
+    for name in sorted(set(base) ^ set(head)):
+        print(f'{name:36} only in {"base" if name in base else "head"}')
+    if regressions:
+        print(f'\n{len(regressions)} endpoint(s) regressed: {", ".join(name for name, _ in regressions)}')
+        return 1
+    print('\nNo regressions.')
+    return 0
+
+
+def connections(args):
+    _setup_django()
+    from benchmarks.connections import run as run_connections
+
+    results = run_connections(args)
+    if args.output:
+        report = {
+            'meta': {
+                'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'options': {key: value for key, value in vars(args).items()
+                            if key not in ('func', 'output', 'password')},
+            },
+            'modes': results,
+        }
+        with open(args.output, 'w') as handle:
+            json.dump(report, handle, indent=2)
+        print(f'Results written to {args.output}', file=sys.stderr)
+
+
+def attendance(args):
+    _setup_django()
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    from attendance.kinds import KINDS
+    from benchmarks.attendance import run as run_attendance
+    from benchmarks.dataset import build_dataset
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        start = time.perf_counter()
+        schools = build_dataset(schools=args.schools, students=args.students, teachers=args.teachers,
+                                staff=args.staff, days=args.days, seed=args.seed)
+        seed_seconds = time.perf_counter() - start
+        print(f'Seeded {args.schools} school(s) in {seed_seconds:.1f}s', file=sys.stderr)
+        results = run_attendance(args, KINDS[args.type], schools)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+    print(f'{"query":24} {"before p95_ms":>14} {"after p95_ms":>14}   ({results["rows"]} rows)')
+    for name in results['after']:
+        print(f'{name:24} {results["before"][name]["p95_ms"]:>14} {results["after"][name]["p95_ms"]:>14}')
+    if args.output:
+        report = {
+            'meta': {
+                'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+                'database': connection.vendor,
+                'python': platform.python_version(),
+                'seed_seconds': round(seed_seconds, 1),
+                'options': {key: value for key, value in vars(args).items() if key not in ('func', 'output')},
+            },
+            'queries': results,
+        }
+        with open(args.output, 'w') as handle:
+            json.dump(report, handle, indent=2)
+        print(f'Results written to {args.output}', file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='Seed a throwaway database and benchmark the endpoints.')
+    run_parser.add_argument('--schools', type=int, default=3)
+    run_parser.add_argument('--students', type=int, default=2000, help='Students per school.')
+    run_parser.add_argument('--teachers', type=int, default=200, help='Teachers per school.')
+    run_parser.add_argument('--staff', type=int, default=40, help='Non-teaching staff per school.')
+    run_parser.add_argument('--days', type=int, default=365, help='Days of attendance history.')
+    run_parser.add_argument('--seed', type=int, default=42)
+    run_parser.add_argument('--iterations', type=int, default=20, help='Timed requests per endpoint.')
+    run_parser.add_argument('--only', nargs='*', help='Endpoint names to run, all by default.')
+    run_parser.add_argument('--output', default='benchmark-results.json')
+    run_parser.set_defaults(func=run)
+
+    compare_parser = commands.add_parser('compare', help='Flag regressions between two results files.')
+    compare_parser.add_argument('base')
+    compare_parser.add_argument('head')
+    compare_parser.add_argument('--threshold', type=float, default=0.2,
+                                help='Relative p95 latency and peak memory growth that counts as a regression.')
+    compare_parser.add_argument('--min-ms', type=float, default=2.0,
+                                help='Ignore p95 latency changes smaller than this many milliseconds.')
+    compare_parser.set_defaults(func=compare)
+
+    connections_parser = commands.add_parser(
+        'connections', help='Compare per-request connections, persistent connections and the pool under load.')
+    connections_parser.add_argument('--host', default=os.getenv('PGHOST', 'localhost'))
+    connections_parser.add_argument('--port', type=int, default=int(os.getenv('PGPORT', 5432)))
+    connections_parser.add_argument('--name', default=os.getenv('PGDATABASE', 'postgres'))
+    connections_parser.add_argument('--user', default=os.getenv('PGUSER', 'postgres'))
+    connections_parser.add_argument('--password', default=os.getenv('PGPASSWORD', ''))
+    connections_parser.add_argument('--threads', type=int, default=32, help='Concurrent worker threads.')
+    connections_parser.add_argument('--requests', type=int, default=200, help='Requests per thread.')
+    connections_parser.add_argument('--pool-size', type=int, default=10, help='MAX_SIZE of the pool.')
+    connections_parser.add_argument('--query', default='SELECT 1', help='Query every request runs.')
+    connections_parser.add_argument('--modes', nargs='*', default=MODES, choices=MODES)
+    connections_parser.add_argument('--output', default=None, help='Also write the results to this JSON file.')
+    connections_parser.set_defaults(func=connections)
+
+    attendance_parser = commands.add_parser(
+        'attendance', help='Time the attendance range queries without and with the attendance indexes.')
+    attendance_parser.add_argument('--schools', type=int, default=5)
+    attendance_parser.add_argument('--students', type=int, default=3200, help='Students per school.')
+    attendance_parser.add_argument('--teachers', type=int, default=20, help='Teachers per school.')
+    attendance_parser.add_argument('--staff', type=int, default=5, help='Non-teaching staff per school.')
+    attendance_parser.add_argument('--days', type=int, default=365, help='Days of attendance history.')
+    attendance_parser.add_argument('--seed', type=int, default=42)
+    attendance_parser.add_argument('--type', default='student', choices=('student', 'teacher', 'staff'),
+                                   help='Attendance table to query.')
+    attendance_parser.add_argument('--iterations', type=int, default=20, help='Timed runs per query.')
+    attendance_parser.add_argument('--output', default=None, help='Also write the results to this JSON file.')
+    attendance_parser.set_defaults(func=attendance)
+
+    args = parser.parse_args(argv)
+    return args.func(args) or 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
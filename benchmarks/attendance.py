@@ -0,0 +1,94 @@
+"""
+Attendance range-query benchmark.
+
+    python -m benchmarks attendance --schools 5 --students 3200 --days 365 --output attendance.json
+
+Seeds a throwaway database (about 5M student attendance rows with the defaults), then times the queries
+behind the attendance detail and filter list views twice:
+
+    before  without the (person, date) unique constraint and the (school_id, date) index, filtering on the
+            school through the person and its user as the views used to
+    after   with both, filtering on the denormalized school_id
+
+and reports the mean and p95 milliseconds of every query in both phases.
+"""
+import statistics
+import time
+
+from django.db.models import Count
+
+PHASES = ('before', 'after')
+
+
+def _queries(kind, school_id, person_id, day, phase):
+    """
+    Name -> queryset of the year, day and month range queries the attendance views run, in their before or
+    after shape.
+    """
+    model, person_field = kind.model, kind.person_field
+    if phase == 'before':
+        school = {f'{person_field}__user__school_id': school_id}
+        people = kind.person_model.objects.filter(user__school_id=school_id)
+        list_filter = {f'{person_field}__in': people, **school}
+    else:
+        school = list_filter = {'school_id': school_id}
+    month = (day.replace(day=1), day)
+    return {
+        'person_year': model.objects.filter(**{f'{person_field}_id': person_id}, **school,
+                                            date__range=(day.replace(month=1, day=1), day)).order_by('-date'),
+        'school_day': model.objects.filter(**list_filter, date=day).order_by('-date', '-id')[:50],
+        'school_month_marks': model.objects.filter(**school, date__range=month).values('mark_attendence')
+        .annotate(rows=Count('id')).order_by(),
+        'school_month_absent': model.objects.filter(**list_filter, date__range=month, mark_attendence='A')
+        .order_by('-date', '-id')[:50],
+    }
+
+
+def _set_indexes(kind, enabled):
+    from django.db import connection
+
+    model = kind.model
+    unique_together = model._meta.unique_together
+    with connection.schema_editor() as editor:
+        if enabled:
+            editor.alter_unique_together(model, [], unique_together)
+            for index in model._meta.indexes:
+                editor.add_index(model, index)
+        else:
+            editor.alter_unique_together(model, unique_together, [])
+            for index in model._meta.indexes:
+                editor.remove_index(model, index)
+
+
+def _time(queryset, iterations):
+    list(queryset.all())  # warm the page cache
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        list(queryset.all())
+        timings.append((time.perf_counter() - start) * 1000)
+    percentiles = statistics.quantiles(timings, n=20, method='inclusive') if len(timings) > 1 else timings * 19
+    return {'mean_ms': round(statistics.mean(timings), 2), 'p95_ms': round(percentiles[18], 2)}
+
+
+def run(args, kind, schools):
+    """
+    Time every query in both phases for the last seeded school and return {phase: {query: timings}}.
+    """
+    from django.db import connection
+
+    school = schools[-1]
+    person_id = kind.model.objects.filter(school_id=school['school_id']).values_list(
+        f'{kind.person_field}_id', flat=True).first()
+    day = kind.model.objects.filter(school_id=school['school_id']).latest('date').date
+    rows = kind.model.objects.count()
+
+    results = {'rows': rows}
+    for phase in PHASES:
+        _set_indexes(kind, enabled=phase == 'after')
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {connection.ops.quote_name(kind.model._meta.db_table)}')
+        results[phase] = {}
+        for name, queryset in _queries(kind, school['school_id'], person_id, day, phase).items():
+            results[phase][name] = _time(queryset, args.iterations)
+    return results
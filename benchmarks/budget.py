@@ -0,0 +1,52 @@
+"""
+Query-budget regression tests.
+
+A QueryBudgetTestCase seeds one school with `small_rows` rows and another with `large_rows` rows, requests
+`path` for each with a page size that covers every row, and fails when the larger school needs more SQL
+queries than the smaller one. Endpoints that still issue per-row queries mark the test as an expected
+failure; the unexpected success after a fix tells whoever fixed it to drop the marker, and from then on the
+test keeps the N+1 from coming back.
+"""
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from benchmarks.dataset import build_school
+
+
+class QueryBudgetTestCase(APITestCase):
+    path = None
+    role = 'admin'
+    small_rows = 10
+    large_rows = 300
+
+    def setUp(self):
+        # The tenant, principal and staff role caches outlive the rolled back test transactions.
+        cache.clear()
+
+    def seed(self, index, rows):
+        """
+        Create a school whose listed table holds `rows` rows and return its handles (see build_school).
+        """
+        return build_school(index, students=rows, teachers=rows, staff=rows, routes=rows, days=1)
+
+    def count_queries(self, index, rows):
+        school = self.seed(index, rows)
+        self.client.force_authenticate(school[self.role])
+        path = self.path.format(**school)
+        params = {'page_size': rows}
+
+        response = self.client.get(path, params)  # warm the tenant and role caches
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(path, params)
+        self.assertLess(response.status_code, 300, response.content)
+        return len(captured)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        if self.path is None:
+            self.skipTest('QueryBudgetTestCase is a base class.')
+        small = self.count_queries(0, self.small_rows)
+        large = self.count_queries(1, self.large_rows)
+        self.assertEqual(small, large, f'{self.path} ran {small} queries for {self.small_rows} rows and '
+                                       f'{large} queries for {self.large_rows} rows.')
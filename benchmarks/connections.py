@@ -0,0 +1,137 @@
+"""
+Connection handling benchmark against a local PostgreSQL server.
+
+    python -m benchmarks connections --threads 32 --requests 200 --pool-size 10
+
+Every thread plays a worker thread serving `--requests` requests of one query each, with Django's own
+request boundaries (close_if_unusable_or_obsolete before and after every request), once per mode:
+
+    connect     CONN_MAX_AGE = 0, a new connection per request
+    persistent  CONN_MAX_AGE = 600 with health checks, one connection per thread
+    pool        the EduSmart.db.postgresql_pool backend with `--pool-size` connections shared by all threads
+
+and reports throughput, request latency percentiles, the number of connections opened and the pool counters.
+"""
+import copy
+import statistics
+import threading
+import time
+
+MODES = ('connect', 'persistent', 'pool')
+
+
+def _settings_dict(args, mode):
+    from django.db import connections
+
+    settings_dict = copy.deepcopy(connections['default'].settings_dict)
+    settings_dict.update({
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': args.name,
+        'USER': args.user,
+        'PASSWORD': args.password,
+        'HOST': args.host,
+        'PORT': args.port,
+        'OPTIONS': {},
+        'CONN_MAX_AGE': 0,
+        'CONN_HEALTH_CHECKS': False,
+    })
+    if mode == 'persistent':
+        settings_dict.update({'CONN_MAX_AGE': 600, 'CONN_HEALTH_CHECKS': True})
+    elif mode == 'pool':
+        settings_dict.update({
+            'ENGINE': 'EduSmart.db.postgresql_pool',
+            'POOL': {'MAX_SIZE': args.pool_size, 'IDLE_TIMEOUT': 300, 'WAIT_TIMEOUT': 30},
+        })
+    return settings_dict
+
+
+def _wrapper_class(mode):
+    if mode == 'pool':
+        from EduSmart.db.postgresql_pool.base import DatabaseWrapper
+    else:
+        from django.db.backends.postgresql.base import DatabaseWrapper
+    return DatabaseWrapper
+
+
+def run_mode(args, mode):
+    from django.db.backends.signals import connection_created
+
+    wrapper_class = _wrapper_class(mode)
+    settings_dict = _settings_dict(args, mode)
+    alias = f'benchmark_{mode}'
+    timings = []
+    errors = []
+    opened = [0]
+    lock = threading.Lock()
+    start_barrier = threading.Barrier(args.threads + 1)
+
+    def count_connection(sender, connection, **kwargs):
+        if connection.alias == alias:
+            with lock:
+                opened[0] += 1
+
+    def worker():
+        wrapper = wrapper_class(copy.deepcopy(settings_dict), alias)
+        own_timings = []
+        start_barrier.wait()
+        try:
+            for _ in range(args.requests):
+                start = time.perf_counter()
+                try:
+                    wrapper.close_if_unusable_or_obsolete()  # request_started
+                    with wrapper.cursor() as cursor:
+                        cursor.execute(args.query)
+                        cursor.fetchall()
+                    wrapper.close_if_unusable_or_obsolete()  # request_finished
+                except Exception as e:
+                    errors.append(repr(e))
+                    wrapper.close()
+                own_timings.append((time.perf_counter() - start) * 1000)
+        finally:
+            wrapper.close()
+            with lock:
+                timings.extend(own_timings)
+
+    connection_created.connect(count_connection, weak=False)
+    threads = [threading.Thread(target=worker) for _ in range(args.threads)]
+    try:
+        for thread in threads:
+            thread.start()
+        start_barrier.wait()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        connection_created.disconnect(count_connection)
+
+    percentiles = statistics.quantiles(timings, n=100, method='inclusive')
+    result = {
+        'requests': len(timings),
+        'errors': len(errors),
+        'requests_per_second': round(len(timings) / elapsed, 1),
+        'mean_ms': round(statistics.mean(timings), 2),
+        'p50_ms': round(percentiles[49], 2),
+        'p95_ms': round(percentiles[94], 2),
+        'p99_ms': round(percentiles[98], 2),
+        'django_connects': opened[0],
+    }
+    if mode == 'pool':
+        from EduSmart.db.pool import close_pools, pool_stats
+
+        result['pool'] = {label: stats for label, stats in pool_stats().items() if label.startswith(alias)}
+        close_pools()
+    if errors:
+        result['first_error'] = errors[0]
+    return result
+
+
+def run(args):
+    results = {}
+    for mode in args.modes:
+        results[mode] = run_mode(args, mode)
+        summary = {key: value for key, value in results[mode].items() if key != 'pool'}
+        print(f'{mode:12} {summary}')
+        if 'pool' in results[mode]:
+            print(f'{"":12} pool {results[mode]["pool"]}')
+    return results
@@ -0,0 +1,243 @@
+"""
+Seeded synthetic multi-school dataset for the endpoint benchmarks.
+
+Every row is written with bulk_create, so no signals fire and the whole dataset can be rebuilt in a few
+seconds per school. The same seed always produces the same rows.
+"""
+import datetime
+import random
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+
+from attendance.calendars import rebuild_calendars
+from attendance.kinds import KINDS
+from attendance.rollups import rebuild_rollups
+from authentication.models import User, TeacherUser, StaffUser, StudentUser, TeachersSchedule, TeacherAttendence, \
+    StaffAttendence
+from bus.models import Bus, Route, Stop
+from content.models import Content
+from curriculum.models import Curriculum, Subjects
+from management.models import Fee, DueFeeDetail, Salary
+from student.models import StudentAttendence, ExmaReportCard, StudentMaterial
+from superadmin.models import SchoolProfile, CurricullumList
+from teacher.assignments import backfill_teacher_assignments
+from teacher.schedules import backfill_schedule_slots
+
+PASSWORD = 'benchmark'
+BATCH_SIZE = 5000
+
+CURRICULUMS = ('CBSE', 'ICSE')
+CLASSES = ('1', '2', '3', '4', '5', '6', '7', '8', '9', '10', '11', '12')
+SECTIONS = ('A', 'B', 'C')
+SUBJECTS = ('Maths', 'Science', 'English', 'Hindi', 'History', 'Geography')
+STAFF_ROLES = ('Driver', 'Conductor', 'Boarding', 'Management')
+DAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat')
+MARKS = ('P',) * 17 + ('A', 'A', 'L')
+
+
+def school_days(days, end=None):
+    """
+    The last `days` calendar days up to `end` (today by default) without Sundays, oldest first.
+    """
+    end = end or datetime.date.today()
+    dates = [end - datetime.timedelta(days=offset) for offset in range(days)]
+    return sorted(date for date in dates if date.weekday() != 6)
+
+
+def _create(model, rows):
+    return model.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+
+
+def _users(prefix, school_id, user_type, count, password):
+    return _create(User, [
+        User(email=f'{prefix}{index}@{school_id.lower()}.bench', name=f'{prefix.title()} {index}', password=password,
+             user_type=user_type, school_id=school_id)
+        for index in range(count)
+    ])
+
+
+def build_school(index, students=2000, teachers=200, staff=40, routes=10, days=365, rng=None, password=None):
+    """
+    Create one school with its admin and payroll users, staff, teachers, students, a year of attendance, fees,
+    salaries, report cards, schedules, study material, buses and content. Returns the handles the benchmark
+    and query-budget runs need to authenticate and to address detail endpoints.
+    """
+    rng = rng or random.Random(index)
+    password = password or make_password(PASSWORD)
+    school_id = f'BENCH{index:03d}'
+    dates = school_days(days)
+
+    admin = User.objects.create(email=f'admin@{school_id.lower()}.bench', name=f'Admin {school_id}',
+                                password=password, user_type='admin', school_id=school_id, is_staff=True)
+    SchoolProfile.objects.create(user=admin, school_id=school_id, school_name=f'Benchmark School {index}',
+                                 email=f'school@{school_id.lower()}.bench', city='Pune', state='Maharashtra')
+
+    payroll = User.objects.create(email=f'payroll@{school_id.lower()}.bench', name=f'Payroll {school_id}',
+                                  password=password, user_type='non-teaching', school_id=school_id)
+    payroll_staff = StaffUser.objects.create(user=payroll, first_name='Payroll', last_name=school_id,
+                                             gender='Female', religion='Hindu', role='Payroll Management')
+
+    staff_users = _users('staff', school_id, 'non-teaching', staff, password)
+    staff_rows = _create(StaffUser, [
+        StaffUser(user=user, first_name='Staff', last_name=str(position), gender=rng.choice(('Male', 'Female')),
+                  religion='Hindu', role=STAFF_ROLES[position % len(STAFF_ROLES)], ctc=Decimal(rng.randint(2, 6) * 100000))
+        for position, user in enumerate(staff_users)
+    ]) + [payroll_staff]
+
+    curriculums = _create(Curriculum, [
+        Curriculum(school_id=school_id, curriculum_name=curriculum, select_class=class_name)
+        for curriculum in CURRICULUMS for class_name in CLASSES
+    ])
+    _create(Subjects, [
+        Subjects(curriculum_id=curriculum, primary_subject=subject)
+        for curriculum in curriculums for subject in SUBJECTS
+    ])
+
+    teacher_users = _users('teacher', school_id, 'teacher', teachers, password)
+    teacher_rows = []
+    for position, user in enumerate(teacher_users):
+        details = [{'curriculum': rng.choice(CURRICULUMS), 'class': rng.choice(CLASSES), 'section': rng.choice(SECTIONS),
+                    'subject': rng.choice(SUBJECTS)} for _ in range(rng.randint(1, 4))]
+        teacher_rows.append(TeacherUser(user=user, full_name=user.name, gender=rng.choice(('Male', 'Female')),
+                                        religion='Hindu', blood_group='O+', role='Teacher', highest_qualification='M.Sc',
+                                        experience=rng.randint(1, 20), ctc=Decimal(rng.randint(3, 9) * 100000),
+                                        class_subject_section_details=details))
+    teacher_rows = _create(TeacherUser, teacher_rows)
+
+    route_rows = _create(Route, [Route(school_id=school_id, name=f'{school_id} Route {number}') for number in range(routes)])
+    _create(Stop, [
+        Stop(route=route, name=f'Stop {number}', time=datetime.time(7, number * 5))
+        for route in route_rows for number in range(8)
+    ])
+    drivers = [row for row in staff_rows if row.role == 'Driver'] or staff_rows
+    _create(Bus, [
+        Bus(school_id=school_id, bus_number=f'{school_id}-{number}', driver_name=drivers[number % len(drivers)],
+            bus_route=route, bus_capacity='40')
+        for number, route in enumerate(route_rows)
+    ])
+
+    student_users = _users('student', school_id, 'student', students, password)
+    student_rows = _create(StudentUser, [
+        StudentUser(user=user, name=user.name, gender=rng.choice(('Male', 'Female')), father_occupation='Engineer',
+                    religion='Hindu', curriculum=rng.choice(CURRICULUMS), class_enrolled=rng.choice(CLASSES),
+                    section=rng.choice(SECTIONS), roll_no=f'{school_id}-{position}',
+                    school_fee=Decimal('40000'), total_fee=Decimal('50000'), bus_route=rng.choice(route_rows))
+        for position, user in enumerate(student_users)
+    ])
+
+    _create(StudentAttendence, [
+        StudentAttendence(student=student, school_id=school_id, date=date, mark_attendence=rng.choice(MARKS))
+        for student in student_rows for date in dates
+    ])
+    _create(TeacherAttendence, [
+        TeacherAttendence(teacher=teacher, school_id=school_id, date=date, mark_attendence=rng.choice(MARKS))
+        for teacher in teacher_rows for date in dates
+    ])
+    _create(StaffAttendence, [
+        StaffAttendence(staff=member, school_id=school_id, date=date, mark_attendence=rng.choice(MARKS))
+        for member in staff_rows for date in dates
+    ])
+
+    fees = _create(Fee, [
+        Fee(school_id=school_id, name=student, curriculum=student.curriculum, class_name=student.class_enrolled,
+            payment_type='Quarterly', no_of_instalment=3, instalment_amount=Decimal('16666.67'),
+            school_fee=Decimal('40000'), bus_fee=Decimal('8000'), total_fee=Decimal('50000'))
+        for student in student_rows
+    ])
+    _create(DueFeeDetail, [
+        DueFeeDetail(fee_structure=fee, due_type=f'Instalment {number + 1}', due_amount=Decimal('16666.67'),
+                     last_due_date=datetime.date(dates[-1].year, 1 + number * 4, 10))
+        for fee in fees for number in range(3)
+    ])
+
+    salaried = [(user, 'Teaching', 'Teacher') for user in teacher_users] + \
+               [(row.user, 'Non Teaching', row.role) for row in staff_rows]
+    salaries = _create(Salary, [
+        Salary(school_id=school_id, department=department, designation=designation, name=user, salary_month=month,
+               pan_no='ABCDE1234F', total_salary=Decimal('50000'), basic_salary=Decimal('30000'),
+               net_payable_amount=Decimal('45000'), bank_name='SBI', account_type='Savings', ifsc_code='SBIN0000001',
+               account_number=str(100000 + user.id))
+        for user, department, designation in salaried for month in (1, 2, 3)
+    ])
+
+    _create(ExmaReportCard, [
+        ExmaReportCard(teacher=rng.choice(teacher_rows), school_id=school_id, curriculum=student.curriculum,
+                       class_name=student.class_enrolled, class_section=student.section,
+                       student_name=f'{student.name}-{student.roll_no}',
+                       exam_type=exam_type, exam_month=dates[-1],
+                       marks_grades=[{'subject': subject, 'marks': rng.randint(35, 100)} for subject in SUBJECTS],
+                       total_marks='600', overall_grades=rng.choice(('A', 'B', 'C')), status=1)
+        for student in student_rows for exam_type in ('Half Yearly', 'Final')
+    ])
+
+    _create(TeachersSchedule, [
+        TeachersSchedule(school_id=school_id, teacher=teacher, start_date=dates[0], end_date=dates[-1], schedule_data=[
+            dict(detail, class_timing=f'{9 + number}:00', class_duration='45', lecture_type='Daily',
+                 select_days=list(DAYS))
+            for number, detail in enumerate(teacher.class_subject_section_details)
+        ])
+        for teacher in teacher_rows
+    ])
+
+    _create(StudentMaterial, [
+        StudentMaterial(teacher=teacher, school_id=school_id, subject=rng.choice(SUBJECTS),
+                        class_name=rng.choice(CLASSES), section=rng.choice(SECTIONS), curriculum=rng.choice(CURRICULUMS),
+                        upload_link='https://example.com/material', title=f'Material {teacher.id}',
+                        discription='Benchmark material', upload_content='material.pdf')
+        for teacher in teacher_rows
+    ])
+
+    _create(Content, [
+        Content(school_id=school_id, content_type=rng.choice(('e_book', 'e_video')), content_name=f'Content {number}',
+                curriculum=rng.choice(CURRICULUMS), classes=rng.choice(CLASSES), subject=rng.choice(SUBJECTS),
+                description='Benchmark content', category='class content')
+        for number in range(200)
+    ])
+
+    # The attendance above is bulk created, which bypasses the signals that keep the rollups and calendars in step.
+    rebuild_rollups(KINDS.values(), school_id=school_id)
+    rebuild_calendars(KINDS.values(), school_id=school_id)
+    # Likewise for the schedules and the teachers, whose slots and assignments are otherwise written on save.
+    backfill_schedule_slots(school_id)
+    backfill_teacher_assignments(school_id)
+
+    return {
+        'school_id': school_id,
+        'admin': admin,
+        'payroll': payroll,
+        'teacher': teacher_users[0],
+        'superadmin': None,
+        'student_id': student_rows[0].id,
+        'teacher_id': teacher_rows[0].id,
+        'staff_id': staff_rows[0].id,
+        'fee_id': fees[0].id,
+        'salary_id': salaries[0].id,
+    }
+
+
+def build_dataset(schools=3, students=2000, teachers=200, staff=40, days=365, seed=42):
+    """
+    Create `schools` schools plus a superadmin and the shared superadmin curriculum list and content.
+    """
+    rng = random.Random(seed)
+    password = make_password(PASSWORD)
+    superadmin = User.objects.create(email='superadmin@bench', name='Super Admin', password=password,
+                                     user_type='admin', is_staff=True, is_superuser=True)
+    _create(CurricullumList, [
+        CurricullumList(curriculum_name=curriculum, class_name=class_name)
+        for curriculum in CURRICULUMS for class_name in CLASSES
+    ])
+    _create(Content, [
+        Content(content_type='e_book', content_name=f'Library Book {number}', curriculum=rng.choice(CURRICULUMS),
+                description='Benchmark library content', category='other')
+        for number in range(100)
+    ])
+
+    handles = []
+    for index in range(schools):
+        school = build_school(index, students=students, teachers=teachers, staff=staff, days=days, rng=rng,
+                              password=password)
+        school['superadmin'] = superadmin
+        handles.append(school)
+    return handles
@@ -0,0 +1,27 @@
+"""
+Endpoints driven by the benchmark run: (name, role, path). The path is formatted with the school handles
+returned by benchmarks.dataset.build_school and the role names the handle that authenticates the request.
+"""
+
+ENDPOINTS = (
+    ('student_list', 'admin', '/student/student/list/'),
+    ('student_detail', 'admin', '/student/fetch/student/detail/{student_id}/'),
+    ('student_attendance_filter_list', 'admin', '/student/attendance/filter/list/'),
+    ('teacher_list', 'admin', '/teacher/teacher/list/'),
+    ('teacher_detail', 'admin', '/teacher/fetch/teacher/detail/{teacher_id}/'),
+    ('teacher_schedule_list', 'admin', '/teacher/schedule/list/'),
+    ('teacher_attendance_filter_list', 'admin', '/teacher/attendance/filter/list/'),
+    ('non_teaching_staff_list', 'admin', '/auth/non-teaching-staff/fetch/list/'),
+    ('non_teaching_staff_detail', 'admin', '/auth/non-teaching-staff/fetch/detail/{staff_id}/'),
+    ('bus_list', 'admin', '/bus/bus-list/'),
+    ('bus_route_list', 'admin', '/bus/route/list/'),
+    ('content_list', 'admin', '/content/get-all-data/'),
+    ('fee_list', 'payroll', '/management/fee/list/'),
+    ('fee_detail', 'payroll', '/management/fee/detail/{fee_id}/'),
+    ('salary_detail', 'payroll', '/management/salary/detail/{salary_id}/'),
+    ('management_student_list', 'payroll', '/management/student/list/'),
+    ('management_teacher_list', 'payroll', '/management/teacher/list/'),
+    ('exam_report_card_list', 'payroll', '/management/exam/report/card/'),
+    ('study_material_list', 'teacher', '/auth/study/material/list/'),
+    ('superadmin_curriculum_list', 'superadmin', '/super_admin/curriculum/list/'),
+)
@@ -0,0 +1,45 @@
+"""
+Minimal rows for the feature tests.
+
+Unlike the benchmark dataset, these create only what a test asks for, one row at a time, so the signals of
+the models fire as they do in production.
+"""
+from authentication.models import User, TeacherUser, StaffUser, StudentUser
+from superadmin.models import SchoolProfile
+
+SCHOOL_ID = 'SCHOOL1'
+
+
+def create_admin(school_id=SCHOOL_ID):
+    # The admin owns the SchoolProfile that IsInSameSchool resolves for every user of the school.
+    admin = User.objects.create(email=f'admin@{school_id.lower()}.test', name='Admin', user_type='admin',
+                                school_id=school_id, is_staff=True)
+    SchoolProfile.objects.create(user=admin, school_id=school_id, school_name=f'School {school_id}')
+    return admin
+
+
+def create_teachers(count, school_id=SCHOOL_ID, details=None):
+    return [
+        TeacherUser.objects.create(user=User.objects.create(
+            email=f'teacher{number}@{school_id.lower()}.test', name=f'Teacher {number}', user_type='teacher',
+            school_id=school_id), full_name=f'Teacher {number}', class_subject_section_details=details)
+        for number in range(count)
+    ]
+
+
+def create_staff(count, school_id=SCHOOL_ID):
+    return [
+        StaffUser.objects.create(user=User.objects.create(
+            email=f'staff{number}@{school_id.lower()}.test', name=f'Staff {number}', user_type='non-teaching',
+            school_id=school_id), first_name='Staff', last_name=str(number))
+        for number in range(count)
+    ]
+
+
+def create_students(count, school_id=SCHOOL_ID, class_enrolled='7', section='A', start=0):
+    return [
+        StudentUser.objects.create(user=User.objects.create(
+            email=f'student{number}@{school_id.lower()}.test', name=f'Student {number}', user_type='student',
+            school_id=school_id), name=f'Student {number}', class_enrolled=class_enrolled, section=section)
+        for number in range(start, start + count)
+    ]
@@ -1,3 +1,21 @@
-from django.test import TestCase
+from unittest import expectedFailure
 
-# Create your tests here.
+from benchmarks import budget
+
+
+class BusListQueryBudgetTest(budget.QueryBudgetTestCase):
+    path = '/bus/bus-list/'
+
+    # BusListSerializer follows the driver, route and stops of every bus.
+    @expectedFailure
+    def test_query_count_does_not_grow_with_rows(self):
+        super().test_query_count_does_not_grow_with_rows()
+
+
+class BusRouteListQueryBudgetTest(budget.QueryBudgetTestCase):
+    path = '/bus/route/list/'
+
+    # RouteListSerializer runs Stop.objects.filter three times per route.
+    @expectedFailure
+    def test_query_count_does_not_grow_with_rows(self):
+        super().test_query_count_does_not_grow_with_rows()
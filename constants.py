@@ -139,6 +139,10 @@ class ScheduleMessage:
     SCHEDULE_LIST_MESSAGE = "All schedule fetch successfully."
     SCHEDULE_UPDATED_SUCCESSFULLY = "Teacher schedule updated successfully"
     SCHEDULE_renew_SUCCESSFULLY = "Teacher schedule renew successfully"
+    SCHEDULE_CONFLICTS = "The schedule clashes with other classes."
+    SCHEDULE_HAS_NO_CONFLICTS = "The schedule has no clashes."
+    SCHEDULE_CONFLICTS_FETCHED_SUCCESSFULLY = "Schedule clashes fetched successfully."
+    TEACHER_ASSIGNMENTS_FETCHED_SUCCESSFULLY = "Teacher assignments fetched successfully."
 
 
 class AttendenceMarkedMessage:
@@ -146,6 +150,21 @@ class AttendenceMarkedMessage:
     ATTENDANCE_FETCHED_SUCCESSFULLY = 'Attendance fetched successfully.'
     STUDENT_ATTENDANCE_FETCHED_SUCCESSFULLY = 'Student attendance fetched successfully.'
     ATTENDANCE_UPDATED_SUCCESSFULLY = 'Attendance updated successfully.'
+    INVALID_ATTENDANCE_ENTRIES = 'Attendance was not marked, some entries are invalid.'
+    ATTENDANCE_SUMMARY_FETCHED_SUCCESSFULLY = 'Attendance summary fetched successfully.'
+    INVALID_PERSON_TYPE = 'Invalid type, use student, teacher or staff.'
+    SUMMARY_TARGET_REQUIRED = 'Pass an id, or a class_name for students.'
+    INVALID_EXPORT_FILE_TYPE = 'Invalid file_type, use csv or xlsx.'
+    INVALID_MONTH = 'Invalid month, use 1 to 12.'
+    ABSENCE_FLAGS_FETCHED_SUCCESSFULLY = 'Flagged students fetched successfully.'
+    ATTENDANCE_CALENDAR_FETCHED_SUCCESSFULLY = 'Attendance calendar fetched successfully.'
+    ATTENDANCE_SYNCED_SUCCESSFULLY = 'Attendance operations synced.'
+    INVALID_SYNC_OPERATIONS = 'Pass operations as a list of at most {} items.'
+    WORKING_DAYS_FETCHED_SUCCESSFULLY = 'Working days fetched successfully.'
+    ATTENDANCE_REPORT_FETCHED_SUCCESSFULLY = 'Attendance report fetched successfully.'
+    INVALID_GROUP_BY = 'Invalid group_by, use day, person or class.'
+    INVALID_MARK = 'Invalid mark_attendence, use P, A or L.'
+    CLASS_FILTER_STUDENTS_ONLY = 'class_name, section and group_by=class only apply to students.'
 
 
 class SchoolMessage:
@@ -284,4 +303,10 @@ class FeeMessage:
     FEE_DETAIL_FETCH_SUCCESSFULLY = "Fee detail fetched successfully."
     FEE_DETAIL_NOT_EXIST = "Fee detail does not exist."
     FEE_UPDATED_SUCCESSFULLY = "Fee detail updated successfully."
-    STUDENT_FEE_DETAIL_FETCH_SUCCESSFULLY = "Student fee detail fetch successfully."
\ No newline at end of file
+    STUDENT_FEE_DETAIL_FETCH_SUCCESSFULLY = "Student fee detail fetch successfully."
+
+
+class MetricsMessage:
+    METRICS_FETCHED_SUCCESSFULLY = "Endpoint metrics fetched successfully."
+    METRICS_RESET_SUCCESSFULLY = "Endpoint metrics reset successfully."
+    INVALID_SORT_KEY = "Invalid sort key."
@@ -1,3 +1,51 @@
-from django.test import TestCase
+from django.core.cache import cache
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from benchmarks.factories import create_admin
+from content.models import Content
+
+
+class ContentListCursorPaginationTest(APITestCase):
+    path = '/content/get-all-data/'
+
+    def setUp(self):
+        cache.clear()
+        admin = create_admin('SCHOOL1')
+        self.client.force_authenticate(admin)
+        # More than the default page of 100 rows, and rows of another school that must not be listed.
+        Content.objects.bulk_create([
+            Content(school_id=school_id, content_type='e_book', content_name=f'Content {number}', curriculum='CBSE',
+                    classes='1', subject='Maths', description='', category='class content')
+            for school_id, rows in (('SCHOOL1', 130), ('SCHOOL2', 5)) for number in range(rows)
+        ])
+        self.expected = list(Content.objects.filter(school_id='SCHOOL1').order_by('-id')
+                             .values_list('id', flat=True))
+
+    def test_page_number_envelope_is_unchanged(self):
+        response = self.client.get(self.path)
+        pagination = response.json()['pagination']
+        self.assertEqual(pagination['current_page'], 1)
+        self.assertEqual(pagination['total_pages'], 2)
+
+    def test_cursor_pages_cover_every_row_once_in_both_directions(self):
+        pages = []
+        url = f'{self.path}?pagination=cursor&page_size=30&count=exact'
+        while url:
+            body = self.client.get(url).json()
+            pages.append([row['id'] for row in body['data']])
+            url = body['pagination']['next']
+        self.assertEqual([row for page in pages for row in page], self.expected)
+        self.assertEqual(body['pagination']['total_count'], len(self.expected))
+        self.assertEqual(body['pagination']['total_pages'], len(pages))
+
+        backwards = [pages[-1]]
+        url = body['pagination']['previous']
+        while url:
+            body = self.client.get(url).json()
+            backwards.insert(0, [row['id'] for row in body['data']])
+            url = body['pagination']['previous']
+        self.assertEqual(backwards, pages)
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(f'{self.path}?pagination=cursor&cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 404)
@@ -81,7 +81,7 @@ class ContentListView(generics.ListAPIView):
 
     def list(self, request, *args, **kwargs):
         queryset = self.get_queryset()
-        paginator = self.pagination_class()
+        paginator = self.pagination_class.for_request(request)
         paginated_queryset = paginator.paginate_queryset(queryset, request)
         serializer = ContentListSerializer(paginated_queryset, many=True)
         response_data = {
@@ -89,13 +89,7 @@ class ContentListView(generics.ListAPIView):
             'count': len(serializer.data),
             'message': ContentMessages.CONTENT_FETCHED,
             'data': serializer.data,
-            'pagination': {
-                'page_size': paginator.page_size,
-                'next': paginator.get_next_link(),
-                'previous': paginator.get_previous_link(),
-                'total_pages': paginator.page.paginator.num_pages,
-                'current_page': paginator.page.number,
-            }
+            'pagination': paginator.get_pagination_data(),
         }
         return Response(response_data, status=status.HTTP_200_OK)
     
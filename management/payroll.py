@@ -0,0 +1,57 @@
+"""
+Payroll days read from the attendance rollups and the school's working-day calendar (attendance.workdays)
+instead of being counted from the attendance tables or typed in.
+"""
+import calendar
+import datetime
+
+from attendance.kinds import STAFF, TEACHER
+from attendance.rollups import attendance_summary, current_attendance_summary, empty_summary
+from attendance.workdays import working_days_in_month
+
+SALARY_DAY_FIELDS = ('master_days', 'total_working_days', 'leave_days')
+
+
+def salary_year(month, today=None):
+    """
+    The year of the latest `month` that is not after today, the one a salary of that month is paid for.
+    """
+    today = today or datetime.date.today()
+    return today.year if month <= today.month else today.year - 1
+
+
+def current_monthly_attendance(kind, person, summaries=None):
+    """
+    '<present days>/<working days>' of `person` this month, or None when they were not present. `summaries`
+    are the attendance summaries of a whole page, when the caller has them.
+    """
+    today = datetime.date.today()
+    if summaries is not None:
+        summary = summaries.get(person.id) or empty_summary(today.year)
+    else:
+        summary = current_attendance_summary(kind, person.id)
+    present = summary['months'][today.month - 1]['present']
+    if not present:
+        return None
+    return f'{present}/{working_days_in_month(person.user.school_id, today.year, today.month)}'
+
+
+def salary_days(school_id, user, month, year=None):
+    """
+    Master, working and leave days of the salary of `user` (a teacher or staff member) for `month` of `year`
+    (see salary_year): the days of the month, the working days of the school in it and the days the person was
+    marked on leave.
+    """
+    year = year or salary_year(month)
+    leave = 0
+    for kind in (TEACHER, STAFF):
+        person_id = kind.person_model.objects.filter(user=user).values_list('id', flat=True).first()
+        if person_id is not None:
+            summary = attendance_summary(kind, [person_id], year).get(person_id)
+            leave = summary['months'][month - 1]['leave'] if summary else 0
+            break
+    return {
+        'master_days': calendar.monthrange(year, month)[1],
+        'total_working_days': working_days_in_month(school_id, year, month),
+        'leave_days': leave,
+    }
@@ -1,18 +1,19 @@
 import re
-from calendar import monthrange
-from datetime import datetime
 import logging
 
 from rest_framework import serializers
 
 from EduSmart import settings
+from attendance.kinds import STAFF, TEACHER
 from authentication.models import StaffUser, Certificate, TimeTable, TeacherUser, StudentUser, User, TeacherAttendence, \
     StaffAttendence
+from authentication.tenant import get_school, get_school_from_context
 from constants import ATTENDENCE_CHOICE
 from curriculum.models import Curriculum
 from management.models import Salary, SalaryFormat, Fee, FeeFormat, DueFeeDetail, Meal
+from management.payroll import SALARY_DAY_FIELDS, current_monthly_attendance, salary_days
 from student.models import ExmaReportCard, StudentAttendence
-from superadmin.models import SchoolProfile
+from teacher.assignments import class_teachers
 from teacher.serializers import CertificateSerializer
 
 
@@ -67,28 +68,28 @@ class ManagementProfileSerializer(serializers.ModelSerializer):
         return obj.user.school_id
 
     def get_school_name(self, obj):
-        school = SchoolProfile.objects.get(school_id=obj.user.school_id)
+        school = get_school_from_context(self.context, obj.user.school_id)
         if school:
             return school.school_name
         else:
             None
 
     def get_school_website(self, obj):
-        school = SchoolProfile.objects.get(school_id=obj.user.school_id)
+        school = get_school_from_context(self.context, obj.user.school_id)
         if school:
             return school.school_website
         else:
             None
 
     def get_school_address(self, obj):
-        school = SchoolProfile.objects.get(school_id=obj.user.school_id)
+        school = get_school_from_context(self.context, obj.user.school_id)
         if school:
             return school.address
         else:
             None
 
     def get_school_about(self, obj):
-        school = SchoolProfile.objects.get(school_id=obj.user.school_id)
+        school = get_school_from_context(self.context, obj.user.school_id)
         if school:
             return school.description
         else:
@@ -216,8 +217,7 @@ class StudentReportCardSerializer(serializers.ModelSerializer):
         if obj.student_name:
             _, roll_no = self.split_student_data(obj.student_name)
             student = StudentUser.objects.get(roll_no=roll_no)
-            teacher = TeacherUser.objects.filter(class_subject_section_details__0__curriculum=student.curriculum,
-                                                 class_subject_section_details__0__class=student.class_enrolled).first()
+            teacher = class_teachers(obj.school_id, student.class_enrolled, curriculum=student.curriculum).first()
             if teacher:
                 return teacher.full_name
         else:
@@ -253,7 +253,7 @@ class StudentReportCardSerializer(serializers.ModelSerializer):
 class AddSalarySerializer(serializers.ModelSerializer):
     department = serializers.CharField(required=True)
     designation = serializers.CharField(required=True)
-    salary_month = serializers.IntegerField(required=True)
+    salary_month = serializers.IntegerField(required=True, min_value=1, max_value=12)
     pan_no = serializers.CharField(required=True)
     total_salary = serializers.DecimalField(max_digits=16, decimal_places=2, required=True)
     in_hand_salary = serializers.DecimalField(max_digits=16, decimal_places=2, required=True)
@@ -273,9 +273,10 @@ class AddSalarySerializer(serializers.ModelSerializer):
     account_number = serializers.CharField(required=True)
     field_name = serializers.ListField(child=serializers.CharField(), required=False)
     field_amount = serializers.ListField(child=serializers.CharField(), required=False)
-    master_days = serializers.IntegerField(required=True)
-    total_working_days = serializers.IntegerField(required=True)
-    leave_days = serializers.IntegerField(required=True)
+    # Taken from the school's working-day calendar and the attendance of the month when left out.
+    master_days = serializers.IntegerField(required=False)
+    total_working_days = serializers.IntegerField(required=False)
+    leave_days = serializers.IntegerField(required=False)
 
     class Meta:
         model = Salary
@@ -291,6 +292,10 @@ class AddSalarySerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         field_name_data = validated_data.pop('field_name', [])
         field_amount_data = validated_data.pop('field_amount', [])
+        if any(field not in validated_data for field in SALARY_DAY_FIELDS):
+            days = salary_days(validated_data.get('school_id'), validated_data['name'], validated_data['salary_month'])
+            for field in SALARY_DAY_FIELDS:
+                validated_data.setdefault(field, days[field])
 
         salary_structure = Salary.objects.create(**validated_data)
 
@@ -347,7 +352,7 @@ class SalaryDetailSerializer(serializers.ModelSerializer):
         try:
             teaching_staff = TeacherUser.objects.get(user=obj.name)
             user = User.objects.get(id=teaching_staff.user.id)
-            school = SchoolProfile.objects.get(school_id=user.school_id)
+            school = get_school(user.school_id)
             return f"{school.school_name} {school.city} {school.state}"
         except TeacherUser.DoesNotExist:
             pass
@@ -355,7 +360,7 @@ class SalaryDetailSerializer(serializers.ModelSerializer):
         try:
             non_teaching_staff = StaffUser.objects.get(user=obj.name)
             user = User.objects.get(id=non_teaching_staff.user.id)
-            school = SchoolProfile.objects.get(school_id=user.school_id)
+            school = get_school(user.school_id)
             return f"{school.school_name} {school.city} {school.state}"
         except StaffUser.DoesNotExist:
             pass
@@ -692,7 +697,7 @@ class FeeDetailSerializer(serializers.ModelSerializer):
         if obj.name:
             student = StudentUser.objects.get(user=obj.name.user)
             user = User.objects.get(id=student.user.id)
-            school = SchoolProfile.objects.get(school_id=user.school_id)
+            school = get_school(user.school_id)
             return f"{school.school_name} {school.city} {school.state}"
         else:
             None
@@ -830,7 +835,7 @@ class StudentDetailSerializer(serializers.ModelSerializer):
         if obj.name:
             student = StudentUser.objects.get(user=obj.user)
             user = User.objects.get(id=student.user.id)
-            school = SchoolProfile.objects.get(school_id=user.school_id)
+            school = get_school(user.school_id)
             return f"{school.school_name} {school.city} {school.state}"
         else:
             None
@@ -942,21 +947,7 @@ class TeacherListsSerializer(serializers.ModelSerializer):
         return None
 
     def get_attendance(self, obj):
-        current_date = datetime.now()
-        year = current_date.year
-        month = current_date.month
-        start_date = current_date.replace(day=1)
-        end_date = current_date.replace(day=monthrange(current_date.year, current_date.month)[1])
-
-        attendance = TeacherAttendence.objects.filter(teacher=obj, date__range=(start_date, end_date),
-                                                      mark_attendence='P')
-        data = []
-
-        if attendance:
-            for teacher_attendance in attendance:
-                data.append(teacher_attendance.mark_attendence)
-            return f'{len(data)}/{monthrange(year, month)[1]}'
-        return None
+        return current_monthly_attendance(TEACHER, obj, self.context.get('attendance_summaries'))
 
 
 class TeacherFeeDetailSerializer(serializers.ModelSerializer):
@@ -995,7 +986,7 @@ class TeacherFeeDetailSerializer(serializers.ModelSerializer):
     def get_institute_name(self, obj):
         teaching_staff = TeacherUser.objects.get(user=obj.user)
         user = User.objects.get(id=teaching_staff.user.id)
-        school = SchoolProfile.objects.get(school_id=user.school_id)
+        school = get_school(user.school_id)
         return f"{school.school_name} {school.city} {school.state}"
 
     def get_department(self, obj):
@@ -1019,21 +1010,7 @@ class TeacherFeeDetailSerializer(serializers.ModelSerializer):
         return teaching_staff.leave_days
 
     def get_attendance(self, obj):
-        current_date = datetime.now()
-        year = current_date.year
-        month = current_date.month
-        start_date = current_date.replace(day=1)
-        end_date = current_date.replace(day=monthrange(current_date.year, current_date.month)[1])
-
-        attendance = TeacherAttendence.objects.filter(teacher=obj, date__range=(start_date, end_date),
-                                                      mark_attendence='P')
-        data = []
-
-        if attendance:
-            for teacher_attendance in attendance:
-                data.append(teacher_attendance.mark_attendence)
-            return f'{len(data)}/{monthrange(year, month)[1]}'
-        return None
+        return current_monthly_attendance(TEACHER, obj, self.context.get('attendance_summaries'))
 
     def get_designation(self, obj):
         teaching_staff = Salary.objects.get(name=obj.user)
@@ -1116,20 +1093,7 @@ class StaffListsSerializer(serializers.ModelSerializer):
         return None
 
     def get_attendance(self, obj):
-        current_date = datetime.now()
-        year = current_date.year
-        month = current_date.month
-        start_date = current_date.replace(day=1)
-        end_date = current_date.replace(day=monthrange(current_date.year, current_date.month)[1])
-
-        attendance = StaffAttendence.objects.filter(staff=obj, date__range=(start_date, end_date), mark_attendence='P')
-        data = []
-
-        if attendance:
-            for staff_attendance in attendance:
-                data.append(staff_attendance.mark_attendence)
-            return f'{len(data)}/{monthrange(year, month)[1]}'
-        return None
+        return current_monthly_attendance(STAFF, obj, self.context.get('attendance_summaries'))
 
 
 class TeacherUserSalaryUpdateSerializer(serializers.ModelSerializer):
@@ -1180,7 +1144,7 @@ class StaffFeeDetailSerializer(serializers.ModelSerializer):
     def get_institute_name(self, obj):
         teaching_staff = StaffUser.objects.get(user=obj.user)
         user = User.objects.get(id=teaching_staff.user.id)
-        school = SchoolProfile.objects.get(school_id=user.school_id)
+        school = get_school(user.school_id)
         return f"{school.school_name} {school.city} {school.state}"
 
     def get_department(self, obj):
@@ -1204,20 +1168,7 @@ class StaffFeeDetailSerializer(serializers.ModelSerializer):
         return teaching_staff.leave_days
 
     def get_attendance(self, obj):
-        current_date = datetime.now()
-        year = current_date.year
-        month = current_date.month
-        start_date = current_date.replace(day=1)
-        end_date = current_date.replace(day=monthrange(current_date.year, current_date.month)[1])
-
-        attendance = StaffAttendence.objects.filter(staff=obj, date__range=(start_date, end_date), mark_attendence='P')
-        data = []
-
-        if attendance:
-            for teacher_attendance in attendance:
-                data.append(teacher_attendance.mark_attendence)
-            return f'{len(data)}/{monthrange(year, month)[1]}'
-        return None
+        return current_monthly_attendance(STAFF, obj, self.context.get('attendance_summaries'))
 
     def get_designation(self, obj):
         teaching_staff = Salary.objects.get(name=obj.user)
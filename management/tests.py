@@ -1,3 +1,18 @@
-from django.test import TestCase
+from unittest import expectedFailure
 
-# Create your tests here.
+from benchmarks import budget
+
+
+class FeeListQueryBudgetTest(budget.QueryBudgetTestCase):
+    path = '/management/fee/list/'
+    role = 'payroll'
+
+    # FeeListSerializer loads the StudentUser of every fee row twice.
+    @expectedFailure
+    def test_query_count_does_not_grow_with_rows(self):
+        super().test_query_count_does_not_grow_with_rows()
+
+
+class ExamReportCardListQueryBudgetTest(budget.QueryBudgetTestCase):
+    path = '/management/exam/report/card/'
+    role = 'payroll'
@@ -1,7 +1,176 @@
+import base64
+import json
+import math
+from functools import reduce
+
+from django.db import connections
+from django.db.models import Q
 from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
 
 class CustomPagination(pagination.PageNumberPagination):
     page_size = 100
     page_size_query_param = 'page_size'
     max_page_size = 300
-    page_query_param = 'p'
\ No newline at end of file
+    page_query_param = 'p'
+    mode_query_param = 'pagination'
+
+    @classmethod
+    def for_request(cls, request, ordering=('-id',)):
+        """
+        Return a KeysetPagination over `ordering` when the request opts in with ?pagination=cursor,
+        otherwise the page-number paginator.
+        """
+        if request.query_params.get(cls.mode_query_param) == 'cursor':
+            return KeysetPagination(ordering)
+        return cls()
+
+    def get_pagination_data(self):
+        return {
+            'page_size': self.page_size,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'total_pages': self.page.paginator.num_pages,
+            'current_page': self.page.number,
+        }
+
+
+def estimate_count(queryset):
+    """
+    Row count of the queryset from the PostgreSQL planner estimate; other backends fall back to COUNT(*).
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class KeysetPagination(pagination.BasePagination):
+    """
+    Keyset (cursor) pagination: each page continues strictly after the ordering values of the last row of
+    the previous one, so there is no OFFSET and no COUNT(*). The last ordering field must be unique (id)
+    and every field must be a non-null concrete field of the model. `next`/`previous` carry an opaque
+    cursor; ?count=estimate or ?count=exact adds a total count.
+    """
+    page_size = CustomPagination.page_size
+    page_size_query_param = CustomPagination.page_size_query_param
+    max_page_size = CustomPagination.max_page_size
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    invalid_cursor_message = 'Invalid cursor.'
+
+    def __init__(self, ordering=('-id',)):
+        self.ordering = tuple(ordering)
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(page_size, self.max_page_size) if page_size > 0 else self.page_size
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            position, reverse = cursor['p'], bool(cursor['r'])
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, position, reverse):
+        cursor = json.dumps({'p': position, 'r': reverse}, separators=(',', ':'))
+        encoded = base64.urlsafe_b64encode(cursor.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    @staticmethod
+    def _field_name(field):
+        return field.lstrip('-')
+
+    def _position(self, row):
+        position = []
+        for field in self.ordering:
+            value = getattr(row, self._field_name(field))
+            position.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        return position
+
+    def _after(self, ordering, position):
+        # (a, b) after (x, y) in ordering (-a, -b)  <=>  a < x OR (a = x AND b < y)
+        conditions = []
+        for index, field in enumerate(ordering):
+            equal = {self._field_name(name): value for name, value in zip(ordering[:index], position[:index])}
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            conditions.append(Q(**equal, **{f'{self._field_name(field)}__{lookup}': position[index]}))
+        return reduce(lambda left, right: left | right, conditions)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = remove_query_param(request.build_absolute_uri(), self.cursor_query_param)
+        self.page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+
+        count_mode = request.query_params.get(self.count_query_param)
+        if count_mode == 'estimate':
+            self.count = estimate_count(queryset)
+        elif count_mode == 'exact':
+            self.count = queryset.count()
+        else:
+            self.count = None
+
+        reverse = cursor is not None and cursor[1]
+        ordering = tuple(field[1:] if field.startswith('-') else f'-{field}' for field in self.ordering) \
+            if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if cursor is not None:
+            queryset = queryset.filter(self._after(ordering, cursor[0]))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.next_position = self.previous_position = None
+        if rows:
+            if has_more or reverse:
+                self.next_position = self._position(rows[-1])
+            if cursor is not None and (has_more or not reverse):
+                self.previous_position = self._position(rows[0])
+        elif cursor is not None:
+            # Walked past either end: offer the way back from the position we were given.
+            if reverse:
+                self.next_position = cursor[0]
+            else:
+                self.previous_position = cursor[0]
+        return rows
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        return self.encode_cursor(self.next_position, False)
+
+    def get_previous_link(self):
+        if self.previous_position is None:
+            return None
+        return self.encode_cursor(self.previous_position, True)
+
+    def get_pagination_data(self):
+        return {
+            'page_size': self.page_size,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'total_pages': math.ceil(self.count / self.page_size) if self.count is not None else None,
+            'current_page': None,
+            'total_count': self.count,
+        }
@@ -0,0 +1,54 @@
+import msgpack
+import orjson
+import phonenumbers
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_encoder = JSONEncoder()
+
+
+def encode_default(obj):
+    """
+    Fallback for the types orjson and msgpack do not encode themselves. Everything but phone numbers is encoded
+    the way DRF's JSONEncoder does it, so Decimal becomes a number (COERCE_DECIMAL_TO_STRING is False), datetime
+    an ISO 8601 string ending in Z for UTC, and date and time ISO 8601 strings.
+    """
+    if isinstance(obj, phonenumbers.PhoneNumber):
+        # phonenumber_field's PhoneNumber formats itself with PHONENUMBER_DEFAULT_FORMAT.
+        if type(obj) is phonenumbers.PhoneNumber:
+            return phonenumbers.format_number(obj, phonenumbers.PhoneNumberFormat.E164)
+        return str(obj)
+    return _encoder.default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Drop-in replacement for JSONRenderer on top of orjson. Dates and times are passed through to encode_default
+    so the output matches the stdlib renderer.
+    """
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        options = self.options
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+        ret = orjson.dumps(data, default=encode_default, option=options)
+        # Same as JSONRenderer: U+2028 and U+2029 are valid JSON but break JavaScript string literals.
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    MessagePack responses for clients sending Accept: application/msgpack (or ?format=msgpack).
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=encode_default, use_bin_type=True, datetime=False)
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.10 on 2026-10-17 05:00
+
+from django.db import migrations, models
+
+from attendance.storage import backfill_school_ids, dedupe, normalize_marks
+
+ATTENDANCE_MODELS = [('StudentAttendence', 'student')]
+
+
+def prepare_attendance(apps, schema_editor):
+    """
+    Fill in school_id, rewrite the marks to their letter and drop duplicated days, so that the next migration
+    can shorten mark_attendence and add the (person, date) unique constraint.
+    """
+    for model_name, person_field in ATTENDANCE_MODELS:
+        model = apps.get_model('student', model_name)
+        backfill_school_ids(model, person_field)
+        _, unknown = normalize_marks(model)
+        if unknown:
+            raise ValueError(f'{model_name} has marks outside of P, A and L: {unknown}. '
+                             f'Correct them before migrating.')
+        dedupe(model, person_field)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student', '0025_alter_studentmaterial_upload_content'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentattendence',
+            name='school_id',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.RunPython(prepare_attendance, migrations.RunPython.noop),
+    ]
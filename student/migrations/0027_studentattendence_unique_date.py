@@ -0,0 +1,26 @@
+# Generated by Django 4.2.10 on 2026-10-17 05:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student', '0026_studentattendence_school_id'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='studentattendence',
+            name='mark_attendence',
+            field=models.CharField(choices=[('P', 'present'), ('A', 'Absent'), ('L', 'On_leave')], max_length=1),
+        ),
+        migrations.AlterUniqueTogether(
+            name='studentattendence',
+            unique_together={('student', 'date')},
+        ),
+        migrations.AddIndex(
+            model_name='studentattendence',
+            index=models.Index(fields=['school_id', 'date'], name='student_stu_school__27003b_idx'),
+        ),
+    ]
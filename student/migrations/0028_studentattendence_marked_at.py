@@ -0,0 +1,18 @@
+# Generated by Django 4.2.10 on 2026-10-17 05:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('student', '0027_studentattendence_unique_date'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentattendence',
+            name='marked_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
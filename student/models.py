@@ -3,6 +3,7 @@ from django.utils import timezone
 
 from EduSmart import storage_backends
 from authentication.models import StudentUser, TeacherUser
+from constants import ATTENDENCE_CHOICE
 
 
 # Create your models here.
@@ -10,8 +11,14 @@ from authentication.models import StudentUser, TeacherUser
 
 class StudentAttendence(models.Model):
     student = models.ForeignKey(StudentUser, on_delete=models.CASCADE)
+    school_id = models.CharField(max_length=255, null=True, blank=True)  # copy of student.user.school_id
     date = models.DateField()
-    mark_attendence = models.CharField(max_length=100)
+    mark_attendence = models.CharField(max_length=1, choices=ATTENDENCE_CHOICE)
+    marked_at = models.DateTimeField(null=True, blank=True)  # when the mark was made, see attendance.sync
+
+    class Meta:
+        unique_together = ('student', 'date')
+        indexes = [models.Index(fields=['school_id', 'date'])]
 
 
 class ExmaReportCard(models.Model):
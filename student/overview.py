@@ -0,0 +1,85 @@
+"""
+Class overview of the admin home screen.
+
+Strength, class teacher and the day's present and absent counts of every class-section of a school, computed
+with one grouped query per table instead of a handful of queries per section. The result is cached for
+CLASS_OVERVIEW_CACHE_TIMEOUT seconds and dropped whenever student attendance of that school and day is written.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Q
+
+from authentication.models import StudentUser, TeacherAssignment
+from curriculum.models import Curriculum
+from student.models import StudentAttendence
+
+CLASS_OVERVIEW_CACHE_KEY = 'class-overview:{}:{}'
+
+
+def _class_teachers(school_id):
+    """
+    The class teacher of each (class, section), i.e. the first active teacher whose own class (see
+    teacher.assignments) is that section, with its curriculum.
+    """
+    teachers = {}
+    rows = TeacherAssignment.objects.filter(school_id=school_id, is_class_teacher=True,
+                                            teacher__user__is_active=True).order_by('teacher_id').values(
+        'class_name', 'section', 'curriculum', full_name=F('teacher__full_name'))
+    for row in rows:
+        teachers.setdefault((row['class_name'], row['section']), row)
+    return teachers
+
+
+def build_class_overview(school_id, date):
+    """
+    One row per class-section of `school_id` that has students in a class of its curriculum, ordered by class
+    and section, in four queries whatever the number of sections.
+    """
+    class_names = Curriculum.objects.filter(school_id=school_id).values('select_class')
+    strength = StudentUser.objects.filter(user__school_id=school_id, class_enrolled__in=class_names).values(
+        'class_enrolled', 'section').annotate(student_count=Count('id')).order_by('class_enrolled', 'section')
+    attendance = {
+        (row['student__class_enrolled'], row['student__section']): row
+        for row in StudentAttendence.objects.filter(date=date, school_id=school_id).values(
+            'student__class_enrolled', 'student__section').annotate(
+            total_present=Count('id', filter=Q(mark_attendence='P')),
+            total_absent=Count('id', filter=Q(mark_attendence='A'))).order_by()
+    }
+    teachers = _class_teachers(school_id)
+
+    overview = []
+    for row in strength:
+        key = (row['class_enrolled'], row['section'])
+        teacher = teachers.get(key, {})
+        marks = attendance.get(key, {})
+        overview.append({
+            'curriculum': teacher.get('curriculum'),
+            'class_name': row['class_enrolled'],
+            'section': row['section'],
+            'class_teacher': teacher.get('full_name'),
+            'class_strength': row['student_count'],
+            'total_present': marks.get('total_present', 0),
+            'total_absent': marks.get('total_absent', 0),
+        })
+    return overview
+
+
+def get_class_overview(school_id, date):
+    """
+    build_class_overview served from the cache when CLASS_OVERVIEW_CACHE_TIMEOUT is set.
+    """
+    if not settings.CLASS_OVERVIEW_CACHE_TIMEOUT:
+        return build_class_overview(school_id, date)
+    key = CLASS_OVERVIEW_CACHE_KEY.format(school_id, date)
+    overview = cache.get(key)
+    if overview is None:
+        overview = build_class_overview(school_id, date)
+        cache.set(key, overview, settings.CLASS_OVERVIEW_CACHE_TIMEOUT)
+    return overview
+
+
+def invalidate_class_overview(school_id, *dates):
+    """
+    Drop the cached overviews of `school_id` for `dates`, called whenever student attendance is written.
+    """
+    cache.delete_many([CLASS_OVERVIEW_CACHE_KEY.format(school_id, date) for date in dates if school_id])
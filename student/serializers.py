@@ -5,6 +5,8 @@ from django.core.validators import RegexValidator
 from rest_framework import serializers
 
 from EduSmart import settings
+from attendance.kinds import STUDENT
+from attendance.rollups import current_attendance_summary, empty_summary
 from authentication.models import StudentUser, User, TimeTable, TeacherUser, ClassEvent, DayReview
 from authentication.serializers import AddressDetailsSerializer, CustomTimeField
 from bus.models import Route, Bus
@@ -13,6 +15,7 @@ from constants import USER_TYPE_CHOICES, GENDER_CHOICES, RELIGION_CHOICES, CLASS
 from content.models import Content
 from curriculum.models import Curriculum, Subjects
 from student.models import StudentAttendence, ExmaReportCard, StudentMaterial, ZoomLink, ConnectWithTeacher
+from teacher.assignments import class_teachers
 
 
 class StudentUserSignupSerializer(serializers.Serializer):
@@ -299,22 +302,21 @@ class StudentAttendanceListSerializer(serializers.ModelSerializer):
         fields = ['student', 'mark_attendence', 'percentage', 'total_attendance']
 
 
+    def get_summary(self, obj):
+        # The views pass the summaries of the whole page so that a row does not cost a query.
+        summaries = self.context.get('attendance_summaries')
+        if summaries is not None:
+            return summaries.get(obj.student_id) or empty_summary(datetime.date.today().year)
+        return current_attendance_summary(STUDENT, obj.student_id)
+
     def get_percentage(self, obj):
-        year = datetime.date.today().year
-        total_attendance = StudentAttendence.objects.filter(date__year=year,
-            mark_attendence='P').count()
-        total_school_days = 365
-        attendence_percentage = (total_attendance / total_school_days) * 100
-        return f"{round(attendence_percentage)}%"
+        return f"{self.get_summary(obj)['percentage']}%"
 
     def get_student(self, obj):
         return obj.student
 
     def get_total_attendance(self, obj):
-        year = datetime.date.today().year
-        total_attendance = StudentAttendence.objects.filter(
-            student=obj.student.id, date__year=year, mark_attendence__in=['A', 'P', 'L']).count()
-        return total_attendance
+        return self.get_summary(obj)['marked']
 
 
 class StudentListBySectionSerializer(serializers.ModelSerializer):
@@ -460,7 +462,7 @@ class StudentReportCardListSerializer(serializers.ModelSerializer):
     def get_teacher_name(self, obj):
         class_name = obj.class_name
         if class_name:
-            teacher = TeacherUser.objects.filter(class_subject_section_details__0__class=class_name).first()
+            teacher = class_teachers(obj.school_id, class_name).first()
             if teacher:
                 return teacher.full_name
         return None
@@ -566,15 +568,9 @@ class StudentDayReviewDetailSerializer(serializers.ModelSerializer):
         subject = obj.subject
 
         # Filter TeacherUser objects based on the provided criteria
-        teacher_data = TeacherUser.objects.filter(class_subject_section_details__0__class=class_name,
-                                                  class_subject_section_details__0__section=section,
-                                                  class_subject_section_details__0__curriculum=curriculum,
-                                                  class_subject_section_details__0__subject=subject)
-
-        if teacher_data.exists():
-            return teacher_data[0].full_name
-        else:
-            return None
+        teacher_data = class_teachers(obj.school_id, class_name, section=section, curriculum=curriculum,
+                                      subject=subject)
+        return teacher_data.values_list('full_name', flat=True).first()
 
 
 class StudentSubjectListSerializer(serializers.ModelSerializer):
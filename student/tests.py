@@ -1,3 +1,87 @@
-from django.test import TestCase
+import json
+from unittest import expectedFailure
 
-# Create your tests here.
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from authentication.models import StudentUser, TeacherUser, User
+from benchmarks import budget
+from benchmarks.factories import create_admin
+from curriculum.models import Curriculum
+from student.models import StudentAttendence
+
+
+class StudentListQueryBudgetTest(budget.QueryBudgetTestCase):
+    path = '/student/student/list/'
+
+    # StudentListSerializer reads obj.user for every student.
+    @expectedFailure
+    def test_query_count_does_not_grow_with_rows(self):
+        super().test_query_count_does_not_grow_with_rows()
+
+
+@override_settings(CLASS_OVERVIEW_CACHE_TIMEOUT=0)
+class ClassOverviewQueryBudgetTest(budget.QueryBudgetTestCase):
+    path = '/student/class/student/list/'
+
+
+class ClassOverviewTest(APITestCase):
+    path = '/student/class/student/list/'
+
+    def setUp(self):
+        cache.clear()
+        self.school_id = 'SCHOOL1'
+        self.admin = self.create_school(self.school_id)
+        self.create_school('SCHOOL2')
+        self.teacher = User.objects.create(email='teacher@school1.test', name='Teacher', user_type='teacher',
+                                           school_id=self.school_id)
+        TeacherUser.objects.create(user=self.teacher, full_name='Teacher')
+        self.client.force_authenticate(self.admin)
+
+    def create_school(self, school_id):
+        # Students in two sections of class 1 and in class 2, every other one marked today.
+        admin = create_admin(school_id)
+        for class_name in ('1', '2'):
+            Curriculum.objects.create(school_id=school_id, curriculum_name='CBSE', select_class=class_name)
+        today = timezone.now().date()
+        for number, (class_name, section) in enumerate([('1', 'A')] * 3 + [('1', 'B')] * 2 + [('2', 'A')] * 3):
+            user = User.objects.create(email=f'student{number}@{school_id.lower()}.test', name=f'Student {number}',
+                                       user_type='student', school_id=school_id)
+            student = StudentUser.objects.create(user=user, name=user.name, class_enrolled=class_name,
+                                                 section=section)
+            if number % 2:
+                StudentAttendence.objects.create(student=student, date=today,
+                                                 mark_attendence='P' if number % 4 == 1 else 'A')
+        return admin
+
+    def test_counts_only_the_school_of_the_user(self):
+        today = timezone.now().date()
+        rows = self.client.get(self.path).json()['data']
+
+        students = StudentUser.objects.filter(user__school_id=self.school_id)
+        self.assertEqual(sum(row['class_strength'] for row in rows), students.count())
+        attendance = StudentAttendence.objects.filter(date=today, student__in=students)
+        self.assertEqual(sum(row['total_present'] for row in rows), attendance.filter(mark_attendence='P').count())
+        self.assertEqual(sum(row['total_absent'] for row in rows), attendance.filter(mark_attendence='A').count())
+
+    def test_attendance_writes_drop_the_cached_overview(self):
+        student = StudentUser.objects.filter(user__school_id=self.school_id).first()
+        today = timezone.now().date()
+        StudentAttendence.objects.filter(student=student, date=today).delete()
+
+        def present():
+            rows = self.client.get(self.path).json()['data']
+            return next(row['total_present'] for row in rows
+                        if (row['class_name'], row['section']) == (student.class_enrolled, student.section))
+
+        before = present()
+        self.client.force_authenticate(self.teacher)
+        entries = [{'id': student.id, 'date': str(today), 'mark_attendence': 'P'}]
+        self.client.post('/student/mobile/attendance/create/', {'data': json.dumps(entries)})
+        self.client.force_authenticate(self.admin)
+        self.assertEqual(present(), before + 1)
+
+        StudentAttendence.objects.get(student=student, date=today).delete()
+        self.assertEqual(present(), before)
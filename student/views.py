@@ -1,12 +1,10 @@
 import calendar
 import datetime
 import json
-from collections import defaultdict
 
 from django.core.mail import send_mail
 from django.db import IntegrityError
-from django.db.models import Count, Q
-from django.shortcuts import get_object_or_404
+from django.db.models import Count, F, Q
 from django.utils import timezone
 from rest_framework import status, generics, permissions
 from rest_framework.exceptions import ValidationError
@@ -14,8 +12,12 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from EduSmart import settings
+from EduSmart.db.replica import ReplicaReadMixin
+from attendance.kinds import STUDENT
+from attendance.marking import mark_attendance
+from attendance.rollups import attendance_summary, current_attendance_summary
 from authentication.models import User, Class, AddressDetails, StudentUser, TeacherUser, TimeTable, ClassEvent, \
-    DayReview, TeachersSchedule, Availability
+    DayReview, ScheduleSlot, Availability
 from authentication.permissions import IsSuperAdminUser, IsAdminUser, IsStudentUser, IsTeacherUser, IsInSameSchool, \
     IsAdminOrIsStaffAndInSameSchool
 from authentication.serializers import ClassEventDetailSerializer
@@ -31,15 +33,15 @@ from pagination import CustomPagination
 from student.models import StudentAttendence, ExmaReportCard, StudentMaterial, ZoomLink, ConnectWithTeacher
 from student.serializers import StudentUserSignupSerializer, StudentDetailSerializer, StudentListSerializer, \
     studentProfileSerializer, StudentAttendanceDetailSerializer, \
-    StudentAttendanceListSerializer, StudentListBySectionSerializer, StudentAttendanceCreateSerializer, \
+    StudentAttendanceListSerializer, StudentListBySectionSerializer, \
     AdminClassListSerializer, AdminOptionalSubjectListSerializer, StudentAttendanceSerializer, \
     StudentTimeTableListSerializer, StudentReportCardListSerializer, StudentStudyMaterialListSerializer, \
     StudentZoomLinkSerializer, StudentContentListSerializer, StudentClassEventListSerializer, \
     StudentDayReviewDetailSerializer, ConnectWithTeacherSerializer, StudentSubjectListSerializer, ChatHistorySerializer, \
     StudentUserAttendanceListSerializer
+from student.overview import get_class_overview
 from teacher.serializers import StudentChatRequestMessageSerializer
-from utils import create_response_data, create_response_list_data, get_student_total_attendance, \
-    get_student_total_absent, get_student_attendence_percentage, generate_random_password
+from utils import create_response_data, create_response_list_data, generate_random_password
 from pytz import timezone as pytz_timezone
 
 class StudentUserCreateView(APIView):
@@ -314,7 +316,7 @@ class StudentUpdateProfileView(APIView):
             return Response(response_data, status=status.HTTP_404_NOT_FOUND)
 
 
-class ClassStudentListView(APIView):
+class ClassStudentListView(ReplicaReadMixin, APIView):
     # permission_classes = [IsAdminUser, IsInSameSchool]
 
     permission_classes = [IsAdminOrIsStaffAndInSameSchool]
@@ -324,68 +326,7 @@ class ClassStudentListView(APIView):
     def get(self, request):
         try:
             current_date = timezone.now().date()
-            # Fetch distinct class names from the curriculum
-            curriculum_data = Curriculum.objects.filter(school_id=request.user.school_id).values('select_class').distinct()
-
-            # Initialize a defaultdict to store sections for each class
-            class_sections = defaultdict(list)
-            for curriculum_entry in curriculum_data:
-                class_name = curriculum_entry['select_class']
-                # Fetch sections associated with each class from StudentUser
-                sections = StudentUser.objects.filter(class_enrolled=class_name, user__school_id=request.user.school_id).values_list('section', flat=True).distinct()
-                class_sections[class_name] = list(sections)
-
-            class_teacher_info = []
-            class_student_count = []
-            class_attendance_info = []
-
-            # Iterate through each class and its associated sections
-            for class_name, sections in class_sections.items():
-                for section in sections:
-                    # Fetch teacher info for the class and section
-                    teacher_info = TeacherUser.objects.filter(class_subject_section_details__0__class=class_name, class_subject_section_details__0__section=section,
-                                                              user__school_id=request.user.school_id, user__is_active=True).values('full_name', 'class_subject_section_details__0__curriculum')
-
-                    for teacher in teacher_info:
-                        # Append teacher info
-                        class_teacher_info.append({
-                            'curriculum': teacher['class_subject_section_details__0__curriculum'],
-                            'class_name': class_name,
-                            'section': section,
-                            'teachers': teacher['full_name']
-                        })
-
-                    # Count students for the class and section
-                    student_count = StudentUser.objects.filter(class_enrolled=class_name, section=section, user__school_id=request.user.school_id).count()
-                    class_student_count.append({
-                        'class_name': class_name,
-                        'section': section,
-                        'student_count': student_count
-                    })
-
-                    # Calculate attendance for the class and section
-                    total_present = StudentAttendence.objects.filter(date=current_date, student__class_enrolled=class_name, student__section=section,
-                                                                     mark_attendence='P').count()
-                    total_absent = StudentAttendence.objects.filter(date=current_date, student__class_enrolled=class_name, student__section=section,
-                                                                    mark_attendence='A').count()
-                    class_attendance_info.append({
-                        'class_name': class_name,
-                        'section': section,
-                        'total_present': total_present,
-                        'total_absent': total_absent
-                    })
-
-            response_data = []
-            for teacher_info, student_info, attendance_info in zip(class_teacher_info, class_student_count, class_attendance_info):
-                response_data.append({
-                    'curriculum': teacher_info['curriculum'],
-                    'class_name': teacher_info['class_name'],
-                    'section': teacher_info['section'],
-                    'class_teacher': teacher_info['teachers'],
-                    'class_strength': student_info['student_count'],
-                    'total_present': attendance_info['total_present'],
-                    'total_absent': attendance_info['total_absent']
-                })
+            response_data = get_class_overview(request.user.school_id, current_date)
 
             response = {
                 "status": status.HTTP_200_OK,
@@ -412,7 +353,7 @@ class FetchAttendanceDetailView(APIView):
     def get(self, request, pk):
         try:
             student = StudentUser.objects.get(id=pk, user__school_id=request.user.school_id)
-            data = StudentAttendence.objects.filter(student_id=pk, student__user__school_id=request.user.school_id).order_by('-date')
+            data = StudentAttendence.objects.filter(student_id=pk, school_id=request.user.school_id).order_by('-date')
 
             filter_type = request.query_params.get('filter_type', None)
             if filter_type:
@@ -441,6 +382,7 @@ class FetchAttendanceDetailView(APIView):
 
             if data:
                 serializer = StudentAttendanceDetailSerializer(data, many=True)
+                summary = current_attendance_summary(STUDENT, student.id)
                 response_data = create_response_data(
                     status=status.HTTP_200_OK,
                     message=UserResponseMessage.USER_DETAIL_MESSAGE,
@@ -449,9 +391,9 @@ class FetchAttendanceDetailView(APIView):
                         "student_roll_no": student.id,
                         "class": student.class_enrolled,
                         "section": student.section,
-                        "total_attendance": get_student_total_attendance(data),
-                        "total_absent": get_student_total_absent(data),
-                        "total_percentage": f"{get_student_attendence_percentage(data)}%",
+                        "total_attendance": summary['present'],
+                        "total_absent": summary['absent'],
+                        "total_percentage": f"{summary['percentage']}%",
                         "attendence_detail": serializer.data,
                     }
                 )
@@ -485,12 +427,15 @@ class FetchAttendanceListView(APIView):
             section = request.query_params.get('section')
             current_date = timezone.now().date()
             students = StudentUser.objects.filter(class_enrolled=class_name, section=section, user__school_id=request.user.school_id)
-            attendance_data = StudentAttendence.objects.filter(date=current_date, student__in=students, student__user__school_id=request.user.school_id)
+            attendance_data = StudentAttendence.objects.filter(date=current_date, student__in=students, school_id=request.user.school_id)
 
             paginator = self.pagination_class()
-            result_page = paginator.paginate_queryset(attendance_data, request)
+            result_page = paginator.paginate_queryset(attendance_data.select_related('student'), request)
 
-            serializers = StudentAttendanceListSerializer(result_page, many=True)
+            summaries = attendance_summary(STUDENT, {attendance.student_id for attendance in result_page},
+                                           current_date.year)
+            serializers = StudentAttendanceListSerializer(result_page, many=True,
+                                                          context={'attendance_summaries': summaries})
 
             response_data = []
             for attendance in serializers.data:
@@ -538,7 +483,7 @@ class FetchAttendanceFilterListView(APIView):
             class_name = request.query_params.get('class_name')
             section = request.query_params.get('section')
             students = StudentUser.objects.filter(class_enrolled=class_name, section=section, user__school_id=request.user.school_id)
-            attendance_data = StudentAttendence.objects.filter(student__in=students, student__user__school_id=request.user.school_id)
+            attendance_data = StudentAttendence.objects.filter(student__in=students, school_id=request.user.school_id)
 
             date = request.query_params.get('date', None)
             mark_attendence = request.query_params.get('mark_attendence', None)
@@ -552,10 +497,13 @@ class FetchAttendanceFilterListView(APIView):
             if mark_attendence == 'L':
                 attendance_data = attendance_data.filter(mark_attendence='L')
 
-            paginator = self.pagination_class()
-            result_page = paginator.paginate_queryset(attendance_data, request)
+            paginator = self.pagination_class.for_request(request, ordering=('-date', '-id'))
+            result_page = paginator.paginate_queryset(attendance_data.select_related('student'), request)
 
-            serializers = StudentAttendanceListSerializer(result_page, many=True)
+            summaries = attendance_summary(STUDENT, {attendance.student_id for attendance in result_page},
+                                           timezone.now().year)
+            serializers = StudentAttendanceListSerializer(result_page, many=True,
+                                                          context={'attendance_summaries': summaries})
             response_data = []
             for attendance in serializers.data:
                 response_data.append({
@@ -572,13 +520,7 @@ class FetchAttendanceFilterListView(APIView):
                 'status': status.HTTP_200_OK,
                 'message': AttendenceMarkedMessage.STUDENT_ATTENDANCE_FETCHED_SUCCESSFULLY,
                 'data': response_data,
-                'pagination': {
-                    'page_size': paginator.page_size,
-                    'next': paginator.get_next_link(),
-                    'previous': paginator.get_previous_link(),
-                    'total_pages': paginator.page.paginator.num_pages,
-                    'current_page': paginator.page.number,
-                }
+                'pagination': paginator.get_pagination_data(),
             }
             return Response(response, status=status.HTTP_200_OK)
         except Exception as e:
@@ -658,38 +600,26 @@ class StudentAttendanceCreateView(APIView):
     permission_classes = [IsTeacherUser, IsInSameSchool]
 
     def post(self, request):
-        data_str = request.data.get('data')  # Assuming data is sent as form-data with key 'data'
+        data = request.data.get('data')  # Assuming data is sent as form-data with key 'data'
 
-        try:
-            data_json = json.loads(data_str)
-        except json.JSONDecodeError:
-            return Response("Invalid JSON format", status=status.HTTP_400_BAD_REQUEST)
-
-        for item in data_json:
-            serializer = StudentAttendanceCreateSerializer(data=item)
-            if serializer.is_valid():
-                student_id = item['id']
-                date = item['date']
-                mark_attendence = item['mark_attendence']
-                student_user = get_object_or_404(StudentUser, id=student_id)
-
-                # Create or update attendance record
-                StudentAttendence.objects.update_or_create(
-                    student=student_user,
-                    date=date,
-                    mark_attendence=mark_attendence
-                )
-            else:
-                response = create_response_data(
-                    status=status.HTTP_400_BAD_REQUEST,
-                    message=serializer.errors,
-                    data={}
-                )
-                return Response(response, status=status.HTTP_400_BAD_REQUEST)
+        if isinstance(data, str):
+            try:
+                data = json.loads(data)
+            except json.JSONDecodeError:
+                return Response("Invalid JSON format", status=status.HTTP_400_BAD_REQUEST)
+
+        results, errors = mark_attendance(STUDENT, request.user.school_id, data)
+        if errors:
+            response = create_response_data(
+                status=status.HTTP_400_BAD_REQUEST,
+                message=AttendenceMarkedMessage.INVALID_ATTENDANCE_ENTRIES,
+                data=errors
+            )
+            return Response(response, status=status.HTTP_400_BAD_REQUEST)
         response = create_response_data(
             status=status.HTTP_200_OK,
             message=AttendenceMarkedMessage.ATTENDENCE_MARKED_SUCCESSFULLY,
-            data={}
+            data=results
         )
         return Response(response, status=status.HTTP_200_OK)
 
@@ -1028,7 +958,7 @@ class StudentZoomLinkListView(APIView):
             return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
 
 
-class StudentEBookListView(APIView):
+class StudentEBookListView(ReplicaReadMixin, APIView):
     """
     This class is used to fetch the list of the content.
     """
@@ -1050,7 +980,7 @@ class StudentEBookListView(APIView):
                 if is_recommended is not None:
                     content_data = content_data.filter(is_recommended=is_recommended, school_id=self.request.user.school_id)
 
-                paginator = self.pagination_class()
+                paginator = self.pagination_class.for_request(request)
                 paginated_queryset = paginator.paginate_queryset(content_data, request)
                 serializer = StudentContentListSerializer(paginated_queryset, many=True)
                 response_data = {
@@ -1058,13 +988,7 @@ class StudentEBookListView(APIView):
                     'count': len(serializer.data),
                     'message': ContentMessages.CONTENT_FETCHED,
                     'data': serializer.data,
-                    'pagination': {
-                        'page_size': paginator.page_size,
-                        'next': paginator.get_next_link(),
-                        'previous': paginator.get_previous_link(),
-                        'total_pages': paginator.page.paginator.num_pages,
-                        'current_page': paginator.page.number,
-                    }
+                    'pagination': paginator.get_pagination_data(),
                 }
                 return Response(response_data, status=status.HTTP_200_OK)
             else:
@@ -1295,27 +1219,21 @@ class AvailabilityTimeListView(APIView):
             current_date = current_date_time_ist.date()
             subject = request.query_params.get('subject')
             student_data = StudentUser.objects.get(user__school_id=user.school_id, user=user.id)
-            teacher_schedule = TeachersSchedule.objects.filter(school_id=user.school_id, end_date__gte=str(current_date))
-            availability_times = []
-
-            for schedule in teacher_schedule:
-                for entry in schedule.schedule_data:
-                    if entry['curriculum'] == student_data.curriculum \
-                            and entry['class'] == student_data.class_enrolled \
-                            and entry['section'] == student_data.section \
-                            and entry['subject'] == subject:
-                        availability_time_data = Availability.objects.get(school_id=user.school_id, teacher=schedule.teacher.id)
-
-                        # for availability_time in availability_time_data:
-                        start_time = datetime.datetime.strptime(str(availability_time_data.start_time), '%H:%M:%S').strftime('%I:%M %p')
-                        end_time = datetime.datetime.strptime(str(availability_time_data.end_time), '%H:%M:%S').strftime('%I:%M %p')
-                        # availability_times.append({"start_time": start_time, "end_time": end_time})
-                        response_data = create_response_data(
-                            status=status.HTTP_200_OK,
-                            message=TeacherAvailabilityMessage.TEACHER_AVAILABILITY_TIME,
-                            data={"start_time": start_time, "end_time": end_time},
-                        )
-                        return Response(response_data, status=status.HTTP_200_OK)
+            teacher_id = ScheduleSlot.objects.filter(
+                school_id=user.school_id, end_date__gte=current_date, curriculum=student_data.curriculum,
+                class_name=student_data.class_enrolled, section=student_data.section, subject=subject,
+            ).order_by('schedule_id', 'position').values_list('teacher_id', flat=True).first()
+
+            if teacher_id is not None:
+                availability_time_data = Availability.objects.get(school_id=user.school_id, teacher=teacher_id)
+                start_time = datetime.datetime.strptime(str(availability_time_data.start_time), '%H:%M:%S').strftime('%I:%M %p')
+                end_time = datetime.datetime.strptime(str(availability_time_data.end_time), '%H:%M:%S').strftime('%I:%M %p')
+                response_data = create_response_data(
+                    status=status.HTTP_200_OK,
+                    message=TeacherAvailabilityMessage.TEACHER_AVAILABILITY_TIME,
+                    data={"start_time": start_time, "end_time": end_time},
+                )
+                return Response(response_data, status=status.HTTP_200_OK)
             else:
                 response_data = create_response_data(
                     status=status.HTTP_404_NOT_FOUND,
@@ -1349,20 +1267,11 @@ class ConnectWithTeacherView(APIView):
             start_time = serializer.validated_data.get('start_time')
             # end_time = serializer.validated_data.get('end_time')
 
-            teacher_schedules = TeachersSchedule.objects.all()
-
-            for schedule in teacher_schedules:
-                for entry in schedule.schedule_data:
-                    if entry['curriculum'] == student_data.curriculum \
-                            and entry['class'] == student_data.class_enrolled \
-                            and entry['section'] == student_data.section \
-                            and entry['subject'] == subject:
-                        teacher_id = schedule.teacher_id
-                        break
-                else:
-                    continue
-                break
-            else:
+            teacher_id = ScheduleSlot.objects.filter(
+                school_id=user.school_id, curriculum=student_data.curriculum, class_name=student_data.class_enrolled,
+                section=student_data.section, subject=subject,
+            ).order_by('schedule_id', 'position').values_list('teacher_id', flat=True).first()
+            if teacher_id is None:
                 response = create_response_data(
                     status=status.HTTP_404_NOT_FOUND,
                     message="No teacher available for the provided schedule",
@@ -1513,30 +1422,30 @@ class StudentScheduleView(APIView):
             for subject in subject_data:
                 subjects.append(subject.primary_subject)
 
-            schedule = TeachersSchedule.objects.filter(school_id=request.user.school_id, start_date__lte=current_date,
-                                                       end_date__gte=current_date,)
-            matching_schedules = []
-            for schedule in schedule:
-                for entry in schedule.schedule_data:
-                    if (
-                            entry.get('curriculum') == student.curriculum and
-                            entry.get('class') == student.class_enrolled and
-                            (entry.get('subject') in subjects or
-                            entry.get('subject') in student.optional_subject) and
-                            current_date.strftime("%a") in entry.get('select_days', [])
-                    ):
-                        matching_schedules.append({
-                            "teacher": schedule.teacher.full_name,
-                            "schedule_id": schedule.id,
-                            "class": entry.get('class'),
-                            "section": entry.get('section'),
-                            "subject": entry.get('subject'),
-                            "curriculum": entry.get('curriculum'),
-                            "day": current_date.strftime("%a"),
-                            "class_timing": entry.get('class_timing'),
-                            "lecture_type": entry.get('lecture_type'),
-                            "class_duration": entry.get('class_duration')
-                        })
+            # The subject test stays in Python: optional_subject is free text and the old substring match is kept.
+            optional_subject = student.optional_subject or ''
+            slots = ScheduleSlot.objects.filter(
+                school_id=request.user.school_id, curriculum=student.curriculum, class_name=student.class_enrolled,
+                weekday=current_date.weekday(), start_date__lte=current_date, end_date__gte=current_date,
+            ).order_by('schedule_id', 'position').values(
+                'schedule_id', 'class_name', 'section', 'subject', 'curriculum', 'class_timing', 'lecture_type',
+                'class_duration', teacher_name=F('teacher__full_name'),
+            )
+            matching_schedules = [
+                {
+                    "teacher": slot['teacher_name'],
+                    "schedule_id": slot['schedule_id'],
+                    "class": slot['class_name'],
+                    "section": slot['section'],
+                    "subject": slot['subject'],
+                    "curriculum": slot['curriculum'],
+                    "day": current_date.strftime("%a"),
+                    "class_timing": slot['class_timing'],
+                    "lecture_type": slot['lecture_type'],
+                    "class_duration": slot['class_duration']
+                }
+                for slot in slots if slot['subject'] in subjects or slot['subject'] in optional_subject
+            ]
             response_data = create_response_data(
                 status=status.HTTP_200_OK,
                 message=ScheduleMessage.SCHEDULE_FETCHED_SUCCESSFULLY,
@@ -0,0 +1,35 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from EduSmart.metrics import SORT_KEYS, collect_report
+
+COLUMNS = ('count', 'total_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms', 'avg_sql_ms', 'avg_serializer_ms',
+           'avg_queries', 'p95_queries', 'max_queries')
+
+
+class Command(BaseCommand):
+    help = 'Print the per-endpoint query count and latency report flushed to REQUEST_METRICS_DIR.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sort', default='total_ms', choices=SORT_KEYS)
+        parser.add_argument('--limit', type=int, default=None)
+        parser.add_argument('--json', action='store_true', help='Print the report as JSON.')
+
+    def handle(self, *args, **options):
+        if not settings.REQUEST_METRICS_DIR:
+            raise CommandError('REQUEST_METRICS_DIR is not set, there are no worker snapshots to report on.')
+
+        report = collect_report(sort=options['sort'], limit=options['limit'])
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        if not report:
+            self.stdout.write('No requests recorded yet.')
+            return
+
+        width = max(len('endpoint'), *(len(row['endpoint']) for row in report))
+        self.stdout.write(' '.join(['endpoint'.ljust(width)] + [column.rjust(12) for column in COLUMNS]))
+        for row in report:
+            self.stdout.write(' '.join([row['endpoint'].ljust(width)] + [str(row[column]).rjust(12) for column in COLUMNS]))
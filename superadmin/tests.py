@@ -1,3 +1,139 @@
-from django.test import TestCase
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from unittest import expectedFailure
 
-# Create your tests here.
+from django.test import SimpleTestCase, override_settings
+from rest_framework.test import APITestCase
+
+from EduSmart.metrics import RESET_MARKER, MetricsRegistry, collect_report, registry
+from authentication.models import User
+from benchmarks import budget
+from superadmin.models import CurricullumList, SchoolProfile
+
+
+class CurriculumListQueryBudgetTest(budget.QueryBudgetTestCase):
+    path = '/super_admin/curriculum/list/'
+    role = 'superadmin'
+
+    # CurriculumListSerializer queries Subjects twice per curriculum.
+    @expectedFailure
+    def test_query_count_does_not_grow_with_rows(self):
+        super().test_query_count_does_not_grow_with_rows()
+
+    def seed(self, index, rows):
+        # The superadmin list is not scoped to a school, so clear the rows of the previous run first.
+        CurricullumList.objects.all().delete()
+        CurricullumList.objects.bulk_create([
+            CurricullumList(curriculum_name=f'Curriculum {number}', class_name=str(number % 12 + 1))
+            for number in range(rows)
+        ])
+        superadmin = User.objects.create(email=f'superadmin{index}@budget.test', name='Super Admin',
+                                         is_staff=True, is_superuser=True)
+        return {'superadmin': superadmin}
+
+
+@override_settings(REQUEST_METRICS_ENABLED=True, REQUEST_METRICS_DIR='')
+class RequestMetricsTest(APITestCase):
+    def setUp(self):
+        registry.reset()
+        self.admin = User.objects.create(email='admin@metrics.test', name='Admin', user_type='admin',
+                                         school_id='METRICS', is_staff=True)
+        SchoolProfile.objects.create(user=self.admin, school_id='METRICS', school_name='Metrics School')
+        self.client.force_authenticate(self.admin)
+
+    def test_streamed_response_is_recorded_once_sent(self):
+        response = self.client.get('/attendance/register/export/', {'type': 'teacher'})
+        self.assertNotIn('attendance-register-export', registry.snapshot())
+        b''.join(response.streaming_content)
+        stats = registry.snapshot()['attendance-register-export']
+        self.assertEqual(stats['count'], 1)
+        self.assertGreater(stats['queries'], 0)
+
+    def test_request_is_recorded(self):
+        superadmin = User.objects.create(email='superadmin@metrics.test', name='Super Admin', user_type='admin',
+                                         is_staff=True, is_superuser=True)
+        self.client.force_authenticate(superadmin)
+        self.client.get('/super_admin/metrics/endpoints/')
+        report = self.client.get('/super_admin/metrics/endpoints/').json()['data']['endpoints']
+        self.assertEqual([(row['endpoint'], row['count']) for row in report], [('endpoint_metrics', 1)])
+
+
+class MetricsRegistryTest(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        settings_override = override_settings(REQUEST_METRICS_DIR=self.directory)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        registry.reset()
+
+    def write_snapshot(self, pid, worker):
+        with open(os.path.join(self.directory, f'{pid}.json'), 'w') as handle:
+            json.dump(worker.snapshot(), handle)
+
+    def test_record(self):
+        registry.record('students', wall_ms=12, sql_ms=4, serializer_ms=1, queries=3)
+        registry.record('students', wall_ms=30, sql_ms=6, serializer_ms=2, queries=5)
+        stats = registry.snapshot()['students']
+        self.assertEqual((stats['count'], stats['queries'], stats['max_queries']), (2, 8, 5))
+        self.assertEqual(sum(stats['wall_histogram']), 2)
+
+    def test_report_merges_live_workers_only(self):
+        registry.record('students', wall_ms=10, sql_ms=1, serializer_ms=0, queries=2)
+        worker = MetricsRegistry()
+        worker.record('students', wall_ms=20, sql_ms=2, serializer_ms=0, queries=4)
+        self.write_snapshot(os.getppid(), worker)
+        finished = subprocess.Popen([sys.executable, '-c', 'pass'])
+        finished.wait()
+        self.write_snapshot(finished.pid, worker)
+
+        [row] = collect_report()
+        self.assertEqual((row['endpoint'], row['count'], row['max_queries']), ('students', 2, 4))
+
+    def test_reset_clears_every_worker(self):
+        worker = MetricsRegistry()
+        worker.record('students', wall_ms=20, sql_ms=2, serializer_ms=0, queries=4)
+        self.write_snapshot(os.getppid(), worker)
+
+        registry.reset()
+        self.assertEqual([name for name in os.listdir(self.directory) if name.endswith('.json')], [])
+        worker.flush()
+        self.assertEqual(worker.snapshot(), {})
+        self.assertEqual(collect_report(), [])
+
+    @override_settings(REQUEST_METRICS_FLUSH_INTERVAL=0)
+    def test_concurrent_flushes(self):
+        worker = MetricsRegistry()
+        errors = []
+
+        def record():
+            try:
+                for _ in range(100):
+                    worker.record('students', wall_ms=10, sql_ms=1, serializer_ms=0, queries=2)
+                    worker.flush()
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=record) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(sorted(os.listdir(self.directory)), [f'{os.getpid()}.json', RESET_MARKER])
+        with open(os.path.join(self.directory, f'{os.getpid()}.json')) as handle:
+            self.assertEqual(json.load(handle)['students']['count'], 800)
+
+    def test_flush_failure_is_logged(self):
+        path = os.path.join(self.directory, 'file')
+        open(path, 'w').close()
+        worker = MetricsRegistry()
+        worker.record('students', wall_ms=10, sql_ms=1, serializer_ms=0, queries=2)
+        with override_settings(REQUEST_METRICS_DIR=path), self.assertLogs('EduSmart.metrics', 'ERROR'):
+            worker.flush()
@@ -26,4 +26,7 @@ urlpatterns = [
         # Inquiry Related API'S
         path('inquiry/list/', InquiryListView.as_view(), name='inquiry_list'),
         path('inquiry/detail/<int:pk>/', InquiryDetailView.as_view(), name='inquiry_detail'),
+
+        # Monitoring API
+        path('metrics/endpoints/', EndpointMetricsView.as_view(), name='endpoint_metrics'),
 ]
\ No newline at end of file
@@ -10,10 +10,13 @@ from rest_framework import status
 from rest_framework.views import APIView
 
 from EduSmart import settings
+from EduSmart.db.pool import pool_stats
+from EduSmart.metrics import SORT_KEYS, collect_report, registry
 from authentication.models import User, InquiryForm
 from authentication.permissions import IsSuperAdminUser, IsAdminUser, IsInSameSchool
+from authentication.tenant import invalidate_school
 from constants import SchoolMessage, UserLoginMessage, UserResponseMessage, CurriculumMessage, ContentMessages, \
-    InquiryMessage
+    InquiryMessage, MetricsMessage
 from content.models import Content
 from content.serializers import ContentListSerializer, ContentUpdateSerializer
 from pagination import CustomPagination
@@ -72,6 +75,7 @@ class SchoolCreateView(APIView):
                     description=description, principle_name=name, contract=contract, contact_no=phone, email=email,
                     school_id=school_id
                 )
+                invalidate_school(school_id)
             else:
                 raise ValidationError("Invalid user_type. Expected 'admin'.")
             response = create_response_data(
@@ -142,9 +146,11 @@ class SchoolProfileUpdateView(APIView):
     def patch(self, request, pk):
         try:
             school_data = SchoolProfile.objects.get(id=pk)
+            previous_school_id = school_data.school_id
             serializer = SchoolProfileUpdateSerializer(school_data, data=request.data, partial=True)
             if serializer.is_valid(raise_exception=True):
                 serializer.save()
+                invalidate_school(previous_school_id, school_data.school_id)
                 response_data = create_response_data(
                     status=status.HTTP_200_OK,
                     message=SchoolMessage.SCHOOL_PROFILE_UPDATED_SUCCESSFULLY,
@@ -258,6 +264,7 @@ class SchoolAdminDeleteView(APIView):
         try:
             school_profile = SchoolProfile.objects.get(id=pk)
             school_profile.delete()
+            invalidate_school(school_profile.school_id)
             response_data = create_response_data(
                 status=status.HTTP_200_OK,
                 message=SchoolMessage.SCHOOL_DELETED_SCCCESSFULLY,
@@ -480,7 +487,7 @@ class BookContentList(APIView):
                 data = data.filter(content_type=content_type)
             if is_recommended is not None:
                 data = data.filter(is_recommended=is_recommended)
-            paginator = self.pagination_class()
+            paginator = self.pagination_class.for_request(request)
             paginated_queryset = paginator.paginate_queryset(data, request)
             serializer = ContentListSerializer(paginated_queryset, many=True)
             response_data = {
@@ -488,13 +495,7 @@ class BookContentList(APIView):
                 'count': len(serializer.data),
                 'message': ContentMessages.CONTENT_FETCHED,
                 'data': serializer.data,
-                'pagination': {
-                    'page_size': paginator.page_size,
-                    'next': paginator.get_next_link(),
-                    'previous': paginator.get_previous_link(),
-                    'total_pages': paginator.page.paginator.num_pages,
-                    'current_page': paginator.page.number,
-                }
+                'pagination': paginator.get_pagination_data(),
             }
             return Response(response_data, status=status.HTTP_200_OK)
         except Exception as e:
@@ -715,3 +716,56 @@ class InquiryDetailView(APIView):
                 data={}
             )
             return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+
+class EndpointMetricsView(APIView):
+    """
+    This class is used to fetch the per-endpoint query count and latency report collected by the
+    request metrics middleware, ranked by the `sort` query param, along with the database connection pool
+    counters of this worker, and to reset the numbers of every worker.
+    """
+    permission_classes = [IsSuperAdminUser]
+
+    def get(self, request):
+        try:
+            sort = request.query_params.get('sort', 'total_ms')
+            limit = request.query_params.get('limit', None)
+            if sort not in SORT_KEYS:
+                response_data = create_response_data(
+                    status=status.HTTP_400_BAD_REQUEST,
+                    message=MetricsMessage.INVALID_SORT_KEY,
+                    data={'sort_keys': SORT_KEYS}
+                )
+                return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+            report = collect_report(sort=sort, limit=int(limit) if limit else None)
+            response_data = create_response_data(
+                status=status.HTTP_200_OK,
+                message=MetricsMessage.METRICS_FETCHED_SUCCESSFULLY,
+                data={'enabled': settings.REQUEST_METRICS_ENABLED, 'endpoints': report,
+                      'connection_pools': pool_stats()}
+            )
+            return Response(response_data, status=status.HTTP_200_OK)
+        except Exception as e:
+            response_data = create_response_data(
+                status=status.HTTP_400_BAD_REQUEST,
+                message=e.args[0],
+                data={}
+            )
+            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+    def delete(self, request):
+        try:
+            registry.reset()
+            response_data = create_response_data(
+                status=status.HTTP_200_OK,
+                message=MetricsMessage.METRICS_RESET_SUCCESSFULLY,
+                data={}
+            )
+            return Response(response_data, status=status.HTTP_200_OK)
+        except Exception as e:
+            response_data = create_response_data(
+                status=status.HTTP_400_BAD_REQUEST,
+                message=e.args[0],
+                data={}
+            )
+            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,144 @@
+"""
+Class and subject assignments of the teachers.
+
+TeacherUser.class_subject_section_details is a JSON list of the curriculum, class, section and subject a teacher
+teaches, the first entry being their own class. Every save of a teacher rewrites their TeacherAssignment rows
+(see teacher.signals) so that "the class teacher of 7-B" or "who teaches Physics in 9-A" is an indexed lookup
+instead of a JSON path filter that only sees the first entry. `backfill_teacher_assignments` builds them for
+teachers written without signals.
+"""
+import hashlib
+import json
+
+from django.db import transaction
+
+from authentication.models import TeacherAssignment, TeacherUser
+
+BATCH_SIZE = 1000
+
+
+def _text(value):
+    return '' if value is None else str(value)[:255]
+
+
+def build_assignments(teacher, school_id):
+    """
+    The unsaved TeacherAssignment rows of `teacher`, one per entry of its class_subject_section_details.
+    """
+    details = teacher.class_subject_section_details
+    if not isinstance(details, list):
+        return []
+    return [
+        TeacherAssignment(teacher_id=teacher.id, school_id=school_id, position=position,
+                          curriculum=_text(detail.get('curriculum')), class_name=_text(detail.get('class')),
+                          section=_text(detail.get('section')), subject=_text(detail.get('subject')),
+                          is_class_teacher=position == 0)
+        for position, detail in enumerate(details) if isinstance(detail, dict)
+    ]
+
+
+def sync_teacher_assignments(teacher):
+    """
+    Replace the assignments of `teacher` with ones built from its current details.
+    """
+    with transaction.atomic():
+        TeacherAssignment.objects.filter(teacher_id=teacher.id).delete()
+        TeacherAssignment.objects.bulk_create(build_assignments(teacher, teacher.user.school_id))
+
+
+def backfill_teacher_assignments(school_id=None):
+    """
+    Rebuild the assignments of every teacher (of one school when given). Returns the number of rows written.
+    """
+    teachers = TeacherUser.objects.select_related('user').only(
+        'id', 'class_subject_section_details', 'user__school_id').order_by('id')
+    assignments = TeacherAssignment.objects.all()
+    if school_id:
+        teachers = teachers.filter(user__school_id=school_id)
+        assignments = assignments.filter(school_id=school_id)
+    written = 0
+    with transaction.atomic():
+        assignments.delete()
+        batch = []
+        for teacher in teachers.iterator(chunk_size=BATCH_SIZE):
+            batch += build_assignments(teacher, teacher.user.school_id)
+            if len(batch) >= BATCH_SIZE:
+                written += len(TeacherAssignment.objects.bulk_create(batch))
+                batch = []
+        written += len(TeacherAssignment.objects.bulk_create(batch))
+    return written
+
+
+def class_teachers(school_id, class_name, section=None, curriculum=None, subject=None):
+    """
+    The teachers of `school_id` whose own class is `class_name` (with that `section`, `curriculum` and `subject`
+    when given), oldest first.
+    """
+    filters = {'assignments__school_id': school_id, 'assignments__is_class_teacher': True,
+               'assignments__class_name': class_name}
+    for field, value in (('section', section), ('curriculum', curriculum), ('subject', subject)):
+        if value is not None:
+            filters[f'assignments__{field}'] = value
+    return TeacherUser.objects.filter(**filters).order_by('id')
+
+
+def subject_teachers(school_id, subject, class_name=None, section=None, curriculum=None):
+    """
+    The teachers of `school_id` who teach `subject` (in `class_name`, `section` and `curriculum` when given),
+    oldest first.
+    """
+    assignments = TeacherAssignment.objects.filter(school_id=school_id, subject=subject)
+    if class_name is not None:
+        assignments = assignments.filter(class_name=class_name)
+    if section is not None:
+        assignments = assignments.filter(section=section)
+    if curriculum is not None:
+        assignments = assignments.filter(curriculum=curriculum)
+    return TeacherUser.objects.filter(id__in=assignments.values('teacher_id')).order_by('id')
+
+
+def teacher_choices(school_id, teacher_id, field, **filters):
+    """
+    The distinct values of `field` (curriculum, class_name, section or subject) among the assignments of the
+    active teacher `teacher_id` matching `filters`, sorted. Raises TeacherUser.DoesNotExist for an unknown teacher.
+    """
+    choices = list(TeacherAssignment.objects.filter(
+        teacher_id=teacher_id, teacher__user__school_id=school_id, teacher__user__is_active=True, **filters
+    ).order_by(field).values_list(field, flat=True).distinct())
+    if not choices and not TeacherUser.objects.filter(id=teacher_id, user__school_id=school_id,
+                                                      user__is_active=True).exists():
+        raise TeacherUser.DoesNotExist('TeacherUser matching query does not exist.')
+    return choices
+
+
+def assignment_tree(school_id, teacher_id):
+    """
+    The assignments of the active teacher `teacher_id` as a curriculum -> class -> section -> subjects tree, with
+    when they last changed (None when the teacher has none). Raises TeacherUser.DoesNotExist for an unknown
+    teacher.
+    """
+    rows = TeacherAssignment.objects.filter(
+        teacher_id=teacher_id, teacher__user__school_id=school_id, teacher__user__is_active=True
+    ).order_by('curriculum', 'class_name', 'section', 'subject').values_list(
+        'curriculum', 'class_name', 'section', 'subject', 'updated_at')
+    tree, last_modified = {}, None
+    for curriculum, class_name, section, subject, updated_at in rows:
+        subjects = tree.setdefault(curriculum, {}).setdefault(class_name, {}).setdefault(section, [])
+        if subject not in subjects:
+            subjects.append(subject)
+        last_modified = max(last_modified or updated_at, updated_at)
+    if last_modified is None and not TeacherUser.objects.filter(id=teacher_id, user__school_id=school_id,
+                                                                user__is_active=True).exists():
+        raise TeacherUser.DoesNotExist('TeacherUser matching query does not exist.')
+    curriculums = [
+        {'curriculum': curriculum, 'classes': [
+            {'class': class_name, 'sections': [
+                {'section': section, 'subjects': subjects} for section, subjects in sections.items()
+            ]} for class_name, sections in classes.items()
+        ]} for curriculum, classes in tree.items()
+    ]
+    return curriculums, last_modified
+
+
+def assignment_tree_etag(teacher_id, curriculums):
+    return '"{}"'.format(hashlib.md5(json.dumps([teacher_id, curriculums]).encode()).hexdigest())
@@ -0,0 +1,115 @@
+"""
+Timetable clashes of the teacher schedules.
+
+Every schedule slot (teacher.schedules) with a weekday, a start time and a duration is an interval of minutes on
+that weekday, live between the start and end dates of its schedule. Two slots clash when their intervals and date
+ranges overlap and they either belong to the same teacher or put two different teachers in the same
+class-section. Clashes are found with a sweep over the slots of each teacher and each class-section per weekday,
+sorted by start time, so an audit of a whole school costs one query and a sort.
+"""
+from django.db.models import Q
+
+from authentication.models import ScheduleSlot
+from teacher.schedules import DAY_NAMES, build_slots
+
+TEACHER = 'teacher'
+CLASS = 'class'
+
+SLOT_FIELDS = ('schedule_id', 'position', 'teacher_id', 'curriculum', 'class_name', 'section', 'subject', 'weekday',
+               'class_timing', 'class_duration', 'start_time', 'duration', 'start_date', 'end_date')
+
+
+def _interval(slot):
+    start = slot['start_time'].hour * 60 + slot['start_time'].minute
+    return start, start + slot['duration']
+
+
+def _groups(slots):
+    """
+    The placeable slots grouped per (kind, owner, weekday), each group sorted by start time.
+    """
+    groups = {}
+    for slot in slots:
+        if slot['weekday'] is None or slot['start_time'] is None or not slot['duration']:
+            continue
+        if slot['teacher_id'] is not None:
+            groups.setdefault((TEACHER, slot['teacher_id'], slot['weekday']), []).append(slot)
+        if slot['class_name']:
+            owner = (slot['curriculum'], slot['class_name'], slot['section'])
+            groups.setdefault((CLASS, owner, slot['weekday']), []).append(slot)
+    for group in groups.values():
+        group.sort(key=_interval)
+    return groups
+
+
+def _describe(slot):
+    start, end = _interval(slot)
+    return {
+        'schedule_id': slot['schedule_id'],
+        'teacher_id': slot['teacher_id'],
+        'curriculum': slot['curriculum'],
+        'class': slot['class_name'],
+        'section': slot['section'],
+        'subject': slot['subject'],
+        'class_timing': slot['class_timing'],
+        'class_duration': slot['class_duration'],
+        'start': f'{start // 60:02d}:{start % 60:02d}',
+        'end': f'{end // 60 % 24:02d}:{end % 60:02d}',
+        'start_date': slot['start_date'],
+        'end_date': slot['end_date'],
+    }
+
+
+def find_conflicts(slots, involving=False):
+    """
+    The clashes among `slots` (dicts of SLOT_FIELDS), as {'type', 'day', 'slots'}: all of them, or only those of
+    a slot of the schedule `involving` (a schedule id, or None for an unsaved schedule).
+    """
+    conflicts = []
+    for (kind, _, weekday), group in _groups(slots).items():
+        active = []
+        for slot in group:
+            start, end = _interval(slot)
+            active = [other for other in active if other[0] > start]
+            for _, other in active:
+                if other['start_date'] > slot['end_date'] or slot['start_date'] > other['end_date']:
+                    continue
+                if kind == CLASS and other['teacher_id'] == slot['teacher_id']:
+                    continue
+                if involving is not False and involving not in (slot['schedule_id'], other['schedule_id']):
+                    continue
+                conflicts.append({'type': kind, 'day': DAY_NAMES[weekday].title(),
+                                  'slots': [_describe(other), _describe(slot)]})
+            active.append((end, slot))
+    conflicts.sort(key=lambda conflict: (conflict['type'], DAY_NAMES.index(conflict['day'].lower()),
+                                         conflict['slots'][0]['start'], conflict['slots'][0]['schedule_id'] or 0))
+    return conflicts
+
+
+def school_conflicts(school_id, start_date=None, end_date=None):
+    """
+    Every clash between the schedules of `school_id` live at some point from `start_date` to `end_date`.
+    """
+    slots = ScheduleSlot.objects.filter(school_id=school_id)
+    if start_date:
+        slots = slots.filter(end_date__gte=start_date)
+    if end_date:
+        slots = slots.filter(start_date__lte=end_date)
+    return find_conflicts(slots.values(*SLOT_FIELDS))
+
+
+def schedule_conflicts(schedule):
+    """
+    The clashes `schedule`, saved or not, would have with itself and the other schedules of its school.
+    """
+    candidates = [{field: getattr(slot, field) for field in SLOT_FIELDS} for slot in build_slots(schedule)]
+    if not candidates:
+        return []
+    owners = Q(teacher_id=schedule.teacher_id) if schedule.teacher_id is not None else Q()
+    for slot in candidates:
+        owners |= Q(curriculum=slot['curriculum'], class_name=slot['class_name'], section=slot['section'])
+    others = ScheduleSlot.objects.filter(owners, school_id=schedule.school_id, start_date__lte=schedule.end_date,
+                                         end_date__gte=schedule.start_date)
+    if schedule.id is not None:
+        others = others.exclude(schedule_id=schedule.id)
+    return find_conflicts(candidates + list(others.values(*SLOT_FIELDS)), involving=schedule.id)
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from teacher.schedules import backfill_schedule_slots
+
+
+class Command(BaseCommand):
+    help = ('Rebuild the schedule slots of the teacher schedules from their schedule_data, e.g. after deploying '
+            'the slot table. Slots are otherwise rewritten whenever a schedule is saved.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--school-id', default=None, help='Only rebuild the slots of this school.')
+
+    def handle(self, *args, **options):
+        written = backfill_schedule_slots(options['school_id'])
+        self.stdout.write(f'Wrote {written} schedule slots.')
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from teacher.assignments import backfill_teacher_assignments
+
+
+class Command(BaseCommand):
+    help = ('Rebuild the class and subject assignments of the teachers from their class_subject_section_details, '
+            'e.g. after deploying the assignment table. Assignments are otherwise rewritten whenever a teacher is '
+            'saved.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--school-id', default=None, help='Only rebuild the assignments of this school.')
+
+    def handle(self, *args, **options):
+        written = backfill_teacher_assignments(options['school_id'])
+        self.stdout.write(f'Wrote {written} teacher assignments.')
@@ -0,0 +1,41 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from teacher.models import ScheduleReminder
+from teacher.reminders import expand_reminders, prune_reminders, send_due_reminders
+
+
+class Command(BaseCommand):
+    help = ('Send the due class reminders of the teacher schedules, polling every SCHEDULE_REMINDER_POLL_SECONDS. '
+            'Reminders are queued SCHEDULE_REMINDER_DAYS_AHEAD days ahead on start and every day after. Any number '
+            'of workers can run side by side.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Send the reminders due now and exit, e.g. from cron.')
+        parser.add_argument('--batch-size', type=int, default=None, help='Reminders claimed per batch.')
+        parser.add_argument('--interval', type=int, default=None, help='Seconds between polls.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size'] or settings.SCHEDULE_REMINDER_BATCH_SIZE
+        interval = options['interval'] or settings.SCHEDULE_REMINDER_POLL_SECONDS
+        expanded_on = None
+        while True:
+            today = timezone.localdate()
+            if expanded_on != today:
+                queued = expand_reminders()
+                pruned = prune_reminders()
+                self.stdout.write(f'Queued reminders of {queued} classes, pruned {pruned} old reminders.')
+                expanded_on = today
+            while True:
+                counts = send_due_reminders(batch_size)
+                if any(counts.values()):
+                    self.stdout.write(', '.join(f'{status} {count}' for status, count in counts.items()))
+                # Reminders left pending failed to send and are retried on the next poll.
+                if sum(counts.values()) < batch_size or counts[ScheduleReminder.PENDING]:
+                    break
+            if options['once']:
+                break
+            time.sleep(interval)
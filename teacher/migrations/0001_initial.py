@@ -0,0 +1,38 @@
+# Generated by Django 4.2.10 on 2026-10-17 05:39
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('authentication', '0088_scheduleslot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduleReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('school_id', models.CharField(blank=True, max_length=255, null=True)),
+                ('position', models.PositiveSmallIntegerField()),
+                ('remind_at', models.DateTimeField()),
+                ('title', models.CharField(max_length=255)),
+                ('message', models.TextField()),
+                ('status', models.CharField(default='pending', max_length=10)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('schedule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='authentication.teachersschedule')),
+                ('teacher', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='authentication.teacheruser')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'remind_at'], name='teacher_sch_status_92a6e9_idx')],
+                'unique_together': {('schedule', 'position', 'remind_at')},
+            },
+        ),
+    ]
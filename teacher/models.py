@@ -1,5 +1,35 @@
 from django.db import models
 
-from authentication.models import TeacherUser
+from authentication.models import TeacherUser, TeachersSchedule
 # Create your models here.
 
+
+class ScheduleReminder(models.Model):
+    """
+    A push reminder to a teacher before one class of their schedule (see teacher.reminders), sent by the
+    `send_schedule_reminders` worker once remind_at has passed.
+    """
+    PENDING = 'pending'
+    SENT = 'sent'
+    SKIPPED = 'skipped'
+    FAILED = 'failed'
+
+    school_id = models.CharField(max_length=255, blank=True, null=True)
+    schedule = models.ForeignKey(TeachersSchedule, on_delete=models.CASCADE, related_name='reminders')
+    teacher = models.ForeignKey(TeacherUser, on_delete=models.CASCADE)
+    position = models.PositiveSmallIntegerField()  # index of the entry in schedule_data
+    remind_at = models.DateTimeField()
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+    status = models.CharField(max_length=10, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('schedule', 'position', 'remind_at')
+        indexes = [models.Index(fields=['status', 'remind_at'])]
+
+    def __str__(self):
+        return f"{self.teacher_id} {self.remind_at} {self.status}"
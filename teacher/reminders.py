@@ -0,0 +1,136 @@
+"""
+Class reminders of the teacher schedules.
+
+Every schedule slot (teacher.schedules) with a weekday and a start time is expanded into one ScheduleReminder per
+class in the next SCHEDULE_REMINDER_DAYS_AHEAD days, due SCHEDULE_REMINDER_LEAD_MINUTES before the class. The
+rows are the queue: the `send_schedule_reminders` worker claims the due ones in batches with
+SELECT ... FOR UPDATE SKIP LOCKED, so several workers never send the same reminder and a restart loses nothing,
+and extends the expansion every day. Saving a schedule replaces its pending reminders.
+"""
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from authentication.models import ScheduleSlot
+from notificationpackage.firebase import send_push_notification
+from teacher.models import ScheduleReminder
+
+REMINDER_TITLE = 'Upcoming Schedule Reminder'
+REMINDER_MESSAGE = 'Your class starts at {}. Please be prepared.'
+REMINDER_NOT_DELIVERED = 'The push notification was not delivered.'
+
+
+def _reminders(slots, start, end, now):
+    """
+    Yield the unsaved reminders of the classes of `slots` from `start` to `end` still due after `now`.
+    """
+    lead = datetime.timedelta(minutes=settings.SCHEDULE_REMINDER_LEAD_MINUTES)
+    week = datetime.timedelta(days=7)
+    for slot in slots:
+        first, last = max(start, slot.start_date), min(end, slot.end_date)
+        day = first + datetime.timedelta(days=(slot.weekday - first.weekday()) % 7)
+        while day <= last:
+            remind_at = timezone.make_aware(datetime.datetime.combine(day, slot.start_time)) - lead
+            if remind_at > now:
+                yield ScheduleReminder(school_id=slot.school_id, schedule_id=slot.schedule_id,
+                                       teacher_id=slot.teacher_id, position=slot.position, remind_at=remind_at,
+                                       title=REMINDER_TITLE, message=REMINDER_MESSAGE.format(slot.class_timing))
+            day += week
+
+
+def expand_reminders(school_id=None, schedule_ids=None, days=None):
+    """
+    Queue the reminders of the next `days` days (SCHEDULE_REMINDER_DAYS_AHEAD by default) of every schedule, of
+    one school or of `schedule_ids` when given; queued reminders are left alone. Returns the number of classes
+    found.
+    """
+    now = timezone.now()
+    start = timezone.localdate(now)
+    end = start + datetime.timedelta(days=(settings.SCHEDULE_REMINDER_DAYS_AHEAD if days is None else days) - 1)
+    slots = ScheduleSlot.objects.filter(weekday__isnull=False, start_time__isnull=False, teacher__isnull=False,
+                                        start_date__lte=end, end_date__gte=start)
+    if school_id:
+        slots = slots.filter(school_id=school_id)
+    if schedule_ids is not None:
+        slots = slots.filter(schedule_id__in=schedule_ids)
+    reminders = list(_reminders(slots, start, end, now))
+    ScheduleReminder.objects.bulk_create(reminders, batch_size=1000, ignore_conflicts=True)
+    return len(reminders)
+
+
+def schedule_reminders(schedule):
+    """
+    Replace the pending reminders of `schedule` with ones expanded from its current slots.
+    """
+    with transaction.atomic():
+        ScheduleReminder.objects.filter(schedule_id=schedule.id, status=ScheduleReminder.PENDING).delete()
+        expand_reminders(schedule_ids=[schedule.id])
+
+
+def _retry(reminders, error):
+    """
+    Count a failed attempt of `reminders`, which stay pending until SCHEDULE_REMINDER_MAX_ATTEMPTS.
+    """
+    for reminder in reminders:
+        reminder.attempts += 1
+        reminder.last_error = error
+        if reminder.attempts >= settings.SCHEDULE_REMINDER_MAX_ATTEMPTS:
+            reminder.status = ScheduleReminder.FAILED
+
+
+def send_due_reminders(batch_size=None):
+    """
+    Claim up to `batch_size` due reminders (SCHEDULE_REMINDER_BATCH_SIZE by default) that no other worker holds
+    and send them, one push per teacher and distinct message so that its delivery count tells whether they were
+    sent. A reminder whose class has started is skipped; a send that raises or is not delivered is retried on
+    the next poll until SCHEDULE_REMINDER_MAX_ATTEMPTS. Returns the number claimed per status.
+    """
+    now = timezone.now()
+    lead = datetime.timedelta(minutes=settings.SCHEDULE_REMINDER_LEAD_MINUTES)
+    counts = {ScheduleReminder.SENT: 0, ScheduleReminder.SKIPPED: 0, ScheduleReminder.FAILED: 0,
+              ScheduleReminder.PENDING: 0}
+    with transaction.atomic():
+        due = list(ScheduleReminder.objects.select_for_update(skip_locked=True, of=('self',))
+                   .filter(status=ScheduleReminder.PENDING, remind_at__lte=now).select_related('teacher')
+                   .order_by('remind_at')[:batch_size or settings.SCHEDULE_REMINDER_BATCH_SIZE])
+        messages = {}
+        for reminder in due:
+            if reminder.remind_at + lead <= now:
+                reminder.status, reminder.last_error = ScheduleReminder.SKIPPED, 'The class has started.'
+            elif not reminder.teacher.fcm_token:
+                reminder.status, reminder.last_error = ScheduleReminder.SKIPPED, 'The teacher has no FCM token.'
+            else:
+                key = (reminder.teacher.fcm_token, reminder.title, reminder.message)
+                messages.setdefault(key, []).append(reminder)
+
+        for (token, title, message), reminders in messages.items():
+            try:
+                success_count, failure_count = send_push_notification([token], title, message)
+            except Exception as e:
+                _retry(reminders, str(e))
+                continue
+            if failure_count or not success_count:
+                _retry(reminders, REMINDER_NOT_DELIVERED)
+                continue
+            for reminder in reminders:
+                reminder.attempts += 1
+                reminder.status, reminder.sent_at, reminder.last_error = ScheduleReminder.SENT, timezone.now(), ''
+
+        ScheduleReminder.objects.bulk_update(due, ['status', 'attempts', 'sent_at', 'last_error'])
+    for reminder in due:
+        counts[reminder.status] += 1
+    return counts
+
+
+def prune_reminders(days=None):
+    """
+    Delete the reminders that are no longer pending and were due more than `days` days ago
+    (SCHEDULE_REMINDER_RETENTION_DAYS by default). Returns the number of rows deleted.
+    """
+    days = settings.SCHEDULE_REMINDER_RETENTION_DAYS if days is None else days
+    cutoff = timezone.now() - datetime.timedelta(days=days)
+    deleted, _ = ScheduleReminder.objects.exclude(status=ScheduleReminder.PENDING).filter(remind_at__lt=cutoff) \
+        .delete()
+    return deleted
@@ -0,0 +1,121 @@
+"""
+Schedule slots of the teacher schedules.
+
+TeachersSchedule.schedule_data is free-form JSON, a single entry or a list of them, each naming a class-section,
+a subject, a time and the days of the week it is taught on. Every write of a schedule rewrites its ScheduleSlot
+rows, one per entry and day, so that timetables are read with one indexed query instead of loading and scanning
+the JSON of every schedule of the school. `backfill_schedule_slots` builds them for existing schedules.
+"""
+import datetime
+import re
+
+from django.db import transaction
+
+from authentication.models import ScheduleSlot, TeachersSchedule
+
+DAY_NAMES = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+TIME_FORMATS = ('%I:%M%p', '%I:%M %p', '%H:%M', '%H:%M:%S', '%I%p')
+BATCH_SIZE = 1000
+
+
+def schedule_entries(schedule_data):
+    """
+    The entries of `schedule_data`, which is stored as a single entry or a list of them.
+    """
+    if isinstance(schedule_data, dict):
+        return [schedule_data]
+    if isinstance(schedule_data, list):
+        return schedule_data
+    return []
+
+
+def parse_weekday(day):
+    """
+    0 for Monday to 6 for Sunday from a day name such as 'Mon' or 'monday', or None.
+    """
+    day = str(day).strip()[:3].lower()
+    return DAY_NAMES.index(day) if day in DAY_NAMES else None
+
+
+def parse_class_timing(class_timing):
+    """
+    The time of a class_timing such as '9:00', '09:00AM' or '9:00 am', or None.
+    """
+    class_timing = str(class_timing or '').strip().upper()
+    for time_format in TIME_FORMATS:
+        try:
+            return datetime.datetime.strptime(class_timing, time_format).time()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_duration(class_duration):
+    """
+    The minutes of a class_duration such as '45' or '45 min', or None.
+    """
+    match = re.match(r'\s*(\d+)', str(class_duration or ''))
+    return min(int(match.group(1)), 32767) if match else None
+
+
+def _text(value):
+    return '' if value is None else str(value)[:255]
+
+
+def build_slots(schedule):
+    """
+    The unsaved ScheduleSlot rows of `schedule`, one per entry and day of its schedule_data; an entry naming no
+    valid day gets one slot without a weekday.
+    """
+    slots = []
+    for position, entry in enumerate(schedule_entries(schedule.schedule_data)):
+        if not isinstance(entry, dict):
+            continue
+        days = entry.get('select_days') or []
+        if isinstance(days, str):
+            days = [days]
+        weekdays = sorted({weekday for weekday in map(parse_weekday, days) if weekday is not None}) or [None]
+        for weekday in weekdays:
+            slots.append(ScheduleSlot(
+                schedule_id=schedule.id, school_id=schedule.school_id, teacher_id=schedule.teacher_id,
+                start_date=schedule.start_date, end_date=schedule.end_date, position=position,
+                curriculum=_text(entry.get('curriculum')), class_name=_text(entry.get('class')),
+                section=_text(entry.get('section')), subject=_text(entry.get('subject')), weekday=weekday,
+                class_timing=_text(entry.get('class_timing'))[:50],
+                start_time=parse_class_timing(entry.get('class_timing')),
+                class_duration=_text(entry.get('class_duration'))[:50],
+                duration=parse_duration(entry.get('class_duration')),
+                lecture_type=_text(entry.get('lecture_type')),
+            ))
+    return slots
+
+
+def sync_schedule_slots(schedule):
+    """
+    Replace the slots of `schedule` with ones built from its current fields.
+    """
+    with transaction.atomic():
+        ScheduleSlot.objects.filter(schedule_id=schedule.id).delete()
+        ScheduleSlot.objects.bulk_create(build_slots(schedule))
+
+
+def backfill_schedule_slots(school_id=None):
+    """
+    Rebuild the slots of every schedule (of one school when given). Returns the number of slots written.
+    """
+    schedules = TeachersSchedule.objects.order_by('id')
+    slots = ScheduleSlot.objects.all()
+    if school_id:
+        schedules = schedules.filter(school_id=school_id)
+        slots = slots.filter(school_id=school_id)
+    written = 0
+    with transaction.atomic():
+        slots.delete()
+        batch = []
+        for schedule in schedules.iterator(chunk_size=BATCH_SIZE):
+            batch += build_slots(schedule)
+            if len(batch) >= BATCH_SIZE:
+                written += len(ScheduleSlot.objects.bulk_create(batch))
+                batch = []
+        written += len(ScheduleSlot.objects.bulk_create(batch))
+    return written
@@ -16,6 +16,7 @@ from constants import USER_TYPE_CHOICES, GENDER_CHOICES, RELIGION_CHOICES, BLOOD
 from curriculum.models import Curriculum, Subjects
 from student.models import ExmaReportCard, ZoomLink, StudentMaterial, ConnectWithTeacher
 from superadmin.models import Announcement
+from teacher.assignments import class_teachers
 
 
 class CertificateSerializer(serializers.ModelSerializer):
@@ -962,7 +963,7 @@ class ExamReportCardViewSerializer(serializers.ModelSerializer):
     def get_teacher_name(self, obj):
         class_name = obj.class_name
         if class_name:
-            teacher = TeacherUser.objects.filter(class_subject_section_details__0__class=class_name).first()
+            teacher = class_teachers(obj.school_id, class_name).first()
             if teacher:
                 return teacher.full_name
         return None
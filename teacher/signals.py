@@ -0,0 +1,12 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from authentication.models import TeacherUser
+from teacher.assignments import sync_teacher_assignments
+
+
+@receiver(post_save, sender=TeacherUser)
+def sync_assignments(sender, instance, update_fields=None, **kwargs):
+    # A save that leaves the class details alone, e.g. of the FCM token, keeps the assignments.
+    if update_fields is None or 'class_subject_section_details' in update_fields:
+        sync_teacher_assignments(instance)
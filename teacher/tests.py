@@ -1,3 +1,327 @@
-from django.test import TestCase
+import base64
+import datetime
+import json
+from unittest import expectedFailure, mock
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+
+from authentication.models import ScheduleSlot, StudentUser, TeacherAssignment, TeacherAttendence, TeacherUser, \
+    TeachersSchedule, User
+from benchmarks import budget
+from benchmarks.factories import SCHOOL_ID, create_admin, create_teachers
+from curriculum.models import Curriculum, Subjects
+from pagination import CustomPagination, KeysetPagination
+from teacher.assignments import backfill_teacher_assignments, class_teachers, subject_teachers
+from teacher.conflicts import school_conflicts, schedule_conflicts
+from teacher.models import ScheduleReminder
+from teacher.reminders import REMINDER_MESSAGE, REMINDER_NOT_DELIVERED, REMINDER_TITLE, expand_reminders, \
+    schedule_reminders, send_due_reminders
+from teacher.schedules import backfill_schedule_slots, build_slots, sync_schedule_slots
+
+class TeacherScheduleListQueryBudgetTest(budget.QueryBudgetTestCase):
+    path = '/teacher/schedule/list/'
+
+    # ScheduleListSerializer loads the TeacherUser of every schedule several times.
+    @expectedFailure
+    def test_query_count_does_not_grow_with_rows(self):
+        super().test_query_count_does_not_grow_with_rows()
+
+
+class TeacherAttendanceKeysetPaginationTest(TestCase):
+    def test_date_id_cursor_walks_every_row_once(self):
+        dates = [datetime.date(2024, 6, day) for day in range(1, 11)]
+        TeacherAttendence.objects.bulk_create([
+            TeacherAttendence(teacher=teacher, school_id=SCHOOL_ID, date=date, mark_attendence='P')
+            for teacher in create_teachers(2) for date in dates
+        ])
+        queryset = TeacherAttendence.objects.all()
+        expected = list(queryset.order_by('-date', '-id').values_list('id', flat=True))
+
+        seen = []
+        url = '/teacher/attendance/filter/list/?pagination=cursor&page_size=7'
+        while url:
+            request = Request(APIRequestFactory().get(url))
+            paginator = CustomPagination.for_request(request, ordering=('-date', '-id'))
+            seen.extend(row.id for row in paginator.paginate_queryset(queryset, request))
+            url = paginator.get_next_link()
+        self.assertEqual(seen, expected)
+
+    def test_malformed_cursor_is_not_found(self):
+        paginator = KeysetPagination(ordering=('-date', '-id'))
+        for cursor in ({'p': 5, 'r': False}, {'p': {'date': 1, 'id': 2}, 'r': False}, {'p': [1], 'r': False},
+                       [1, 2], 'cursor'):
+            encoded = base64.urlsafe_b64encode(json.dumps(cursor).encode()).decode()
+            request = Request(APIRequestFactory().get('/', {'cursor': encoded}))
+            with self.assertRaises(NotFound):
+                paginator.decode_cursor(request)
+
+
+class ScheduleSlotTest(APITestCase):
+    def setUp(self):
+        create_admin()
+        self.teacher = create_teachers(1)[0]
+        self.student = StudentUser.objects.create(
+            user=User.objects.create(email=f'student@{SCHOOL_ID.lower()}.test', name='Student', user_type='student',
+                                     school_id=SCHOOL_ID),
+            name='Student', curriculum='CBSE', class_enrolled='7', section='Z')
+
+    def schedule(self, **entry):
+        today = timezone.localdate()
+        entry = {'curriculum': self.student.curriculum, 'class': self.student.class_enrolled, 'section': 'Z',
+                 'subject': 'Music', 'class_timing': '09:30AM', 'class_duration': '45 min', 'lecture_type': 'Daily',
+                 'select_days': ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'], **entry}
+        schedule = TeachersSchedule.objects.create(school_id=SCHOOL_ID, teacher=self.teacher, start_date=today,
+                                                   end_date=today, schedule_data=entry)
+        sync_schedule_slots(schedule)
+        return schedule
+
+    def test_slots_parse_each_day_of_an_entry(self):
+        schedule = self.schedule(select_days=['Mon', 'wednesday', 'someday'])
+        slots = schedule.slots.order_by('weekday')
+        self.assertEqual([slot.weekday for slot in slots], [0, 2])
+        self.assertEqual(slots[0].start_time, datetime.time(9, 30))
+        self.assertEqual(slots[0].duration, 45)
+
+        schedule.schedule_data = [{'subject': 'Art', 'class_timing': 'soon'}]
+        schedule.save()
+        sync_schedule_slots(schedule)
+        slot = schedule.slots.get()
+        self.assertEqual((slot.subject, slot.weekday, slot.start_time), ('Art', None, None))
+
+    def test_backfill_matches_the_schedules(self):
+        self.schedule()
+        self.schedule(select_days=['Sat'], class_timing='11:00AM')
+        ScheduleSlot.objects.all().delete()
+        backfill_schedule_slots(SCHOOL_ID)
+        for schedule in TeachersSchedule.objects.filter(school_id=SCHOOL_ID):
+            self.assertEqual(schedule.slots.count(), len(build_slots(schedule)))
+            self.assertTrue(schedule.slots.exists())
+
+    def test_student_schedule_reads_todays_slots(self):
+        curriculum = Curriculum.objects.create(school_id=SCHOOL_ID, curriculum_name=self.student.curriculum,
+                                               select_class=self.student.class_enrolled)
+        subject = Subjects.objects.create(curriculum_id=curriculum, primary_subject='Maths').primary_subject
+        taught = self.schedule(subject=subject)
+        self.schedule(subject='Not a subject of the class')
+
+        self.client.force_authenticate(self.student.user)
+        response = self.client.get('/student/schedule/')
+        self.assertEqual(response.status_code, 200)
+        entry = next(entry for entry in response.data['data'] if entry['schedule_id'] == taught.id)
+        self.assertEqual(entry['teacher'], self.teacher.full_name)
+        self.assertEqual((entry['subject'], entry['section'], entry['class_timing']), (subject, 'Z', '09:30AM'))
+        self.assertEqual(entry['day'], timezone.localdate().strftime('%a'))
+        self.assertNotIn('Not a subject of the class', [entry['subject'] for entry in response.data['data']])
+
+
+class ScheduleConflictTest(APITestCase):
+    audit_path = '/teacher/schedule/conflicts/'
+    create_path = '/teacher/schedule/create/'
+
+    def setUp(self):
+        self.teachers = create_teachers(3)
+        self.client.force_authenticate(create_admin())
+        self.start, self.end = datetime.date(2031, 1, 1), datetime.date(2031, 6, 30)
+
+    def entry(self, class_timing, class_duration='45', section='A', select_days=('Mon',)):
+        return {'curriculum': 'TEST', 'class': '1', 'section': section, 'subject': 'Maths',
+                'class_timing': class_timing, 'class_duration': class_duration, 'select_days': list(select_days)}
+
+    def schedule(self, teacher, *entries, start=None, end=None):
+        schedule = TeachersSchedule.objects.create(school_id=SCHOOL_ID, teacher=teacher,
+                                                   start_date=start or self.start, end_date=end or self.end,
+                                                   schedule_data=list(entries))
+        sync_schedule_slots(schedule)
+        return schedule
+
+    def audit(self):
+        response = self.client.get(self.audit_path, {'start_date': self.start.isoformat()})
+        self.assertEqual(response.status_code, 200)
+        return response.data['data']['conflicts']
+
+    def test_overlaps_of_a_teacher_and_of_a_class_section(self):
+        first, second = self.teachers[:2]
+        self.schedule(first, self.entry('09:00AM', section='A'), self.entry('09:30AM', section='B'))
+        self.schedule(second, self.entry('9:44', '15', section='A', select_days=('Mon', 'Tue')))
+        # Back to back, on another day or in another term: no clash.
+        self.schedule(second, self.entry('10:15AM', section='B'), self.entry('09:00AM', select_days=('Wed',)))
+        self.schedule(first, self.entry('09:00AM', section='C'), start=datetime.date(2031, 7, 1),
+                      end=datetime.date(2031, 12, 31))
+
+        conflicts = self.audit()
+        self.assertEqual([(conflict['type'], conflict['day']) for conflict in conflicts],
+                         [('class', 'Mon'), ('teacher', 'Mon')])
+        self.assertEqual({slot['teacher_id'] for slot in conflicts[0]['slots']}, {first.id, second.id})
+        self.assertEqual([(slot['section'], slot['start'], slot['end']) for slot in conflicts[1]['slots']],
+                         [('A', '09:00', '09:45'), ('B', '09:30', '10:15')])
+
+    def test_create_refuses_a_clash_and_validates_only_on_request(self):
+        self.schedule(self.teachers[0], self.entry('09:00AM'))
+        data = {'teacher': self.teachers[1].id, 'start_date': '2031-03-01', 'end_date': '2031-03-31',
+                'schedule_data': json.dumps([self.entry('09:15AM')])}
+
+        response = self.client.post(self.create_path, data)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['data']['conflicts'][0]['type'], 'class')
+
+        response = self.client.post(self.create_path, {**data, 'validate_only': 'true',
+                                                       'schedule_data': json.dumps([self.entry('11:00AM')])})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['conflicts'], [])
+        self.assertFalse(TeachersSchedule.objects.filter(teacher=self.teachers[1], start_date=self.start).exists())
+        self.assertFalse(TeachersSchedule.objects.filter(teacher=self.teachers[1],
+                                                         start_date=datetime.date(2031, 3, 1)).exists())
+
+    def test_an_update_does_not_clash_with_its_own_slots(self):
+        schedule = self.schedule(self.teachers[0], self.entry('09:00AM'))
+        self.assertEqual(schedule_conflicts(schedule), [])
+        schedule.schedule_data.append(self.entry('09:40AM', section='B'))
+        self.assertEqual([conflict['type'] for conflict in schedule_conflicts(schedule)], ['teacher'])
+
+    def test_audit_costs_the_same_queries_whatever_the_schedules(self):
+        for position, teacher in enumerate(self.teachers):
+            self.schedule(teacher, *[self.entry(f'{8 + hour}:00', section=str(position),
+                                                select_days=('Mon', 'Tue', 'Wed')) for hour in range(6)])
+        with self.assertNumQueries(1):
+            school_conflicts(SCHOOL_ID, start_date=self.start)
+
+
+class ScheduleReminderTest(TestCase):
+    def setUp(self):
+        self.teacher = create_teachers(1)[0]
+        self.teacher.fcm_token = 'token-1'
+        self.teacher.save()
+        tomorrow = timezone.localdate() + datetime.timedelta(days=1)
+        self.schedule = TeachersSchedule.objects.create(
+            school_id=SCHOOL_ID, teacher=self.teacher, start_date=tomorrow,
+            end_date=tomorrow + datetime.timedelta(days=30),
+            schedule_data=[{'class': '1', 'section': 'A', 'subject': 'Maths', 'class_timing': '09:00AM',
+                            'class_duration': '45', 'select_days': ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']}])
+        sync_schedule_slots(self.schedule)
+
+    def reminder(self, minutes_ago):
+        return ScheduleReminder.objects.create(
+            school_id=SCHOOL_ID, schedule=self.schedule, teacher=self.teacher, position=0,
+            remind_at=timezone.now() - datetime.timedelta(minutes=minutes_ago), title=REMINDER_TITLE,
+            message=REMINDER_MESSAGE.format('09:00AM'))
+
+    def test_every_class_of_the_coming_days_is_queued_once(self):
+        schedule_reminders(self.schedule)
+        expand_reminders(days=7)
+        reminders = ScheduleReminder.objects.filter(schedule=self.schedule).order_by('remind_at')
+        self.assertEqual(reminders.count(), 6)
+        first = timezone.localtime(reminders[0].remind_at)
+        self.assertEqual((first.date(), first.time()), (self.schedule.start_date, datetime.time(8, 45)))
+
+        self.schedule.schedule_data[0]['select_days'] = ['Mon']
+        self.schedule.save()
+        sync_schedule_slots(self.schedule)
+        schedule_reminders(self.schedule)
+        self.assertEqual({timezone.localtime(reminder.remind_at).weekday() for reminder in reminders.all()}, {0})
+
+    @mock.patch('teacher.reminders.send_push_notification', return_value=(1, 0))
+    def test_due_reminders_are_sent_once(self, send):
+        sent = self.reminder(1)
+        late = self.reminder(20)
+        future = self.reminder(-60)
+        self.assertEqual(send_due_reminders()[ScheduleReminder.SENT], 1)
+        send.assert_called_once_with(['token-1'], REMINDER_TITLE, REMINDER_MESSAGE.format('09:00AM'))
+        statuses = dict(ScheduleReminder.objects.values_list('id', 'status'))
+        self.assertEqual([statuses[sent.id], statuses[late.id], statuses[future.id]],
+                         [ScheduleReminder.SENT, ScheduleReminder.SKIPPED, ScheduleReminder.PENDING])
+        self.assertFalse(any(send_due_reminders().values()))
+        self.assertEqual(send.call_count, 1)
+
+    @override_settings(SCHEDULE_REMINDER_MAX_ATTEMPTS=2)
+    @mock.patch('teacher.reminders.send_push_notification', side_effect=ValueError('FCM is down'))
+    def test_failed_sends_are_retried_then_given_up(self, send):
+        reminder = self.reminder(1)
+        self.assertEqual(send_due_reminders()[ScheduleReminder.PENDING], 1)
+        self.assertEqual(send_due_reminders()[ScheduleReminder.FAILED], 1)
+        reminder.refresh_from_db()
+        self.assertEqual((reminder.attempts, reminder.last_error), (2, 'FCM is down'))
+
+    @mock.patch('teacher.reminders.send_push_notification', return_value=(0, 1))
+    def test_undelivered_reminders_stay_pending(self, send):
+        reminder = self.reminder(1)
+        self.assertEqual(send_due_reminders()[ScheduleReminder.PENDING], 1)
+        reminder.refresh_from_db()
+        self.assertEqual((reminder.status, reminder.attempts, reminder.last_error, reminder.sent_at),
+                         (ScheduleReminder.PENDING, 1, REMINDER_NOT_DELIVERED, None))
+
+
+class TeacherAssignmentTest(APITestCase):
+    def setUp(self):
+        self.teacher, self.colleague = create_teachers(2, details=[
+            {'curriculum': 'CBSE', 'class': '7', 'section': 'B', 'subject': 'Maths'},
+            {'curriculum': 'CBSE', 'class': '9', 'section': 'A', 'subject': 'Physics'},
+            {'curriculum': 'CBSE', 'class': '9', 'section': 'C', 'subject': 'Physics'},
+        ])
+        self.colleague.class_subject_section_details = [{'curriculum': 'CBSE', 'class': '9', 'section': 'A',
+                                                         'subject': 'Chemistry'}]
+        self.colleague.save()
+
+    def test_backfill_matches_the_details(self):
+        TeacherAssignment.objects.all().delete()
+        backfill_teacher_assignments(SCHOOL_ID)
+        for teacher in TeacherUser.objects.filter(user__school_id=SCHOOL_ID):
+            rows = teacher.assignments.order_by('position').values_list('class_name', 'section', 'subject',
+                                                                        'is_class_teacher')
+            self.assertEqual(list(rows), [(detail['class'], detail['section'], detail['subject'], position == 0)
+                                          for position, detail in enumerate(teacher.class_subject_section_details)])
+
+    def test_class_and_subject_teacher_lookups(self):
+        school_id = SCHOOL_ID
+        self.assertIn(self.teacher, class_teachers(school_id, '7', section='B', curriculum='CBSE'))
+        self.assertNotIn(self.teacher, class_teachers(school_id, '9', section='A'))
+        self.assertIn(self.teacher, subject_teachers(school_id, 'Physics', class_name='9', section='A'))
+        self.assertEqual(list(subject_teachers(school_id, 'Physics', class_name='9')).count(self.teacher), 1)
+        self.assertFalse(class_teachers('OTHER', '7', section='B').exists())
+
+    def test_saving_other_fields_keeps_the_assignments(self):
+        ids = set(self.teacher.assignments.values_list('id', flat=True))
+        self.teacher.fcm_token = 'token'
+        self.teacher.save(update_fields=['fcm_token'])
+        self.assertEqual(set(self.teacher.assignments.values_list('id', flat=True)), ids)
+
+        self.teacher.class_subject_section_details = self.teacher.class_subject_section_details[1:]
+        self.teacher.save()
+        self.assertEqual(self.teacher.assignments.get(is_class_teacher=True).class_name, '9')
+
+    def test_schedule_pickers(self):
+        self.client.force_authenticate(create_admin())
+        params = {'teacher_name': self.teacher.id, 'curriculum': 'CBSE', 'class': '9'}
+        response = self.client.get('/teacher/schedule/section/list/', params)
+        self.assertEqual(response.data['data'], {'section': ['A', 'C']})
+        response = self.client.get('/teacher/schedule/subject/list/', {**params, 'section': 'C'})
+        self.assertEqual(response.data['data'], {'subject': ['Physics']})
+        response = self.client.get('/teacher/schedule/curriculum/list/', {'teacher_name': 0})
+        self.assertEqual(response.status_code, 400)
+
+    def test_assignment_tree_is_cacheable(self):
+        self.client.force_authenticate(create_admin())
+        path = f'/teacher/schedule/assignments/{self.teacher.id}/'
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['curriculums'], [{'curriculum': 'CBSE', 'classes': [
+            {'class': '7', 'sections': [{'section': 'B', 'subjects': ['Maths']}]},
+            {'class': '9', 'sections': [{'section': 'A', 'subjects': ['Physics']},
+                                        {'section': 'C', 'subjects': ['Physics']}]},
+        ]}])
+        etag, last_modified = response['ETag'], response['Last-Modified']
+        self.assertEqual(self.client.get(path, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get(path, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+        self.teacher.class_subject_section_details.append({'curriculum': 'ICSE', 'class': '9', 'section': 'A',
+                                                           'subject': 'Physics'})
+        self.teacher.save()
+        response = self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual([curriculum['curriculum'] for curriculum in response.data['data']['curriculums']],
+                         ['CBSE', 'ICSE'])
+        self.assertEqual(self.client.get('/teacher/schedule/assignments/0/').status_code, 404)
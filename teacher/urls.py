@@ -19,11 +19,13 @@ urlpatterns = [
     path('schedule/delete/<int:pk>/', TeacherScheduleDeleteView.as_view(), name='schedule_delete'),
     path('schedule/update/<int:pk>/', TeacherScheduleUpdateView.as_view(), name='schedule_update'),
     path('schedule/renew/<int:pk>/', TeacherScheduleRenewView.as_view(), name='schedule_renew'),
+    path('schedule/conflicts/', TeacherScheduleConflictView.as_view(), name='schedule_conflicts'),
     path('schedule/teacher/list/', TeachersListView.as_view(), name='teachers_list'),
     path('schedule/curriculum/list/', TeachersCurriculumListView.as_view(), name='schedule_curriculum_list'),
     path('schedule/class/list/', TeachersClassListView.as_view(), name='schedule_class_list'),
     path('schedule/section/list/', TeachersSectionListView.as_view(), name='schedule_section_list'),
     path('schedule/subject/list/', TeachersSubjectListView.as_view(), name='schedule_subject_list'),
+    path('schedule/assignments/<int:pk>/', TeacherAssignmentTreeView.as_view(), name='schedule_assignment_tree'),
     # Teacher attendence API's
     path('user/login/', UserLoginView.as_view(), name='user_login'),
     path('attendance/create/', TeacherAttendanceCreateView.as_view(), name='attendance_create'),
@@ -6,6 +6,7 @@ from django.core.mail import send_mail
 from django.db import IntegrityError
 from django.db.models import Q
 from django.shortcuts import get_object_or_404
+from django.utils.http import http_date, parse_http_date_safe
 from rest_framework import status, permissions
 from rest_framework.exceptions import ValidationError
 from rest_framework.parsers import MultiPartParser, FormParser
@@ -15,10 +16,12 @@ from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
 from notificationpackage.firebase import send_push_notification
 from firebase_admin import auth, messaging
-import threading  # For running tasks asynchronously
-from django.utils import timezone
-from datetime import datetime, timedelta
+from datetime import date, datetime
 from EduSmart import settings
+from EduSmart.db.replica import ReplicaReadMixin
+from attendance.kinds import STAFF, TEACHER
+from attendance.marking import mark_attendance
+from attendance.rollups import current_attendance_summary, current_month_totals
 from authentication.models import User, Class, TeacherUser, StudentUser, Certificate, TeachersSchedule, \
     TeacherAttendence, StaffUser, Availability, StaffAttendence
 from authentication.permissions import IsSuperAdminUser, IsAdminUser, IsTeacherUser, IsInSameSchool, \
@@ -31,17 +34,18 @@ from curriculum.models import Curriculum, Subjects
 from pagination import CustomPagination
 from student.models import ConnectWithTeacher, StudentMaterial
 from student.views import FetchStudentDetailView
+from teacher.assignments import assignment_tree, assignment_tree_etag, teacher_choices
+from teacher.conflicts import school_conflicts, schedule_conflicts
+from teacher.reminders import REMINDER_MESSAGE, REMINDER_TITLE, schedule_reminders
+from teacher.schedules import sync_schedule_slots
 from teacher.serializers import TeacherUserSignupSerializer, TeacherDetailSerializer, TeacherListSerializer, \
     TeacherProfileSerializer, ScheduleCreateSerializer, ScheduleDetailSerializer, ScheduleListSerializer, \
     ScheduleUpdateSerializer, TeacherAttendanceSerializer, TeacherAttendanceDetailSerializer, \
     TeacherAttendanceListSerializer, SectionListSerializer, SubjectListSerializer, \
     TeacherAttendanceFilterListSerializer, AvailabilityCreateSerializer, \
     ChatRequestMessageSerializer, TeacherChatHistorySerializer, AvailabilityGetSerializer, StudyMaterialListSerializer, \
-    StudyMaterialDetailSerializer, TeacherListBySectionSerializer, TeacherAttendanceCreateSerializer, \
-    StaffAttendanceCreateSerializer, StaffListBySectionSerializer
-from utils import create_response_data, create_response_list_data, generate_random_password, \
-    get_teacher_total_attendance, \
-    get_teacher_monthly_attendance, get_teacher_total_absent, get_teacher_monthly_absent
+    StudyMaterialDetailSerializer, TeacherListBySectionSerializer, StaffListBySectionSerializer
+from utils import create_response_data, create_response_list_data, generate_random_password
 
 
 # Create your views here.
@@ -463,6 +467,43 @@ class UserLoginView(APIView):
             return Response(response, status=status.HTTP_400_BAD_REQUEST)
 
 
+def scheduled(schedule, validated_data):
+    """
+    An unsaved copy of `schedule` with the teacher, dates and schedule_data of a valid update applied.
+    """
+    return TeachersSchedule(
+        id=schedule.id,
+        school_id=schedule.school_id,
+        teacher_id=int(validated_data['teacher']) if validated_data.get('teacher') else schedule.teacher_id,
+        start_date=validated_data.get('start_date', schedule.start_date),
+        end_date=validated_data.get('end_date', schedule.end_date),
+        schedule_data=validated_data.get('schedule_data', schedule.schedule_data),
+    )
+
+
+def schedule_conflict_response(request, schedule):
+    """
+    The response refusing `schedule` when it clashes with itself or another schedule of the school, or listing
+    its clashes without saving it when the request asks for validate_only; None when it can be saved.
+    """
+    conflicts = schedule_conflicts(schedule)
+    if str(request.data.get('validate_only', 'false')).lower() == 'true':
+        response_data = create_response_data(
+            status=status.HTTP_200_OK,
+            message=ScheduleMessage.SCHEDULE_CONFLICTS if conflicts else ScheduleMessage.SCHEDULE_HAS_NO_CONFLICTS,
+            data={'conflicts': conflicts},
+        )
+        return Response(response_data, status=status.HTTP_200_OK)
+    if conflicts:
+        response_data = create_response_data(
+            status=status.HTTP_400_BAD_REQUEST,
+            message=ScheduleMessage.SCHEDULE_CONFLICTS,
+            data={'conflicts': conflicts},
+        )
+        return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+    return None
+
+
 class TeacherScheduleCreateView(APIView):
     permission_classes = [IsAdminUser, IsInSameSchool]
 
@@ -477,14 +518,21 @@ class TeacherScheduleCreateView(APIView):
 
             teacher = get_object_or_404(TeacherUser, id=teacher_id, user__school_id=request.user.school_id)
 
-            # Create the schedule
-            schedule = TeachersSchedule.objects.create(
+            schedule = TeachersSchedule(
                 teacher=teacher,
                 start_date=start_date,
                 end_date=end_date,
                 schedule_data=schedule_data,
                 school_id=request.user.school_id
             )
+            conflict_response = schedule_conflict_response(request, schedule)
+            if conflict_response:
+                return conflict_response
+
+            # Create the schedule
+            schedule.save()
+            sync_schedule_slots(schedule)
+            schedule_reminders(schedule)
 
             # Send push notification using FCM token (if exists)
             if teacher.fcm_token:
@@ -684,53 +732,26 @@ class TeacherScheduleUpdateView(APIView):
             serializer = ScheduleUpdateSerializer(schedule, data=data, partial=True)
 
             if serializer.is_valid(raise_exception=True):
-                serializer.save()
-
-                start_date = serializer.validated_data['start_date']
-                print(f"Start Date: {start_date}")
+                conflict_response = schedule_conflict_response(request, scheduled(schedule, serializer.validated_data))
+                if conflict_response:
+                    return conflict_response
+                schedule = serializer.save()
+                sync_schedule_slots(schedule)
+                # The reminders before every class of the schedule are sent by the send_schedule_reminders worker.
+                schedule_reminders(schedule)
 
                 class_timing_str = schedule_data.get('class_timing', '00:00PM')
                 print(f"Class Timing: {class_timing_str}")
 
                 try:
-                    class_time = datetime.strptime(class_timing_str, '%I:%M%p').time()
+                    datetime.strptime(class_timing_str, '%I:%M%p')
                 except ValueError:
                     raise ValidationError("Invalid class_timing format. Expected format is 'HH:MMAM/PM'.")
 
-                # Combine date and time and make it timezone-aware
-                class_datetime = timezone.make_aware(datetime.combine(start_date, class_time))
-                print(f"Class DateTime: {class_datetime}")
-
-                # Calculate notification time (15 mins before class start)
-                notification_time = class_datetime - timedelta(minutes=15)
-                print(f"Notification Time (15 mins before class_timing): {notification_time}")
-
-                notification_title = "Upcoming Schedule Reminder"
-                notification_message = f"Your class starts at {class_timing_str}. Please be prepared."
-                print(f"Notification Title: {notification_title}")
-                print(f"Notification Message: {notification_message}")
-
-                if teacher.fcm_token:
-                    def send_delayed_notification(notification_time):
-                        try:
-                            current_time = timezone.now()
-                            print(f"Current Local Time: {current_time}")
-
-                            delay = (notification_time - current_time).total_seconds()
-                            print(f"Calculated Delay: {delay} seconds")
-
-                            if delay > 0:
-                                threading.Timer(delay,
-                                                lambda: send_push_notification([teacher.fcm_token], notification_title,
-                                                                               notification_message)).start()
-                            else:
-                                print("Notification time has already passed.")
-
-                        except Exception as e:
-                            print(f"Error in send_delayed_notification: {e}")
+                notification_title = REMINDER_TITLE
+                notification_message = REMINDER_MESSAGE.format(class_timing_str)
 
-                    threading.Thread(target=send_delayed_notification, args=(notification_time,)).start()
-                else:
+                if not teacher.fcm_token:
                     return Response(
                         create_response_data(
                             status=status.HTTP_400_BAD_REQUEST,
@@ -815,7 +836,12 @@ class TeacherScheduleRenewView(APIView):
             staff = TeachersSchedule.objects.get(id=pk, school_id=request.user.school_id)
             serializer = ScheduleUpdateSerializer(staff, data=data, partial=True)
             if serializer.is_valid(raise_exception=True):
-                serializer.save()
+                conflict_response = schedule_conflict_response(request, scheduled(staff, serializer.validated_data))
+                if conflict_response:
+                    return conflict_response
+                schedule = serializer.save()
+                sync_schedule_slots(schedule)
+                schedule_reminders(schedule)
                 response = create_response_data(
                     status=status.HTTP_200_OK,
                     message=ScheduleMessage.SCHEDULE_renew_SUCCESSFULLY,
@@ -845,6 +871,38 @@ class TeacherScheduleRenewView(APIView):
             return Response(response_data, status=status.HTTP_404_NOT_FOUND);
 
 
+class TeacherScheduleConflictView(ReplicaReadMixin, APIView):
+    """
+    This class is used to audit the schedules of the whole school and list every clash: a teacher booked twice
+    at once, or two teachers in the same class-section at once, optionally only between `start_date` and
+    `end_date`.
+    """
+    permission_classes = [IsAdminUser, IsInSameSchool]
+
+    def get(self, request):
+        try:
+            start_date = request.query_params.get('start_date')
+            end_date = request.query_params.get('end_date')
+            conflicts = school_conflicts(
+                request.user.school_id,
+                start_date=date.fromisoformat(start_date) if start_date else None,
+                end_date=date.fromisoformat(end_date) if end_date else None,
+            )
+            response_data = create_response_data(
+                status=status.HTTP_200_OK,
+                message=ScheduleMessage.SCHEDULE_CONFLICTS_FETCHED_SUCCESSFULLY,
+                data={'count': len(conflicts), 'conflicts': conflicts},
+            )
+            return Response(response_data, status=status.HTTP_200_OK)
+        except Exception as e:
+            response_data = create_response_data(
+                status=status.HTTP_400_BAD_REQUEST,
+                message=e.args[0],
+                data={},
+            )
+            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+
 class TeacherAttendanceCreateView(APIView):
     permission_classes = [IsAdminUser, IsInSameSchool]
     """
@@ -887,8 +945,7 @@ class FetchAttendanceDetailView(APIView):
     def get(self, request, pk):
         try:
             teacher = TeacherUser.objects.get(id=pk, user__school_id=request.user.school_id)
-            data = TeacherAttendence.objects.filter(teacher_id=pk,
-                                                    teacher__user__school_id=request.user.school_id).order_by('-date')
+            data = TeacherAttendence.objects.filter(teacher_id=pk, school_id=request.user.school_id).order_by('-date')
 
             filter_type = request.query_params.get('filter_type', None)
             if filter_type:
@@ -917,6 +974,8 @@ class FetchAttendanceDetailView(APIView):
 
             if data:
                 serializer = TeacherAttendanceDetailSerializer(data, many=True)
+                summary = current_attendance_summary(TEACHER, teacher.id)
+                this_month = current_month_totals(summary)
                 response_data = create_response_data(
                     status=status.HTTP_200_OK,
                     message=UserResponseMessage.USER_DETAIL_MESSAGE,
@@ -928,10 +987,10 @@ class FetchAttendanceDetailView(APIView):
                             'section') if teacher.role == 'class teacher' else None,
                         "subject": teacher.class_subject_section_details[0].get(
                             'subject') if teacher.role == 'class teacher' else None,
-                        "total_attendance": get_teacher_total_attendance(data),
-                        "monthly_attendance": get_teacher_monthly_attendance(data),
-                        "total_absent": get_teacher_total_absent(data),
-                        "monthly_absent": get_teacher_monthly_absent(data),
+                        "total_attendance": summary['present'],
+                        "monthly_attendance": this_month['present'],
+                        "total_absent": summary['absent'],
+                        "monthly_absent": this_month['absent'],
                         "attendence_detail": serializer.data,
                     }
                 )
@@ -1099,16 +1158,7 @@ class TeachersCurriculumListView(APIView):
     def get(self, request):
         try:
             teacher_name = request.query_params.get('teacher_name')
-            teacher_list = TeacherUser.objects.get(user__is_active=True, user__school_id=request.user.school_id,
-                                                   id=teacher_name)
-            # data = {
-            #     "curriculum": [teacher['curriculum'] for teacher in teacher_list.class_subject_section_details]
-            # }
-            curriculum_set = set()
-            for teacher in teacher_list.class_subject_section_details:
-                curriculum_set.add(teacher['curriculum'])
-
-            distinct_curriculums = list(curriculum_set)
+            distinct_curriculums = teacher_choices(request.user.school_id, teacher_name, 'curriculum')
 
             data = {
                 "curriculum": distinct_curriculums
@@ -1138,14 +1188,8 @@ class TeachersClassListView(APIView):
         try:
             teacher_name = request.query_params.get('teacher_name')
             teacher_curriculum = request.query_params.get('curriculum')
-            teacher_list = TeacherUser.objects.get(user__is_active=True, user__school_id=request.user.school_id,
-                                                   id=teacher_name)
-            class_set = set()
-            for teacher in teacher_list.class_subject_section_details:
-                if teacher['curriculum'] == teacher_curriculum:
-                    class_set.add(teacher['class'])
-
-            distinct_class = list(class_set)
+            distinct_class = teacher_choices(request.user.school_id, teacher_name, 'class_name',
+                                             curriculum=teacher_curriculum)
 
             data = {
                 "class": distinct_class
@@ -1176,14 +1220,8 @@ class TeachersSectionListView(APIView):
             teacher_name = request.query_params.get('teacher_name')
             teacher_curriculum = request.query_params.get('curriculum')
             teacher_class = request.query_params.get('class')
-            teacher_list = TeacherUser.objects.get(user__is_active=True, user__school_id=request.user.school_id,
-                                                   id=teacher_name)
-            section_set = set()
-            for teacher in teacher_list.class_subject_section_details:
-                if teacher['class'] == teacher_class and teacher['curriculum'] == teacher_curriculum:
-                    section_set.add(teacher['section'])
-
-            distinct_sections = list(section_set)
+            distinct_sections = teacher_choices(request.user.school_id, teacher_name, 'section',
+                                                curriculum=teacher_curriculum, class_name=teacher_class)
 
             data = {
                 "section": distinct_sections
@@ -1215,15 +1253,9 @@ class TeachersSubjectListView(APIView):
             teacher_curriculum = request.query_params.get('curriculum')
             teacher_class = request.query_params.get('class')
             teacher_section = request.query_params.get('section')
-            teacher_list = TeacherUser.objects.get(user__is_active=True, user__school_id=request.user.school_id,
-                                                   id=teacher_name)
-            subject_set = set()
-            for teacher in teacher_list.class_subject_section_details:
-                if teacher['class'] == teacher_class and teacher['curriculum'] == teacher_curriculum and teacher[
-                    'section'] == teacher_section:
-                    subject_set.add(teacher['subject'])
-
-            distinct_subject = list(subject_set)
+            distinct_subject = teacher_choices(request.user.school_id, teacher_name, 'subject',
+                                               curriculum=teacher_curriculum, class_name=teacher_class,
+                                               section=teacher_section)
 
             data = {
                 "subject": distinct_subject
@@ -1243,7 +1275,52 @@ class TeachersSubjectListView(APIView):
             return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
 
 
-class AttedanceFilterListView(APIView):
+class TeacherAssignmentTreeView(ReplicaReadMixin, APIView):
+    """
+    This class is used to fetch every curriculum, class, section and subject of a teacher as one tree for creating
+    the teacher schedule, instead of the four list calls above. Answers 304 when the If-None-Match header holds
+    the ETag of the current tree or, without it, when the assignments did not change since If-Modified-Since.
+    """
+    permission_classes = [IsAdminUser, IsInSameSchool]
+
+    def get(self, request, pk):
+        try:
+            curriculums, last_modified = assignment_tree(request.user.school_id, pk)
+            etag = assignment_tree_etag(pk, curriculums)
+            headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+            if last_modified:
+                headers['Last-Modified'] = http_date(last_modified.timestamp())
+            if 'If-None-Match' in request.headers:
+                not_modified = etag in request.headers['If-None-Match']
+            else:
+                since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+                not_modified = bool(since and last_modified and int(last_modified.timestamp()) <= since)
+            if not_modified:
+                return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+            response_data = create_response_data(
+                status=status.HTTP_200_OK,
+                message=ScheduleMessage.TEACHER_ASSIGNMENTS_FETCHED_SUCCESSFULLY,
+                data={'teacher_id': pk, 'curriculums': curriculums}
+            )
+            return Response(response_data, status=status.HTTP_200_OK, headers=headers)
+        except TeacherUser.DoesNotExist:
+            response_data = create_response_data(
+                status=status.HTTP_404_NOT_FOUND,
+                message=UserResponseMessage.USER_DOES_NOT_EXISTS,
+                data={}
+            )
+            return Response(response_data, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            response_data = create_response_data(
+                status=status.HTTP_400_BAD_REQUEST,
+                message=e.args[0],
+                data={}
+            )
+            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+
+class AttedanceFilterListView(ReplicaReadMixin, APIView):
     """
     This class is used to add filter in the list of teacher attendance.
     """
@@ -1252,9 +1329,7 @@ class AttedanceFilterListView(APIView):
 
     def get(self, request):
         try:
-            teacher = TeacherUser.objects.filter(user__school_id=request.user.school_id)
-            attendance_data = TeacherAttendence.objects.filter(teacher__in=teacher,
-                                                               teacher__user__school_id=request.user.school_id)
+            attendance_data = TeacherAttendence.objects.filter(school_id=request.user.school_id)
 
             date = request.query_params.get('date', None)
             mark_attendence = request.query_params.get('mark_attendence', None)
@@ -1268,21 +1343,15 @@ class AttedanceFilterListView(APIView):
             if mark_attendence == 'L':
                 attendance_data = attendance_data.filter(mark_attendence='L')
 
-            paginator = self.pagination_class()
-            result_page = paginator.paginate_queryset(attendance_data, request)
+            paginator = self.pagination_class.for_request(request, ordering=('-date', '-id'))
+            result_page = paginator.paginate_queryset(attendance_data.select_related('teacher'), request)
 
             serializers = TeacherAttendanceFilterListSerializer(result_page, many=True)
             response = {
                 'status': status.HTTP_200_OK,
                 'message': UserResponseMessage.USER_LIST_MESSAGE,
                 'data': serializers.data,
-                'pagination': {
-                    'page_size': paginator.page_size,
-                    'next': paginator.get_next_link(),
-                    'previous': paginator.get_previous_link(),
-                    'total_pages': paginator.page.paginator.num_pages,
-                    'current_page': paginator.page.number,
-                }
+                'pagination': paginator.get_pagination_data(),
             }
             return Response(response, status=status.HTTP_200_OK)
         except Exception as e:
@@ -1818,38 +1887,26 @@ class MobileTeacherAttendance(APIView):
     permission_classes = [IsAdminUser, IsInSameSchool]
 
     def post(self, request):
-        data_str = request.data.get('data')  # Assuming data is sent as form-data with key 'data'
+        data = request.data.get('data')  # Assuming data is sent as form-data with key 'data'
 
-        try:
-            data_json = json.loads(data_str)
-        except json.JSONDecodeError:
-            return Response("Invalid JSON format", status=status.HTTP_400_BAD_REQUEST)
-
-        for item in data_json:
-            serializer = TeacherAttendanceCreateSerializer(data=item)
-            if serializer.is_valid():
-                teacher_id = item['id']
-                date = item['date']
-                mark_attendence = item['mark_attendence']
-                teacher_user = get_object_or_404(TeacherUser, id=teacher_id)
-
-                # Create or update attendance record
-                TeacherAttendence.objects.update_or_create(
-                    teacher=teacher_user,
-                    date=date,
-                    mark_attendence=mark_attendence
-                )
-            else:
-                response = create_response_data(
-                    status=status.HTTP_400_BAD_REQUEST,
-                    message=serializer.errors,
-                    data={}
-                )
-                return Response(response, status=status.HTTP_400_BAD_REQUEST)
+        if isinstance(data, str):
+            try:
+                data = json.loads(data)
+            except json.JSONDecodeError:
+                return Response("Invalid JSON format", status=status.HTTP_400_BAD_REQUEST)
+
+        results, errors = mark_attendance(TEACHER, request.user.school_id, data)
+        if errors:
+            response = create_response_data(
+                status=status.HTTP_400_BAD_REQUEST,
+                message=AttendenceMarkedMessage.INVALID_ATTENDANCE_ENTRIES,
+                data=errors
+            )
+            return Response(response, status=status.HTTP_400_BAD_REQUEST)
         response = create_response_data(
             status=status.HTTP_200_OK,
             message=AttendenceMarkedMessage.ATTENDENCE_MARKED_SUCCESSFULLY,
-            data={}
+            data=results
         )
         return Response(response, status=status.HTTP_200_OK)
 
@@ -1913,37 +1970,25 @@ class MobileStaffAttendance(APIView):
     permission_classes = [IsAdminUser, IsInSameSchool]
 
     def post(self, request):
-        data_str = request.data.get('data')
+        data = request.data.get('data')
 
-        try:
-            data_json = json.loads(data_str)
-        except json.JSONDecodeError:
-            return Response("Invalid JSON format", status=status.HTTP_400_BAD_REQUEST)
-
-        for item in data_json:
-            serializer = StaffAttendanceCreateSerializer(data=item)
-            if serializer.is_valid():
-                staff_id = item['id']
-                date = item['date']
-                mark_attendence = item['mark_attendence']
-                staff_user = get_object_or_404(StaffUser, id=staff_id)
-
-                # Create or update attendance record
-                StaffAttendence.objects.update_or_create(
-                    staff=staff_user,
-                    date=date,
-                    mark_attendence=mark_attendence
-                )
-            else:
-                response = create_response_data(
-                    status=status.HTTP_400_BAD_REQUEST,
-                    message=serializer.errors,
-                    data={}
-                )
-                return Response(response, status=status.HTTP_400_BAD_REQUEST)
+        if isinstance(data, str):
+            try:
+                data = json.loads(data)
+            except json.JSONDecodeError:
+                return Response("Invalid JSON format", status=status.HTTP_400_BAD_REQUEST)
+
+        results, errors = mark_attendance(STAFF, request.user.school_id, data)
+        if errors:
+            response = create_response_data(
+                status=status.HTTP_400_BAD_REQUEST,
+                message=AttendenceMarkedMessage.INVALID_ATTENDANCE_ENTRIES,
+                data=errors
+            )
+            return Response(response, status=status.HTTP_400_BAD_REQUEST)
         response = create_response_data(
             status=status.HTTP_200_OK,
             message=AttendenceMarkedMessage.ATTENDENCE_MARKED_SUCCESSFULLY,
-            data={}
+            data=results
         )
         return Response(response, status=status.HTTP_200_OK)
@@ -1,11 +1,10 @@
-import datetime
 import requests
 from django.conf import settings
 
 from django.contrib.auth import get_user_model
 
-from authentication.models import TeacherAttendence, StaffAttendence
-from student.models import StudentAttendence
+from attendance.kinds import STAFF, STUDENT, TEACHER
+from attendance.rollups import current_attendance_summary, current_month_totals
 
 
 def create_response_data(status, message, data):
@@ -30,97 +29,58 @@ def generate_random_password():
 
 def get_teacher_total_attendance(obj):
     teacher = obj.first()
-    year = datetime.date.today().year
-    total_attendance = TeacherAttendence.objects.filter(
-        teacher=teacher.teacher, date__year=year, mark_attendence='P').count()
-    return total_attendance
+    return current_attendance_summary(TEACHER, teacher.teacher_id)['present']
 
 
 def get_teacher_monthly_attendance(obj):
     teacher = obj.first()
-    today = datetime.date.today()
-    month = today.month
-    year = today.year
-    monthly_attendance = TeacherAttendence.objects.filter(
-        teacher=teacher.teacher, date__year=year, date__month=month, mark_attendence='P').count()
-    return monthly_attendance
+    return current_month_totals(current_attendance_summary(TEACHER, teacher.teacher_id))['present']
 
 
 def get_teacher_total_absent(obj):
     teacher = obj.first()
-    year = datetime.date.today().year
-    total_absent = TeacherAttendence.objects.filter(
-        teacher=teacher.teacher, date__year=year, mark_attendence='A').count()
-    return total_absent
+    return current_attendance_summary(TEACHER, teacher.teacher_id)['absent']
 
 
 def get_teacher_monthly_absent(obj):
     teacher = obj.first()
-    today = datetime.date.today()
-    month = today.month
-    year = today.year
-    monthly_absent = TeacherAttendence.objects.filter(
-        teacher=teacher.teacher, date__year=year, date__month=month, mark_attendence='A').count()
-    return monthly_absent
+    return current_month_totals(current_attendance_summary(TEACHER, teacher.teacher_id))['absent']
 
 
 def get_student_total_attendance(obj):
     student = obj.first()
-    year = datetime.date.today().year
-    total_attendance = StudentAttendence.objects.filter(
-        student=student.student, date__year=year, mark_attendence='P').count()
-    return total_attendance
+    return current_attendance_summary(STUDENT, student.student_id)['present']
 
 
 def get_student_total_absent(obj):
     student = obj.first()
-    year = datetime.date.today().year
-    total_absent = StudentAttendence.objects.filter(
-        student=student.student, date__year=year, mark_attendence='A').count()
-    return total_absent
+    return current_attendance_summary(STUDENT, student.student_id)['absent']
 
 
 def get_student_attendence_percentage(obj):
-    total_attendence = get_student_total_attendance(obj)
-    total_school_days = 365
-    attendence_percentage = (total_attendence/total_school_days) * 100
-    return round(attendence_percentage)
+    # Share of the school's working days so far this year, see attendance.workdays.
+    student = obj.first()
+    return current_attendance_summary(STUDENT, student.student_id)['percentage']
 
 
 def get_staff_total_attendance(obj):
     staff = obj.first()
-    year = datetime.date.today().year
-    total_attendance = StaffAttendence.objects.filter(
-        staff=staff.staff, date__year=year, mark_attendence='P').count()
-    return total_attendance
+    return current_attendance_summary(STAFF, staff.staff_id)['present']
 
 
 def get_staff_monthly_attendance(obj):
     staff = obj.first()
-    today = datetime.date.today()
-    month = today.month
-    year = today.year
-    monthly_attendance = StaffAttendence.objects.filter(
-        staff=staff.staff, date__year=year, date__month=month, mark_attendence='P').count()
-    return monthly_attendance
+    return current_month_totals(current_attendance_summary(STAFF, staff.staff_id))['present']
 
 
 def get_staff_total_absent(obj):
     staff = obj.first()
-    year = datetime.date.today().year
-    total_absent = StaffAttendence.objects.filter(
-        staff=staff.staff, date__year=year, mark_attendence='A').count()
-    return total_absent
+    return current_attendance_summary(STAFF, staff.staff_id)['absent']
 
 
 def get_staff_monthly_absent(obj):
     staff = obj.first()
-    today = datetime.date.today()
-    month = today.month
-    year = today.year
-    monthly_absent = StaffAttendence.objects.filter(
-        staff=staff.staff, date__year=year, date__month=month, mark_attendence='A').count()
-    return monthly_absent;
+    return current_month_totals(current_attendance_summary(STAFF, staff.staff_id))['absent']
 
 # def send_push_notification(device_tokens, title, body):
 #     """Send a push notification via Firebase Cloud Messaging."""